@@ -8,10 +8,12 @@ from personal_graph.retriever import PersonalRM
 from personal_graph.visualizers import graphviz_visualize_bodies
 from personal_graph.embeddings import OpenAIEmbeddingsModel
 from personal_graph.graph import GraphDB
+from personal_graph.async_graph import AsyncGraphDB
 from personal_graph.models import Node, Edge, EdgeInput, KnowledgeGraph
 
 __all__ = [
     "GraphDB",
+    "AsyncGraphDB",
     "Node",
     "Edge",
     "EdgeInput",
@@ -0,0 +1,255 @@
+"""
+In-memory CSR adjacency snapshot of the edges table, for traversal-heavy workloads
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    logging.info("numpy module is not available.")
+
+EdgeLoader = Callable[[], Iterable[Tuple[Any, Any]]]
+
+
+class AdjacencyIndex:
+    """
+    Compressed sparse row (CSR) arrays for outbound and inbound edges.
+
+    Node ids are mapped to dense int32 indices. Each direction keeps an offsets array
+    and a neighbours array, so a node's neighbours are one contiguous slice.
+    Edges added after the last build go into small delta lists. Removed nodes are
+    tombstoned. Both are folded back into the arrays once compact_threshold changes
+    have piled up.
+
+    Every method holds lock, so writers and traversals can share the index across
+    threads. Pass the database's write lock when the loader reads from a database
+    whose writers update the index, so that the two never wait on each other.
+    """
+
+    def __init__(
+        self,
+        loader: EdgeLoader,
+        *,
+        compact_threshold: int = 1024,
+        lock: Optional[Any] = None,
+    ):
+        if "np" not in globals():
+            raise ImportError("numpy is required for the adjacency index")
+
+        self.loader = loader
+        self.compact_threshold = compact_threshold
+        self._lock = lock if lock is not None else threading.RLock()
+        self.rebuild()
+
+    def __repr__(self) -> str:
+        with self._lock:
+            return f"AdjacencyIndex(nodes={len(self._ids)}, edges={self.edge_count})"
+
+    def __contains__(self, node_id: Any) -> bool:
+        with self._lock:
+            self._fresh()
+            return self._has(node_id)
+
+    def _has(self, node_id: Any) -> bool:
+        index = self._index.get(str(node_id))
+        return index is not None and index not in self._removed
+
+    def _intern(self, node_id: Any) -> int:
+        node_id = str(node_id)
+        index = self._index.get(node_id)
+        if index is None:
+            index = len(self._ids)
+            self._index[node_id] = index
+            self._ids.append(node_id)
+        return index
+
+    @staticmethod
+    def _csr(rows: Any, columns: Any, size: int) -> Tuple[Any, Any]:
+        order = np.argsort(rows, kind="stable")
+        offsets = np.zeros(size + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=size), out=offsets[1:])
+        return offsets, columns[order].astype(np.int32)
+
+    def _load(self, pairs: Iterable[Tuple[Any, Any]]) -> None:
+        sources, targets = [], []
+        for source, target in pairs:
+            sources.append(self._intern(source))
+            targets.append(self._intern(target))
+
+        size = len(self._ids)
+        src = np.asarray(sources, dtype=np.int32)
+        tgt = np.asarray(targets, dtype=np.int32)
+        self._out_offsets, self._out_targets = self._csr(src, tgt, size)
+        self._in_offsets, self._in_targets = self._csr(tgt, src, size)
+        self._csr_size = size
+
+        self._delta_out: Dict[int, List[int]] = {}
+        self._delta_in: Dict[int, List[int]] = {}
+        self._pending = 0
+        self._stale = False
+
+    def rebuild(self) -> None:
+        """Reload every edge through the loader"""
+        with self._lock:
+            self._index: Dict[str, int] = {}
+            self._ids: List[str] = []
+            self._removed: Set[int] = set()
+            self._load(self.loader())
+
+    def compact(self) -> None:
+        """Fold the pending additions and removals back into the CSR arrays"""
+        with self._lock:
+            pairs = [
+                (self._ids[source], self._ids[target])
+                for source in range(len(self._ids))
+                if source not in self._removed
+                for target in self._row(source, "out")
+            ]
+
+            self._index = {}
+            self._ids = []
+            self._removed = set()
+            self._load(pairs)
+
+    def invalidate(self) -> None:
+        """Mark the snapshot out of date, so the next read rebuilds it"""
+        with self._lock:
+            self._stale = True
+
+    def _fresh(self) -> None:
+        if self._stale:
+            self.rebuild()
+
+    def _changed(self) -> None:
+        self._pending += 1
+        if self._pending >= self.compact_threshold:
+            self.compact()
+
+    def add_edge(self, source: Any, target: Any) -> None:
+        with self._lock:
+            if self._stale:
+                return
+            # Reusing a removed id must not bring back its old edges
+            if self._removed and (
+                self._index.get(str(source)) in self._removed
+                or self._index.get(str(target)) in self._removed
+            ):
+                self.compact()
+
+            src, tgt = self._intern(source), self._intern(target)
+            self._delta_out.setdefault(src, []).append(tgt)
+            self._delta_in.setdefault(tgt, []).append(src)
+            self._changed()
+
+    def remove_node(self, node_id: Any) -> None:
+        with self._lock:
+            if self._stale:
+                return
+            index = self._index.get(str(node_id))
+            if index is None:
+                return
+
+            self._removed.add(index)
+            self._delta_out.pop(index, None)
+            self._delta_in.pop(index, None)
+            self._changed()
+
+    @property
+    def edge_count(self) -> int:
+        with self._lock:
+            return int(self._out_targets.shape[0]) + sum(
+                len(targets) for targets in self._delta_out.values()
+            )
+
+    def _row(self, index: int, direction: str) -> List[int]:
+        if direction == "out":
+            offsets, columns, delta = (
+                self._out_offsets,
+                self._out_targets,
+                self._delta_out,
+            )
+        else:
+            offsets, columns, delta = self._in_offsets, self._in_targets, self._delta_in
+
+        row: List[int] = []
+        if index < self._csr_size:
+            row.extend(columns[offsets[index] : offsets[index + 1]].tolist())
+        row.extend(delta.get(index, []))
+
+        if self._removed:
+            row = [neighbor for neighbor in row if neighbor not in self._removed]
+        return row
+
+    def _adjacent(self, index: int, direction: str) -> List[int]:
+        if direction not in ("in", "out", "both"):
+            raise ValueError("direction must be one of 'in', 'out' or 'both'")
+        if direction == "both":
+            return self._row(index, "out") + self._row(index, "in")
+        return self._row(index, direction)
+
+    def neighbors(self, node_id: Any, *, direction: str = "out") -> List[str]:
+        """Return the distinct neighbours of a node"""
+        with self._lock:
+            self._fresh()
+            if not self._has(node_id):
+                return []
+            adjacent = self._adjacent(self._index[str(node_id)], direction)
+            return [self._ids[neighbor] for neighbor in dict.fromkeys(adjacent)]
+
+    def degree(self, node_id: Any, *, direction: str = "out") -> int:
+        """Return the number of edges entering and/or leaving a node"""
+        with self._lock:
+            self._fresh()
+            if not self._has(node_id):
+                return 0
+            return len(self._adjacent(self._index[str(node_id)], direction))
+
+    def bfs(
+        self,
+        source: Any,
+        target: Optional[Any] = None,
+        *,
+        max_depth: Optional[int] = None,
+        direction: str = "out",
+        limit: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Walk breadth-first from source and map each node reached to its depth.
+
+        The mapping keeps visitation order. The walk stops at target, after max_depth
+        levels, or once limit nodes have been visited.
+        """
+        with self._lock:
+            self._fresh()
+            if not self._has(source):
+                return {str(source): 0}
+
+            start = self._index[str(source)]
+            goal = self._index.get(str(target)) if target is not None else None
+            depths = {start: 0}
+            frontier = [start]
+            depth = 0
+
+            while frontier and start != goal:
+                if max_depth is not None and depth >= max_depth:
+                    break
+                if limit is not None and len(depths) >= limit:
+                    break
+                depth += 1
+
+                next_frontier = []
+                for node in frontier:
+                    for neighbor in self._adjacent(node, direction):
+                        if neighbor not in depths:
+                            depths[neighbor] = depth
+                            next_frontier.append(neighbor)
+                            if neighbor == goal or (
+                                limit is not None and len(depths) >= limit
+                            ):
+                                return {self._ids[i]: d for i, d in depths.items()}
+                frontier = next_frontier
+
+            return {self._ids[node]: d for node, d in depths.items()}
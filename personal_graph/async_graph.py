@@ -0,0 +1,241 @@
+"""
+Awaitable facade over GraphDB, for use from an asyncio event loop
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from personal_graph.graph import GraphDB
+from personal_graph.models import Node, EdgeInput, KnowledgeGraph
+from personal_graph.vector_store import SQLiteVSS
+
+T = TypeVar("T")
+
+
+class AsyncGraphDB:
+    """
+    Run GraphDB calls without blocking the event loop.
+
+    Database work runs on a bounded thread pool of max_workers threads. Query
+    embeddings and LLM calls are awaited on the async clients, and independent
+    steps (the node and edge searches of search_from_graph) run concurrently.
+    Writes still embed their rows inside their own transaction, so they run
+    entirely on the pool.
+
+    Each call is atomic on its own. A transaction cannot stay open across awaits,
+    so group writes into a plain function and pass it to run().
+    """
+
+    def __init__(self, graph: GraphDB, *, max_workers: int = 8):
+        self.graph = graph
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="personal-graph"
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"AsyncGraphDB(\n  graph={self.graph},\n  max_workers={self.max_workers}\n)"
+        )
+
+    async def __aenter__(self) -> AsyncGraphDB:
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Save the graph and shut down the thread pool"""
+        await self.run(self.graph.db.save)
+        await self.run(self.graph.vector_store.save)
+        self._executor.shutdown(wait=False)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking callable on the thread pool and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _query_embedding(self, text: str) -> Optional[List[float]]:
+        if not isinstance(self.graph.vector_store, SQLiteVSS):
+            return None
+        return await self.graph.vector_store.embedding_model.aget_embedding(
+            json.dumps({"body": text})
+        )
+
+    async def add_node(self, node: Node, **kwargs: Any) -> None:
+        return await self.run(self.graph.add_node, node, **kwargs)
+
+    async def add_nodes(self, nodes: List[Node], **kwargs: Any) -> Optional[List[Node]]:
+        return await self.run(self.graph.add_nodes, nodes, **kwargs)
+
+    async def add_edge(self, edge: EdgeInput) -> None:
+        return await self.run(self.graph.add_edge, edge)
+
+    async def add_edges(
+        self, edges: List[EdgeInput], *, bulk: bool = False
+    ) -> Optional[List[EdgeInput]]:
+        return await self.run(self.graph.add_edges, edges, bulk=bulk)
+
+    async def update_node(self, node: Node) -> None:
+        return await self.run(self.graph.update_node, node)
+
+    async def update_nodes(self, nodes: List[Node]) -> None:
+        return await self.run(self.graph.update_nodes, nodes)
+
+    async def remove_node(self, id: str | int) -> None:
+        return await self.run(self.graph.remove_node, id)
+
+    async def remove_nodes(self, ids: List[Any]) -> None:
+        return await self.run(self.graph.remove_nodes, ids)
+
+    async def search_node(self, node_id: str | int) -> Any:
+        return await self.run(self.graph.search_node, node_id)
+
+    async def search_node_label(self, node_id: str | int) -> Any:
+        return await self.run(self.graph.search_node_label, node_id)
+
+    async def traverse(
+        self,
+        source: str,
+        target: Optional[str] = None,
+        with_bodies: bool = False,
+        **kwargs: Any,
+    ) -> List:
+        return await self.run(
+            self.graph.traverse, source, target, with_bodies, **kwargs
+        )
+
+    async def shortest_path(
+        self,
+        source: str,
+        target: str,
+        max_depth: Optional[int] = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph:
+        return await self.run(
+            self.graph.shortest_path, source, target, max_depth, direction=direction
+        )
+
+    async def k_hop(
+        self, node_id: str, k: int, *, direction: str = "both"
+    ) -> Dict[str, int]:
+        return await self.run(self.graph.k_hop, node_id, k, direction=direction)
+
+    async def neighbors(self, node_id: str, *, direction: str = "out") -> List[str]:
+        return await self.run(self.graph.neighbors, node_id, direction=direction)
+
+    async def degree(self, node_id: str, *, direction: str = "out") -> int:
+        return await self.run(self.graph.degree, node_id, direction=direction)
+
+    async def text_search(self, query: str, limit: int = 10) -> List[Node]:
+        return await self.run(self.graph.text_search, query, limit)
+
+    async def fetch_ids_from_db(self, **kwargs: Any) -> List[str]:
+        return await self.run(self.graph.fetch_ids_from_db, **kwargs)
+
+    async def search_indegree_edges(self, target: str) -> List[Any]:
+        return await self.run(self.graph.search_indegree_edges, target)
+
+    async def search_outdegree_edges(self, source: str) -> List[Any]:
+        return await self.run(self.graph.search_outdegree_edges, source)
+
+    async def merge_by_similarity(self, *, threshold: float = 0.9) -> None:
+        return await self.run(self.graph.merge_by_similarity, threshold=threshold)
+
+    async def find_nodes_like(
+        self, label: str, *, threshold: float = 0.9
+    ) -> List[Node]:
+        return await self.run(self.graph.find_nodes_like, label, threshold=threshold)
+
+    async def insert(self, text: str, attributes: Dict, **kwargs: Any) -> None:
+        return await self.run(self.graph.insert, text, attributes, **kwargs)
+
+    async def insert_graph(self, kg: KnowledgeGraph) -> KnowledgeGraph:
+        return await self.run(self.graph.insert_graph, kg)
+
+    async def text_to_graph(self, text: str) -> KnowledgeGraph:
+        """Ask the graph generator's LLM for a knowledge graph of text"""
+        return await self.graph.graph_generator.agenerate(text)
+
+    async def insert_text(self, text: str) -> KnowledgeGraph:
+        """Generate a knowledge graph from text and insert it"""
+        return await self.insert_graph(await self.text_to_graph(text))
+
+    async def search(
+        self,
+        text: str,
+        *,
+        threshold: float = 0.9,
+        descending: bool = False,
+        limit: int = 1,
+        sort_by: str = "",
+    ) -> None | List[Tuple[Any, str, dict, Any]]:
+        embedding = await self._query_embedding(text)
+        return await self.run(
+            self.graph._similarity_search_node,
+            text,
+            threshold=threshold,
+            descending=descending,
+            limit=limit,
+            sort_by=sort_by,
+            embedding=embedding,
+        )
+
+    async def is_unique_prompt(self, text: str, *, threshold: float = 0.9) -> bool:
+        return not await self.search(text, threshold=threshold, limit=1)
+
+    async def search_from_graph(
+        self,
+        text: str,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        descending: bool = False,
+        sort_by: str = "",
+        neighbor_limit: Optional[int] = None,
+        hybrid: bool = False,
+        vector_k: Optional[int] = None,
+        lexical_k: Optional[int] = None,
+        rrf_k: int = 60,
+    ) -> KnowledgeGraph:
+        """Awaitable GraphDB.search_from_graph; node and edge searches run together"""
+        embedding = await self._query_embedding(text)
+
+        try:
+            nodes, similar_edges = await asyncio.gather(
+                self.run(
+                    self.graph._search_seed_nodes,
+                    text,
+                    threshold=threshold,
+                    limit=limit,
+                    descending=descending,
+                    sort_by=sort_by,
+                    hybrid=hybrid,
+                    vector_k=vector_k,
+                    lexical_k=lexical_k,
+                    rrf_k=rrf_k,
+                    embedding=embedding,
+                ),
+                self.run(
+                    self.graph._similarity_search_edge,
+                    text,
+                    threshold=threshold,
+                    descending=descending,
+                    limit=limit,
+                    sort_by=sort_by,
+                    embedding=embedding,
+                ),
+            )
+            return await self.run(
+                self.graph._expand_hits, nodes, similar_edges, neighbor_limit
+            )
+        except KeyError:
+            return KnowledgeGraph()
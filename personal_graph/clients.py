@@ -34,14 +34,22 @@ class OpenAIEmbeddingClient(EmbeddingClient):
 
     def __post_init__(self, *args, **kwargs):
         self.client = self._create_default_client(*args, **kwargs)
+        self.async_client = self._create_default_async_client(*args, **kwargs)
 
     def _create_default_client(self, *args, **kwargs):
         return openai.OpenAI(
             api_key=os.getenv("OPENAI_API_KEY", self.api_key), *args, **kwargs
         )
 
+    def _create_default_async_client(self, *args, **kwargs):
+        return openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY", self.api_key), *args, **kwargs
+        )
+
     def get_embedding_model(self):
-        return OpenAIEmbeddingsModel(self.client, self.model_name, self.dimensions)
+        return OpenAIEmbeddingsModel(
+            self.client, self.model_name, self.dimensions, self.async_client
+        )
 
 
 @dataclass
@@ -52,6 +60,7 @@ class LiteLLMEmbeddingClient(APIClient):
 
     def __post_init__(self, *args, **kwargs):
         self.client = self._create_default_client(*args, **kwargs)
+        self.async_client = self._create_default_async_client(*args, **kwargs)
 
     def _create_default_client(self, *args, **kwargs):
         return openai.OpenAI(
@@ -64,8 +73,21 @@ class LiteLLMEmbeddingClient(APIClient):
             **kwargs,
         )
 
+    def _create_default_async_client(self, *args, **kwargs):
+        return openai.AsyncOpenAI(
+            api_key="",
+            base_url=os.getenv("LITE_LLM_BASE_URL", self.base_url),
+            default_headers={
+                "Authorization": f"Bearer {os.getenv('LITE_LLM_TOKEN', '')}"
+            },
+            *args,
+            **kwargs,
+        )
+
     def get_embedding_model(self):
-        return OpenAIEmbeddingsModel(self.client, self.model_name, self.dimensions)
+        return OpenAIEmbeddingsModel(
+            self.client, self.model_name, self.dimensions, self.async_client
+        )
 
 
 @dataclass
@@ -75,12 +97,18 @@ class OllamaEmbeddingClient(APIClient):
 
     def __post_init__(self, *args, **kwargs):
         self.client = self._create_default_client(*args, **kwargs)
+        self.async_client = self._create_default_async_client(*args, **kwargs)
 
     def _create_default_client(self, *args, **kwargs):
         return ollama.Client(*args, **kwargs)
 
+    def _create_default_async_client(self, *args, **kwargs):
+        return ollama.AsyncClient(*args, **kwargs)
+
     def get_embedding_model(self):
-        return OllamaEmbeddingModel(self.client, self.model_name, self.dimensions)
+        return OllamaEmbeddingModel(
+            self.client, self.model_name, self.dimensions, self.async_client
+        )
 
 
 @dataclass
@@ -90,6 +118,7 @@ class LiteLLMClient(APIClient):
 
     def __post_init__(self, *args, **kwargs):
         self.client = self._create_default_client(*args, **kwargs)
+        self.async_client = self._create_default_async_client(*args, **kwargs)
 
     def _create_default_client(self, *args, **kwargs):
         return openai.OpenAI(
@@ -102,6 +131,17 @@ class LiteLLMClient(APIClient):
             **kwargs,
         )
 
+    def _create_default_async_client(self, *args, **kwargs):
+        return openai.AsyncOpenAI(
+            api_key="",
+            base_url=os.getenv("LITE_LLM_BASE_URL", self.base_url),
+            default_headers={
+                "Authorization": f"Bearer {os.getenv('LITE_LLM_TOKEN', '')}"
+            },
+            *args,
+            **kwargs,
+        )
+
 
 @dataclass
 class OpenAIClient(APIClient):
@@ -110,12 +150,18 @@ class OpenAIClient(APIClient):
 
     def __post_init__(self, *args, **kwargs):
         self.client = self._create_default_client(*args, **kwargs)
+        self.async_client = self._create_default_async_client(*args, **kwargs)
 
     def _create_default_client(self, *args, **kwargs):
         return openai.OpenAI(
             api_key=os.getenv("OPENAI_API_KEY", self.api_key), *args, **kwargs
         )
 
+    def _create_default_async_client(self, *args, **kwargs):
+        return openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY", self.api_key), *args, **kwargs
+        )
+
 
 @dataclass
 class OllamaClient(APIClient):
@@ -1,5 +1,5 @@
 from personal_graph.database.tursodb.turso import TursoDB
-from personal_graph.database.sqlite.sqlite import SQLite
+from personal_graph.database.sqlite.sqlite import SQLite, ConnectionSettings
 from personal_graph.database.fhirdb.fhirDB import FhirDB
 
-__all__ = ["TursoDB", "SQLite", "FhirDB"]
+__all__ = ["TursoDB", "SQLite", "FhirDB", "ConnectionSettings"]
@@ -0,0 +1,99 @@
+"""
+Hand out embed ids and txids without scanning the table for its MAX on every write
+"""
+
+import threading
+from typing import Any, Dict, List
+
+SEQUENCE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS id_sequences (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+)
+"""
+
+
+class IdAllocator:
+    """
+    Allocate increasing integer ids for a column, backed by the id_sequences table.
+
+    Every sequence is seeded once from the existing MAX of its column. After that, ids
+    are reserved in blocks with a single UPDATE ... RETURNING. The UPDATE takes the
+    database write lock, so concurrent writers always get disjoint blocks. Ids from a
+    block are then handed out from memory until it runs dry.
+    """
+
+    def __init__(self, block_size: int = 64):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.block_size = block_size
+        self._blocks: Dict[str, List[int]] = {}
+        self._seeded: set = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"IdAllocator(block_size={self.block_size})"
+
+    def _seed(self, cursor: Any, table: str, column: str) -> str:
+        name = f"{table}.{column}"
+        if name not in self._seeded:
+            cursor.execute(SEQUENCE_SCHEMA)
+            cursor.execute(
+                f"INSERT OR IGNORE INTO id_sequences (name, value) "
+                f"SELECT ?, COALESCE(MAX({column}), 0) FROM {table}",
+                (name,),
+            )
+            self._seeded.add(name)
+        return name
+
+    def _advance(self, cursor: Any, name: str, count: int) -> int:
+        """Move the stored sequence forward by count and return its new value"""
+        return cursor.execute(
+            "UPDATE id_sequences SET value = value + ? WHERE name = ? RETURNING value",
+            (count, name),
+        ).fetchone()[0]
+
+    def next_id(self, cursor: Any, table: str, column: str = "embed_id") -> int:
+        """Return the next id for table.column, reserving a new block when needed"""
+        with self._lock:
+            name = self._seed(cursor, table, column)
+            block = self._blocks.get(name)
+
+            if not block or block[0] > block[1]:
+                end = self._advance(cursor, name, self.block_size)
+                block = [end - self.block_size + 1, end]
+                self._blocks[name] = block
+
+            next_id = block[0]
+            block[0] += 1
+            return next_id
+
+    def reserve(
+        self, cursor: Any, table: str, column: str = "embed_id", count: int = 1
+    ) -> range:
+        """Reserve count consecutive ids for table.column in one statement, for bulk loads"""
+        if count < 1:
+            return range(0)
+
+        with self._lock:
+            name = self._seed(cursor, table, column)
+            end = self._advance(cursor, name, count)
+            return range(end - count + 1, end + 1)
+
+    def release(self, table: str, id: int, column: str = "embed_id") -> None:
+        """Take back the id next_id just handed out, when it ended up unused"""
+        with self._lock:
+            block = self._blocks.get(f"{table}.{column}")
+            if block is not None and block[0] == id + 1:
+                block[0] = id
+
+    def reset(self) -> None:
+        """
+        Forget every block handed out so far.
+
+        Call this after a rollback. A rollback undoes the sequence UPDATE, so the
+        cached blocks may no longer be reserved in the database.
+        """
+        with self._lock:
+            self._blocks.clear()
+            self._seeded.clear()
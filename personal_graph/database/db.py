@@ -1,8 +1,13 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Optional, List, Union
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, List, Union, Tuple
 from graphviz import Digraph  # type: ignore
 
-from personal_graph.models import Node, Edge
+from personal_graph.models import Node, Edge, EdgeInput, KnowledgeGraph
+from personal_graph.database.allocator import IdAllocator
+from personal_graph.database.profiler import ProfilingCursor, QueryProfiler
+from personal_graph.metrics import timed
 
 # CursorExecFunction = Callable[[libsql.Cursor, libsql.Connection], Any]
 CursorExecFunction = Callable[[Any, Any], Any]  # TODO: Constraint the type
@@ -18,6 +23,120 @@ class DB(ABC):
     behavior for each of the abstract methods.
     """
 
+    def __init__(self):
+        self._transaction_depth = 0
+        self._transaction_owner: Optional[int] = None
+        # Serialises writers across threads, held for a whole transaction
+        self._write_lock = threading.RLock()
+        self.ids = IdAllocator()
+        self.profiler: Optional[QueryProfiler] = None
+
+    def _get_connection(self) -> Any:
+        """Return the connection that the next atomic call will run on"""
+        raise NotImplementedError("_get_connection method is not yet implemented")
+
+    @contextmanager
+    def _cursor(self, connection: Any) -> Iterator[Any]:
+        """A cursor on connection, whose statements are timed while profiling is on"""
+        with timed("db"):
+            profiler = self.profiler
+            if profiler is None:
+                yield connection.cursor()
+                return
+
+            cursor = ProfilingCursor(connection.cursor(), connection, profiler)
+            try:
+                yield cursor
+            finally:
+                cursor.finish()
+
+    def enable_profiling(
+        self,
+        *,
+        slow_threshold: float = 0.1,
+        explain: bool = True,
+        max_slow_queries: int = 100,
+    ) -> QueryProfiler:
+        """
+        Time every statement run through atomic from now on.
+
+        Statements slower than slow_threshold seconds are logged with their
+        EXPLAIN QUERY PLAN. Read the timings back with stats().
+        """
+        self.profiler = QueryProfiler(
+            slow_threshold=slow_threshold,
+            explain=explain,
+            max_slow_queries=max_slow_queries,
+        )
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        self.profiler = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Timings per statement fingerprint, the most total time first"""
+        if self.profiler is None:
+            return {}
+        return self.profiler.stats()
+
+    def _in_transaction(self) -> bool:
+        """Whether the calling thread is inside a transaction() block"""
+        return (
+            self._transaction_depth > 0
+            and self._transaction_owner == threading.get_ident()
+        )
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the write lock, counting the wait for it as database time"""
+        with timed("db"):
+            self._write_lock.acquire()
+        try:
+            yield
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run every atomic call made inside the block in a single transaction.
+
+        The outermost block commits once on exit, or rolls back if the block raises.
+        Nested blocks become savepoints, so an inner failure only undoes its own work.
+        Other threads' writes wait until the outermost block exits.
+        """
+        with self._locked():
+            connection = self._get_connection()
+            depth = self._transaction_depth
+            savepoint = f"transaction_{depth}"
+
+            if depth == 0:
+                connection.execute("BEGIN IMMEDIATE")
+                self._transaction_owner = threading.get_ident()
+            else:
+                connection.execute(f"SAVEPOINT {savepoint}")
+            self._transaction_depth += 1
+
+            try:
+                yield
+            except BaseException:
+                self._transaction_depth -= 1
+                if depth == 0:
+                    self._transaction_owner = None
+                    connection.rollback()
+                else:
+                    connection.execute(f"ROLLBACK TO {savepoint}")
+                    connection.execute(f"RELEASE {savepoint}")
+                self.ids.reset()
+                raise
+            else:
+                self._transaction_depth -= 1
+                if depth == 0:
+                    self._transaction_owner = None
+                    connection.commit()
+                else:
+                    connection.execute(f"RELEASE {savepoint}")
+
     @abstractmethod
     def initialize(self):
         """Initialize the database"""
@@ -48,6 +167,17 @@ class DB(ABC):
         """Retrieve all nodes connected to a given node or edge"""
         pass
 
+    def all_connected_nodes_batch(
+        self, nodes_or_edges: List[Union[Node | Edge]], limit: Optional[int] = None
+    ) -> List[Any]:
+        """Retrieve the nodes connected to any of the given nodes or edges"""
+        connected: List[Any] = []
+        for node_or_edge in nodes_or_edges:
+            for node in self.all_connected_nodes(node_or_edge) or []:
+                if node not in connected:
+                    connected.append(node)
+        return connected
+
     @abstractmethod
     def get_connections(self, identifier: Any) -> CursorExecFunction:
         """Get connections for a given identifier."""
@@ -68,6 +198,16 @@ class DB(ABC):
         """Add an edge to the database"""
         pass
 
+    @abstractmethod
+    def add_nodes_bulk(self, nodes: List[Node]) -> List[Node]:
+        """Insert the nodes whose ids are not in the database yet, returning the ones inserted"""
+        pass
+
+    @abstractmethod
+    def add_edges_bulk(self, edges: List[EdgeInput]) -> List[EdgeInput]:
+        """Insert new edges between existing nodes, returning the ones inserted"""
+        pass
+
     @abstractmethod
     def update_node(self, node: Node):
         """Update a node in the database"""
@@ -90,11 +230,41 @@ class DB(ABC):
 
     @abstractmethod
     def traverse(
-        self, source: Any, target: Optional[Any] = None, with_bodies: bool = False
+        self,
+        source: Any,
+        target: Optional[Any] = None,
+        with_bodies: bool = False,
+        *,
+        max_depth: Optional[int] = None,
+        direction: Optional[str] = None,
+        edge_labels: Optional[List[str]] = None,
+        limit: Optional[int] = None,
     ) -> List:
         """Traverse the graph from a source to an optional target node"""
         pass
 
+    @abstractmethod
+    def shortest_path(
+        self,
+        source: Any,
+        target: Any,
+        max_depth: Optional[int] = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph:
+        """Find a shortest path between two nodes, as its nodes and edges in order"""
+        pass
+
+    @abstractmethod
+    def k_hop(self, node_id: Any, k: int, *, direction: str = "both") -> Dict[str, int]:
+        """Find every node within k hops of a node, with its hop distance"""
+        pass
+
+    @abstractmethod
+    def fetch_edge_endpoints(self) -> List[Tuple[str, str]]:
+        """Fetch the source and target of every edge"""
+        pass
+
     @abstractmethod
     def fetch_node_id(self, id: Any):
         """Fetch a node ID given another identifier"""
@@ -122,6 +292,20 @@ class DB(ABC):
         """Visualize the graph using Graphviz"""
         pass
 
+    @abstractmethod
+    def iter_nodes(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, Any]]:
+        """Stream every node as (id, label, attributes)"""
+        pass
+
+    @abstractmethod
+    def iter_edges(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, str, Any]]:
+        """Stream every edge as (source, target, label, attributes)"""
+        pass
+
     @abstractmethod
     def fetch_ids_from_db(self) -> List[str]:
         """Fetch all IDs from the database"""
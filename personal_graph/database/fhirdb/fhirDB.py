@@ -3,13 +3,14 @@ import os
 from functools import lru_cache
 from pathlib import Path
 
-from typing import List, Any, Dict, Optional, Callable, Union
+from typing import List, Any, Dict, Iterator, Optional, Callable, Union, Tuple
 
 from graphviz import Digraph  # type: ignore
 from jsonschema import Draft7Validator, exceptions
 
-from personal_graph.models import Node, Edge
+from personal_graph.models import Node, Edge, EdgeInput, KnowledgeGraph
 from personal_graph.database.db import DB
+from personal_graph.metrics import timed
 
 try:
     import libsql_experimental as libsql  # type: ignore
@@ -29,13 +30,14 @@ def read_sql(sql_file: Path) -> str:
 
 class FhirDB(DB):
     def __init__(self, db_url: str):
+        super().__init__()
         self.db_url = db_url
 
     def __eq__(self, other):
         return self.db_url == other.db_url
 
     def __repr__(self) -> str:
-        return f"  FhirFB(\n" f"  url={self.db_url},\n" f"  )"
+        return f"  FhirFB(\n  url={self.db_url},\n  )"
 
     def set_ontologies(self, ontologies: Optional[List[Any]] = None):
         if not ontologies:
@@ -52,17 +54,36 @@ class FhirDB(DB):
     def save(self):
         self._connection.commit()
 
-    def _atomic(self, cursor_exec_fn: CursorExecFunction) -> Any:
-        self._connection = libsql.connect(
+    def _get_connection(self) -> Any:
+        # A transaction has to stay on the connection it was started on
+        if self._transaction_depth and hasattr(self, "_connection"):
+            return self._connection
+
+        self._connection: Any = libsql.connect(
             database=self.db_url,
             auth_token=os.getenv("TURSO_PATIENTS_GROUP_AUTH_TOKEN"),
         )
+        self._connection.execute("PRAGMA foreign_keys = TRUE;")
+        return self._connection
 
-        cursor = self._connection.cursor()
-        cursor.execute("PRAGMA foreign_keys = TRUE;")
-        results = cursor_exec_fn(cursor, self._connection)
-        self._connection.commit()
-        return results
+    def _atomic(self, cursor_exec_fn: CursorExecFunction) -> Any:
+        # Waiting for the lock counts as database time too
+        with timed("db"), self._write_lock:
+            connection = self._get_connection()
+
+            with self._cursor(connection) as cursor:
+                # Inside transaction() the commit happens once, when the block exits
+                if self._transaction_depth:
+                    return cursor_exec_fn(cursor, connection)
+
+                try:
+                    results = cursor_exec_fn(cursor, connection)
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    self.ids.reset()
+                    raise
+                return results
 
     def _validate_data(self, json_data: Dict) -> bool:
         with open(JSON_SCHEMA_FILE, "r", encoding="utf-8") as f:
@@ -83,13 +104,8 @@ class FhirDB(DB):
             if self._validate_data(attribute):
                 resource_type = label.lower()
 
-                count = cursor.execute(
-                    f"SELECT COALESCE(MAX(embed_id), 0) FROM {resource_type}"
-                ).fetchone()[0]
-
-                txid = cursor.execute(
-                    f"SELECT COALESCE(MAX(txid), 0) FROM {resource_type}_history"
-                ).fetchone()[0]
+                count = self.ids.next_id(cursor, resource_type)
+                txid = self.ids.next_id(cursor, f"{resource_type}_history", "txid")
 
                 cursor.execute(
                     f"""
@@ -98,7 +114,7 @@ class FhirDB(DB):
                         FROM {resource_type}
                         WHERE id = ?
                     """,
-                    (int(txid) + 1, id),
+                    (txid, id),
                 )
 
                 cursor.execute(
@@ -112,14 +128,13 @@ class FhirDB(DB):
                         resource = excluded.resource
                     """,
                     (
-                        int(count) + 1,
+                        count,
                         id,
-                        int(txid) + 1,
+                        txid,
                         resource_type,
                         json.dumps(attribute),
                     ),
                 )
-                connection.commit()
 
         return self._atomic(_add_node)
 
@@ -136,14 +151,12 @@ class FhirDB(DB):
             if not source_rt or not target_rt:
                 raise ValueError("source or target node types not given.")
 
-            count = cursor.execute(
-                "SELECT COALESCE(MAX(embed_id), 0) FROM relations"
-            ).fetchone()[0]
+            count = self.ids.next_id(cursor, "relations")
 
             cursor.execute(
                 "INSERT INTO relations VALUES(?, ?, ?, ?, ?, ?, json(?))",
                 (
-                    int(count) + 1,
+                    count,
                     source,
                     source_rt,
                     target,
@@ -162,13 +175,8 @@ class FhirDB(DB):
             if not self._validate_data(node.attributes):
                 raise ValueError("Fhir Validation Error")
 
-            count = cursor.execute(
-                f"SELECT COALESCE(MAX(embed_id), 0) FROM {resource_type}"
-            ).fetchone()[0]
-
-            txid = cursor.execute(
-                f"SELECT COALESCE(MAX(txid), 0) FROM {resource_type}_history"
-            ).fetchone()[0]
+            count = self.ids.next_id(cursor, resource_type)
+            txid = self.ids.next_id(cursor, f"{resource_type}_history", "txid")
 
             cursor.execute(
                 f"""
@@ -180,7 +188,7 @@ class FhirDB(DB):
                     status = 'updated',
                     resource = excluded.resource
                 """,
-                (node.id, int(txid) + 1, resource_type, json.dumps(node.attributes)),
+                (node.id, txid, resource_type, json.dumps(node.attributes)),
             )
 
             cursor.execute(
@@ -195,16 +203,14 @@ class FhirDB(DB):
                     resource = excluded.resource
                 """,
                 (
-                    int(count) + 1,
+                    count,
                     node.id,
-                    int(txid) + 1,
+                    txid,
                     resource_type,
                     json.dumps(node.attributes),
                 ),
             )
 
-            connection.commit()
-
         return self._atomic(_update)
 
     def remove_node(self, id: Any, node_type: Optional[str] = None) -> None:
@@ -212,9 +218,7 @@ class FhirDB(DB):
             if not node_type:
                 raise ValueError("Resource type not provided")
 
-            txid = cursor.execute(
-                f"SELECT COALESCE(MAX(txid), 0) FROM {node_type}_history"
-            ).fetchone()[0]
+            txid = self.ids.next_id(cursor, f"{node_type}_history", "txid")
 
             cursor.execute(
                 f"""
@@ -223,7 +227,7 @@ class FhirDB(DB):
                     FROM {node_type}
                     WHERE id = ?
                 """,
-                (int(txid) + 1, id),
+                (txid, id),
             )
 
             cursor.execute(
@@ -309,15 +313,78 @@ class FhirDB(DB):
 
         return self._atomic(_outdegree_edges)
 
+    def _iter_rows(self, query: str, batch_size: int) -> Iterator[List[Any]]:
+        # Keyset pagination on the first (TEXT) column, every key sorts after ""
+        last = ""
+        while True:
+
+            def _fetch_rows(cursor, connection):
+                return cursor.execute(query, (last, batch_size)).fetchall()
+
+            rows = self._atomic(_fetch_rows)
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][0]
+
+    def iter_nodes(
+        self,
+        *,
+        batch_size: int = 1000,
+        decode: bool = True,
+        node_type: Optional[str] = None,
+    ) -> Iterator[Tuple[str, str, Any]]:
+        """Stream every resource of node_type as (id, resource type, resource)"""
+        if not node_type:
+            raise ValueError("Resource type not provided.")
+
+        query = (
+            f"SELECT id, resource FROM {node_type.lower()} "
+            f"WHERE id > ? ORDER BY id LIMIT ?"
+        )
+        for rows in self._iter_rows(query, batch_size):
+            for identifier, resource in rows:
+                yield (
+                    identifier,
+                    node_type,
+                    json.loads(resource) if decode else resource,
+                )
+
+    def iter_edges(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, str, Any]]:
+        """Stream every relation as (source id, target id, relation, resource)"""
+        query = (
+            "SELECT embed_id, source_id, target_id, relation, resource FROM relations "
+            "WHERE embed_id > ? ORDER BY embed_id LIMIT ?"
+        )
+        for rows in self._iter_rows(query, batch_size):
+            for _, source, target, relation, resource in rows:
+                yield (
+                    source,
+                    target,
+                    relation,
+                    json.loads(resource) if decode else resource,
+                )
+
+    def fetch_edge_endpoints(self) -> List[Tuple[str, str]]:
+        def _fetch_edge_endpoints(cursor, connection):
+            rows = cursor.execute("SELECT source_id, target_id FROM relations")
+            return [(source, target) for source, target in rows.fetchall()]
+
+        return self._atomic(_fetch_edge_endpoints)
+
     def fetch_ids_from_db(
-        self, limit: Optional[int] = 10, node_type: Optional[str] = None
+        self, limit: Optional[int] = None, node_type: Optional[str] = None
     ) -> List[str]:
         def _fetch_ids_from_db(cursor, connection):
             if not node_type:
                 raise ValueError("Resource type not provided.")
 
             nodes = cursor.execute(
-                f"SELECT id from {node_type.lower()} LIMIT ?", (limit,)
+                f"SELECT id from {node_type.lower()} LIMIT ?",
+                (-1 if limit is None else limit,),
             ).fetchall()
             ids = [id[0] for id in nodes]
 
@@ -364,35 +431,72 @@ class FhirDB(DB):
         return self._atomic(_get_all_connections)
 
     def traverse(
-        self, source: Any, target: Optional[Any] = None, with_bodies: bool = False
+        self,
+        source: Any,
+        target: Optional[Any] = None,
+        with_bodies: bool = False,
+        *,
+        max_depth: Optional[int] = None,
+        direction: Optional[str] = None,
+        edge_labels: Optional[List[str]] = None,
+        limit: Optional[int] = None,
     ) -> List:
+        if direction is None:
+            direction = "out"
+        if direction not in ("in", "out", "both"):
+            raise ValueError("direction must be one of 'in', 'out' or 'both'")
+
+        neighbor_queries = []
+        if direction in ("out", "both"):
+            neighbor_queries.append(
+                "SELECT target_id FROM relations WHERE source_id = ?"
+            )
+        if direction in ("in", "both"):
+            neighbor_queries.append(
+                "SELECT source_id FROM relations WHERE target_id = ?"
+            )
+        if edge_labels is not None:
+            neighbor_queries = [
+                f"{query} AND relation IN (SELECT value FROM json_each(?))"
+                for query in neighbor_queries
+            ]
+        neighbors_sql = " UNION ".join(neighbor_queries)
+
         def _traverse(cursor, connection):
             visited = set()
             path = []
 
-            def dfs(current, target):
+            def dfs(current, target, depth):
                 visited.add(current)
                 path.append(current)
 
                 if current == target:
                     return True
 
-                neighbors = cursor.execute(
-                    "SELECT target_id FROM relations WHERE source_id = ?", (current,)
-                ).fetchall()
+                if max_depth is not None and depth >= max_depth:
+                    path.pop()
+                    return False
+
+                bindings: List[Any] = []
+                for _ in neighbor_queries:
+                    bindings.append(current)
+                    if edge_labels is not None:
+                        bindings.append(json.dumps(edge_labels))
+                neighbors = cursor.execute(neighbors_sql, tuple(bindings)).fetchall()
 
                 for neighbor in neighbors:
                     if neighbor[0] not in visited:
-                        if dfs(neighbor[0], target):
+                        if dfs(neighbor[0], target, depth + 1):
                             return True
                 path.pop()
                 return False
 
-            dfs(source, target)
+            dfs(source, target, 0)
 
+            found = path[:limit] if limit is not None else path
             if with_bodies:
-                return [self.search_node(node, resource_type="") for node in path]
-            return path
+                return [self.search_node(node, resource_type="") for node in found]
+            return found
 
         return self._atomic(_traverse)
 
@@ -474,3 +578,179 @@ class FhirDB(DB):
         raise NotImplementedError(
             "search_id_by_node_type method is not yet implemented"
         )
+
+    def add_nodes_bulk(self, nodes: List[Node]) -> List[Node]:
+        """
+        Insert the resources whose ids are not stored yet, each in the table of its
+        label, in one transaction. Returns the nodes inserted; invalid resources are
+        skipped, as add_node does.
+        """
+        inserted: List[Node] = []
+        with self.transaction():
+            for node in nodes:
+                attributes = (
+                    json.loads(node.attributes)
+                    if isinstance(node.attributes, str)
+                    else node.attributes
+                )
+                if self.search_node(
+                    node.id, node_type=node.label
+                ) is None and self._validate_data(attributes):
+                    self.add_node(node.label, attributes, node.id)
+                    inserted.append(node)
+        return inserted
+
+    def add_edges_bulk(self, edges: List[EdgeInput]) -> List[EdgeInput]:
+        """
+        Relate resources that both exist, unless the same relation is stored already,
+        in one transaction. Returns the edges inserted.
+        """
+        inserted: List[EdgeInput] = []
+        with self.transaction():
+            for edge in edges:
+                attributes = (
+                    json.loads(edge.attributes)
+                    if isinstance(edge.attributes, str)
+                    else edge.attributes
+                )
+                if (
+                    self.search_edge(edge.source, edge.target, attributes) is None
+                    and self.search_node(edge.source.id, node_type=edge.source.label)
+                    is not None
+                    and self.search_node(edge.target.id, node_type=edge.target.label)
+                    is not None
+                ):
+                    self.add_edge(
+                        edge.source.id,
+                        edge.target.id,
+                        edge.label,
+                        attributes,
+                        edge.source.label,
+                        edge.target.label,
+                    )
+                    inserted.append(edge)
+        return inserted
+
+    def _expand_frontier(
+        self, cursor: Any, frontier: List[str], direction: str
+    ) -> List[Tuple[str, str, Tuple]]:
+        """Return (resource, neighbor, relation row) for every relation leaving the
+        frontier, fetching a whole BFS level with one query per direction"""
+        if direction not in ("in", "out", "both"):
+            raise ValueError("direction must be one of 'in', 'out' or 'both'")
+
+        columns = "source_id, source_type, target_id, target_type, relation, resource"
+        frontier_json = json.dumps(frontier)
+        steps = []
+        if direction in ("out", "both"):
+            for row in cursor.execute(
+                f"SELECT {columns} FROM relations "
+                "WHERE source_id IN (SELECT value FROM json_each(?))",
+                (frontier_json,),
+            ).fetchall():
+                steps.append((row[0], row[2], row))
+        if direction in ("in", "both"):
+            for row in cursor.execute(
+                f"SELECT {columns} FROM relations "
+                "WHERE target_id IN (SELECT value FROM json_each(?))",
+                (frontier_json,),
+            ).fetchall():
+                steps.append((row[2], row[0], row))
+        return steps
+
+    def shortest_path(
+        self,
+        source: Any,
+        target: Any,
+        max_depth: Optional[int] = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph:
+        """
+        Find a shortest path with a BFS over the relations. Resource types come from
+        the relations on the path, so a resource has no path to itself.
+        """
+
+        def _shortest_path(cursor, connection):
+            src, tgt = str(source), str(target)
+            # resource -> (previous resource, relation row)
+            parents: Dict[str, Any] = {src: None}
+            frontier = [src]
+            hops = 0
+
+            while tgt not in parents and frontier:
+                if max_depth is not None and hops >= max_depth:
+                    break
+
+                next_frontier = []
+                for node, neighbor, row in self._expand_frontier(
+                    cursor, frontier, direction
+                ):
+                    if neighbor not in parents:
+                        parents[neighbor] = (node, row)
+                        next_frontier.append(neighbor)
+                frontier = next_frontier
+                hops += 1
+
+            if tgt not in parents or src == tgt:
+                return KnowledgeGraph()
+
+            node_ids, rows = [tgt], []
+            node = tgt
+            while parents[node] is not None:
+                node, row = parents[node]
+                node_ids.insert(0, node)
+                rows.insert(0, row)
+
+            types = {row[0]: row[1] for row in rows} | {row[2]: row[3] for row in rows}
+            nodes = []
+            for node_id in node_ids:
+                resource = cursor.execute(
+                    f"SELECT resource FROM {types[node_id].lower()} WHERE id = ?",
+                    (node_id,),
+                ).fetchone()
+                nodes.append(
+                    Node(
+                        id=node_id,
+                        label=types[node_id],
+                        attributes=json.loads(resource[0]) if resource else {},
+                    )
+                )
+
+            return KnowledgeGraph(
+                nodes=nodes,
+                edges=[
+                    Edge(
+                        source=row[0],
+                        target=row[2],
+                        label=row[4],
+                        attributes=json.loads(row[5]),
+                    )
+                    for row in rows
+                ],
+            )
+
+        return self._atomic(_shortest_path)
+
+    def k_hop(self, node_id: Any, k: int, *, direction: str = "both") -> Dict[str, int]:
+        """Map every resource within k hops of node_id to its hop distance"""
+
+        def _k_hop(cursor, connection):
+            distances = {str(node_id): 0}
+            frontier = [str(node_id)]
+
+            for hop in range(1, k + 1):
+                next_frontier = []
+                for _, neighbor, _ in self._expand_frontier(
+                    cursor, frontier, direction
+                ):
+                    if neighbor not in distances:
+                        distances[neighbor] = hop
+                        next_frontier.append(neighbor)
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+
+            return distances
+
+        return self._atomic(_k_hop)
@@ -0,0 +1,236 @@
+"""
+Time the SQL statements run through DB.atomic and log the slow ones with their plans
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from personal_graph.metrics import BUCKETS
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Reduce sql to the shape shared by every call of the same statement.
+
+    Literals become ?, and lists of placeholders collapse to one, so statements built
+    with a varying number of ids or inlined values are counted together.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class StatementStats:
+    """Running count, total and latency histogram of one statement fingerprint"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.buckets = [0] * len(BUCKETS)
+        self.plan: Optional[List[str]] = None
+
+    def observe(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                self.buckets[i] += 1
+                break
+
+    def as_dict(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(BUCKETS, self.buckets):
+            cumulative += count
+            buckets[bound] = cumulative
+
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "slow": self.slow,
+            "buckets": buckets,
+            "plan": self.plan,
+        }
+
+
+class QueryProfiler:
+    """
+    Per-fingerprint statement timings for one database.
+
+    A statement's time covers its execute call and every fetch made from its cursor
+    until the next statement. Statements slower than slow_threshold seconds are logged
+    and kept in slow_queries, together with their EXPLAIN QUERY PLAN when explain is
+    set. The plan is captured once per fingerprint.
+    """
+
+    def __init__(
+        self,
+        *,
+        slow_threshold: float = 0.1,
+        explain: bool = True,
+        max_slow_queries: int = 100,
+    ):
+        self.slow_threshold = slow_threshold
+        self.explain = explain
+        self._statements: Dict[str, StatementStats] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=max_slow_queries)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryProfiler(slow_threshold={self.slow_threshold}, "
+            f"explain={self.explain})"
+        )
+
+    def record(
+        self, sql: str, params: Any, elapsed: float, connection: Any = None
+    ) -> None:
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self._statements.setdefault(key, StatementStats())
+            stats.observe(elapsed)
+            if elapsed < self.slow_threshold:
+                return
+
+            stats.slow += 1
+            needs_plan = self.explain and stats.plan is None
+
+        plan = None
+        if needs_plan and connection is not None:
+            plan = self._explain(connection, sql, params)
+
+        with self._lock:
+            if plan is not None:
+                stats.plan = plan
+            self._slow.append(
+                {
+                    "sql": sql,
+                    "params": params,
+                    "elapsed": elapsed,
+                    "plan": stats.plan,
+                }
+            )
+
+        message = f"Slow query ({elapsed * 1000:.1f} ms): {key}"
+        if stats.plan:
+            message += "".join(f"\n    {step}" for step in stats.plan)
+        logging.warning(message)
+
+    def _explain(self, connection: Any, sql: str, params: Any) -> Optional[List[str]]:
+        if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+
+        try:
+            rows = (
+                connection.cursor()
+                .execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                .fetchall()
+            )
+        except Exception as e:
+            logging.info(f"Could not explain query: {e}")
+            return None
+
+        # Rows are (id, parent, notused, detail); indent each step under its parent
+        depth = {0: 0}
+        plan = []
+        for id, parent, _, detail in rows:
+            depth[id] = depth.get(parent, 0) + 1
+            plan.append("  " * (depth[id] - 1) + detail)
+        return plan
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics per statement fingerprint, the most total time first"""
+        with self._lock:
+            items = [(key, stats.as_dict()) for key, stats in self._statements.items()]
+        return dict(sorted(items, key=lambda item: item[1]["total"], reverse=True))
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """The most recent slow statements, with their parameters and plans"""
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+
+
+class ProfilingCursor:
+    """Wrap a DB-API cursor so each statement run on it is timed by the profiler"""
+
+    def __init__(self, cursor: Any, connection: Any, profiler: QueryProfiler):
+        self._cursor = cursor
+        self._connection = connection
+        self._profiler = profiler
+        self._pending: Optional[Tuple[str, Any]] = None
+        self._elapsed = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def _timed(self, fn: Any, *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._elapsed += time.perf_counter() - start
+
+    def _begin(self, sql: str, params: Any) -> None:
+        self.finish()
+        self._pending = (sql, params)
+
+    def finish(self) -> None:
+        """Record the statement in flight, once its results are no longer read"""
+        if self._pending is not None:
+            sql, params = self._pending
+            self._profiler.record(sql, params, self._elapsed, self._connection)
+        self._pending = None
+        self._elapsed = 0.0
+
+    def execute(self, sql: str, params: Any = ()) -> "ProfilingCursor":
+        self._begin(sql, params)
+        self._timed(self._cursor.execute, sql, params)
+        return self
+
+    def executemany(self, sql: str, seq_of_params: Any) -> "ProfilingCursor":
+        seq_of_params = list(seq_of_params)
+        self._begin(sql, seq_of_params[0] if seq_of_params else ())
+        self._timed(self._cursor.executemany, sql, seq_of_params)
+        return self
+
+    def executescript(self, script: str) -> "ProfilingCursor":
+        self._begin(script, None)
+        self._timed(self._cursor.executescript, script)
+        return self
+
+    def fetchone(self) -> Any:
+        return self._timed(self._cursor.fetchone)
+
+    def fetchmany(self, *args: Any) -> List[Any]:
+        return self._timed(self._cursor.fetchmany, *args)
+
+    def fetchall(self) -> List[Any]:
+        return self._timed(self._cursor.fetchall)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
@@ -0,0 +1,35 @@
+-- Like nodes_fts: contentless, over the label and the JSON values of attributes
+CREATE VIRTUAL TABLE IF NOT EXISTS edges_fts USING fts5(
+    label,
+    attributes,
+    content='',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- An insert that hits UNIQUE(source, target, attributes) replaces the old row.
+-- Connections enable recursive_triggers, so that delete fires edges_fts_delete.
+CREATE TRIGGER IF NOT EXISTS edges_fts_insert AFTER INSERT ON edges BEGIN
+    INSERT INTO edges_fts (rowid, label, attributes)
+    VALUES (new.embed_id, new.label, (
+        SELECT group_concat(value, ' ') FROM (
+            SELECT value FROM json_tree(new.attributes) WHERE atom IS NOT NULL ORDER BY id
+        )
+    ));
+END;
+
+CREATE TRIGGER IF NOT EXISTS edges_fts_delete AFTER DELETE ON edges BEGIN
+    INSERT INTO edges_fts (edges_fts, rowid, label, attributes)
+    VALUES ('delete', old.embed_id, old.label, (
+        SELECT group_concat(value, ' ') FROM (
+            SELECT value FROM json_tree(old.attributes) WHERE atom IS NOT NULL ORDER BY id
+        )
+    ));
+END;
+
+INSERT INTO edges_fts (rowid, label, attributes)
+SELECT embed_id, label, (
+    SELECT group_concat(value, ' ') FROM (
+        SELECT value FROM json_tree(edges.attributes) WHERE atom IS NOT NULL ORDER BY id
+    )
+)
+FROM edges;
@@ -0,0 +1 @@
+SELECT key, name FROM attribute_indexes ORDER BY key
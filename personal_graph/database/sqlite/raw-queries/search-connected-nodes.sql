@@ -0,0 +1,19 @@
+WITH seeds(id) AS (
+    SELECT DISTINCT value FROM json_each(?)
+),
+links(seed, id) AS (
+    SELECT edges.source, edges.target FROM edges JOIN seeds ON edges.source = seeds.id
+    UNION
+    SELECT edges.target, edges.source FROM edges JOIN seeds ON edges.target = seeds.id
+),
+connected(id) AS (
+    SELECT id FROM seeds WHERE id IN (SELECT seed FROM links)
+    UNION
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY seed) AS neighbor_rank FROM links
+    )
+    WHERE ? < 0 OR neighbor_rank <= ?
+)
+SELECT nodes.id, nodes.label, nodes.attributes
+FROM connected
+JOIN nodes ON nodes.id = connected.id
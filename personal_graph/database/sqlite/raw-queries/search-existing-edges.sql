@@ -0,0 +1,8 @@
+SELECT candidates.key
+FROM json_each(?) AS candidates
+WHERE EXISTS (
+    SELECT 1 FROM edges
+    WHERE edges.source = json_extract(candidates.value, '$[0]')
+      AND edges.target = json_extract(candidates.value, '$[1]')
+      AND edges.attributes = json(json_extract(candidates.value, '$[2]'))
+)
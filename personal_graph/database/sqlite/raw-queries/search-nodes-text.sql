@@ -0,0 +1,6 @@
+SELECT n.id, n.label, n.attributes, bm25(nodes_fts) AS score
+FROM nodes_fts
+JOIN nodes n ON n.embed_id = nodes_fts.rowid
+WHERE nodes_fts MATCH ?
+ORDER BY score
+LIMIT ?
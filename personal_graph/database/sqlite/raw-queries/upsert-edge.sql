@@ -0,0 +1,6 @@
+INSERT INTO edges (embed_id, source, target, label, attributes)
+SELECT ?1, ?2, ?3, ?4, json(?5)
+WHERE EXISTS (SELECT 1 FROM nodes WHERE id = ?2)
+  AND EXISTS (SELECT 1 FROM nodes WHERE id = ?3)
+ON CONFLICT DO NOTHING
+RETURNING embed_id
\ No newline at end of file
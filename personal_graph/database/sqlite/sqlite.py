@@ -1,26 +1,112 @@
 import json
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
 from pathlib import Path
 
 import sqlean as sqlite3  # type: ignore
 from functools import lru_cache
 
 from graphviz import Digraph  # type: ignore
-from typing import Any, Callable, Dict, Optional, List, Union, Tuple
-from personal_graph.models import Node, Edge
+from typing import Any, Callable, Dict, Iterator, Optional, List, Union, Tuple
+from personal_graph.models import Node, Edge, EdgeInput, KnowledgeGraph
 from jinja2 import BaseLoader, Environment, select_autoescape
 
 from personal_graph.visualizers import _as_dot_node, _as_dot_label
 from personal_graph.database.db import DB
+from personal_graph.metrics import timed
 
 CursorExecFunction = Callable[[sqlite3.Cursor, sqlite3.Connection], Any]
 
 
+# Attribute keys are spliced into the SQL text, so that it matches the indexed
+# expression exactly. Only plain (dotted) identifiers are accepted.
+ATTRIBUTE_KEY = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*")
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching any of its words"""
+    return " OR ".join(f'"{term}"' for term in re.findall(r"\w+", text))
+
+
 @lru_cache(maxsize=None)
 def read_sql(sql_file: Path) -> str:
     with open(Path(__file__).parent.resolve() / "raw-queries" / sql_file) as f:
         return f.read()
 
 
+@lru_cache(maxsize=None)
+def list_migrations() -> Tuple[Tuple[int, str], ...]:
+    """Return (version, file name) for every migration script, in version order"""
+    migrations_dir = Path(__file__).parent.resolve() / "raw-queries" / "migrations"
+    return tuple(
+        sorted(
+            (int(migration.name.split("-", 1)[0]), migration.name)
+            for migration in migrations_dir.glob("*.sql")
+        )
+    )
+
+
+class StatementRegistry:
+    """
+    Memoize rendered SQL templates by template name and parameter tuple.
+
+    Each variant is rendered through Jinja once per registry, and every later call
+    is a dictionary lookup. statements() exposes everything rendered so far, and
+    hits and misses count the lookups that did and did not find a rendered variant.
+    """
+
+    def __init__(self, env: Environment):
+        self.env = env
+        self.hits = 0
+        self.misses = 0
+        self._statements: Dict[Tuple[str, Tuple], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def __repr__(self) -> str:
+        return (
+            f"StatementRegistry(statements={len(self)}, hits={self.hits}, "
+            f"misses={self.misses})"
+        )
+
+    @staticmethod
+    def _key(template: str, params: Dict[str, Any]) -> Tuple[str, Tuple]:
+        return (
+            template,
+            tuple(
+                sorted(
+                    (name, tuple(value) if isinstance(value, list) else value)
+                    for name, value in params.items()
+                )
+            ),
+        )
+
+    def render(self, template: str, **params: Any) -> str:
+        key = self._key(template, params)
+        statement = self._statements.get(key)
+        if statement is None:
+            self.misses += 1
+            statement = self.env.get_template(template).render(**params)
+            self._statements[key] = statement
+        else:
+            self.hits += 1
+        return statement
+
+    def statements(self) -> Dict[Tuple[str, Tuple], str]:
+        """Return a copy of every rendered statement, keyed by (template, params)"""
+        return dict(self._statements)
+
+    def clear(self) -> None:
+        self._statements.clear()
+        self.hits = self.misses = 0
+
+
 class SqlTemplateLoader(BaseLoader):
     def __init__(self, templates_dir: Path):
         self.templates_dir = templates_dir
@@ -37,6 +123,198 @@ class SqlTemplateLoader(BaseLoader):
         return read_sql(template_path), template, uptodate
 
 
+@dataclass
+class ConnectionSettings:
+    """PRAGMAs applied to every SQLite connection when it is opened.
+
+    The defaults favour write-heavy, file-backed graphs: WAL journaling with
+    ``synchronous=NORMAL`` only fsyncs at checkpoints instead of on every commit.
+    In-memory databases ignore ``journal_mode`` and ``mmap_size``.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -64000  # Negative values are KiB, i.e. 64MB of page cache
+    mmap_size: int = 268435456
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000  # Milliseconds
+
+    def pragmas(self) -> Dict[str, Any]:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+class ReaderPool:
+    """
+    Up to size read-only connections, each checked out by one thread at a time.
+
+    Connections are opened on first demand. When all of them are busy, callers wait
+    for one to be returned.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], size: int):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self._connect = connect
+        self._idle: queue.Queue = queue.Queue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"ReaderPool(size={self.size}, opened={self._opened})"
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._opened < self.size
+                if grow:
+                    self._opened += 1
+            connection = self._connect() if grow else self._idle.get()
+
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        """Close the idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+            with self._lock:
+                self._opened -= 1
+
+
+class NodeQuery:
+    """
+    Filter and order nodes by their attributes, e.g.
+
+        graph.query().where("depth_score", ">", 3).order_by("date").limit(50)
+
+    Each condition compiles into a single statement. Iterating runs it one page at a
+    time, resuming every page from the last row seen (keyset pagination), so a scan
+    never holds more than page_size rows in memory.
+    """
+
+    OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "LIKE", "GLOB", "IN")
+
+    def __init__(self, db: "SQLite", *, page_size: int = 256):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.db = db
+        self.page_size = page_size
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._order: Optional[str] = None
+        self._desc = False
+        self._limit: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"NodeQuery(filters={self._filters}, order_by={self._order}, "
+            f"desc={self._desc}, limit={self._limit})"
+        )
+
+    def where(self, key: str, op: str = "=", value: Any = None) -> "NodeQuery":
+        op = op.upper()
+        if op not in self.OPERATORS:
+            raise ValueError(
+                f"Unsupported operator {op!r}, use one of {self.OPERATORS}"
+            )
+        if op == "IN":
+            value = json.dumps(list(value))
+        self._filters.append((self.db._attribute_key(key), op, value))
+        return self
+
+    def order_by(self, key: str, *, desc: bool = False) -> "NodeQuery":
+        self._order = self.db._attribute_key(key)
+        self._desc = desc
+        return self
+
+    def limit(self, count: int) -> "NodeQuery":
+        self._limit = count
+        return self
+
+    def _clauses(self) -> List[str]:
+        clauses = []
+        for key, op, _ in self._filters:
+            if op == "IN":
+                clause = self.db.statements.render(
+                    "search-where.template", key=key, key_in=True
+                )
+            else:
+                clause = self.db._generate_clause(key, predicate=op)
+            clauses.append(clause.strip())
+        return clauses
+
+    def _statement(self, *, nulls: bool, keyset: bool) -> str:
+        return self.db.statements.render(
+            "search-nodes-page.template",
+            key=self._order,
+            desc=self._desc,
+            nulls=nulls,
+            keyset=keyset,
+            clauses=self._clauses(),
+        )
+
+    def compile(self) -> Tuple[str, Tuple]:
+        """Return the statement and bindings for the first page"""
+        nulls = self._order is not None and not self._desc
+        bindings = tuple(value for _, _, value in self._filters)
+        return self._statement(nulls=nulls, keyset=False), bindings + (self.page_size,)
+
+    def _phases(self) -> List[bool]:
+        # NULLs sort first in SQLite, and are paged through on embed_id alone
+        if self._order is None:
+            return [False]
+        return [False, True] if self._desc else [True, False]
+
+    def pages(self) -> Iterator[List[Tuple]]:
+        """Run the query a page at a time, as (embed_id, id, label, attributes) rows"""
+        filters = tuple(value for _, _, value in self._filters)
+        remaining = self._limit
+
+        for nulls in self._phases():
+            last: Optional[Tuple] = None
+            while remaining is None or remaining > 0:
+                size = (
+                    self.page_size
+                    if remaining is None
+                    else min(self.page_size, remaining)
+                )
+                query = self._statement(nulls=nulls, keyset=last is not None)
+                bindings = filters + (last or ()) + (size,)
+
+                def _fetch_page(cursor, connection):
+                    return cursor.execute(query, bindings).fetchall()
+
+                rows = self.db.read(_fetch_page)
+                if rows:
+                    yield rows
+                    if remaining is not None:
+                        remaining -= len(rows)
+                if len(rows) < size:
+                    break
+
+                row = rows[-1]
+                last = (row[4], row[0]) if self._order and not nulls else (row[0],)
+
+    def __iter__(self) -> Iterator[Node]:
+        for page in self.pages():
+            for row in page:
+                yield Node(id=row[1], label=row[2], attributes=json.loads(row[3]))
+
+    def all(self) -> List[Node]:
+        return list(self)
+
+    def first(self) -> Optional[Node]:
+        return next(iter(self), None)
+
+
 class SQLite(DB):
     def __init__(
         self,
@@ -45,20 +323,28 @@ class SQLite(DB):
         local_path: Optional[str] = None,
         vector0_so_path: Optional[str] = None,
         vss0_so_path: Optional[str] = None,
+        settings: Optional[ConnectionSettings] = None,
+        readers: int = 0,
     ):
         super().__init__()
         self.use_in_memory = use_in_memory
         self.vector0_so_path = vector0_so_path
         self.vss0_so_path = vss0_so_path
         self.local_path = local_path
+        self.settings = settings if settings is not None else ConnectionSettings()
+
+        # Every in-memory connection is a separate database, so those cannot share
+        self.readers: Optional[ReaderPool] = (
+            ReaderPool(self._connect_reader, readers)
+            if readers and not use_in_memory
+            else None
+        )
 
         self.env = Environment(
             loader=SqlTemplateLoader(Path(__file__).parent / "raw-queries"),
             autoescape=select_autoescape(),
         )
-        self.clause_template = self.env.get_template("search-where.template")
-        self.search_template = self.env.get_template("search-node.template")
-        self.traverse_template = self.env.get_template("traverse.template")
+        self.statements = StatementRegistry(self.env)
 
     def __eq__(self, other):
         return self.local_path == other.local_path
@@ -69,32 +355,150 @@ class SQLite(DB):
             f"    local_path={self.local_path},\n"
             f"    use_in_memory={self.use_in_memory},\n"
             f"    vector0_so_path='{self.vector0_so_path}',\n"
-            f"    vss0_so_path='{self.vss0_so_path}'\n"
+            f"    vss0_so_path='{self.vss0_so_path}',\n"
+            f"    settings={self.settings}\n"
             f"  ),"
         )
 
-    def atomic(self, cursor_exec_fn: CursorExecFunction) -> Any:
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are shared between threads, guarded by _write_lock or the pool
+        if self.use_in_memory:
+            connection = sqlite3.connect(":memory:", check_same_thread=False)
+        else:
+            connection = sqlite3.connect(self.local_path, check_same_thread=False)
+
+        connection.enable_load_extension(True)
+        if self.vector0_so_path and self.vss0_so_path:
+            connection.load_extension(self.vector0_so_path)
+            connection.load_extension(self.vss0_so_path)
+
+        for pragma, value in self.settings.pragmas().items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+        # Rows replaced by ON CONFLICT REPLACE fire their delete triggers, which keep
+        # the full-text indexes in sync
+        connection.execute("PRAGMA recursive_triggers = ON")
+
+        return connection
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        connection = self._connect()
+        connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def _get_connection(self) -> sqlite3.Connection:
         if not hasattr(self, "_connection"):
-            if self.use_in_memory:
-                self._connection = sqlite3.connect(":memory:")
-            else:
-                self._connection = sqlite3.connect(self.local_path)
+            self._connection = self._connect()
+        return self._connection
 
-            self._connection.enable_load_extension(True)
-            if self.vector0_so_path and self.vss0_so_path:
-                self._connection.load_extension(self.vector0_so_path)
-                self._connection.load_extension(self.vss0_so_path)
+    def atomic(self, cursor_exec_fn: CursorExecFunction) -> Any:
+        # Waiting for the lock counts as database time too
+        with timed("db"), self._write_lock:
+            connection = self._get_connection()
+
+            with self._cursor(connection) as cursor:
+                # Inside transaction() the commit happens once, when the block exits
+                if self._transaction_depth:
+                    return cursor_exec_fn(cursor, connection)
+
+                try:
+                    results = cursor_exec_fn(cursor, connection)
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    self.ids.reset()
+                    raise
+                return results
+
+    def read(self, cursor_exec_fn: CursorExecFunction) -> Any:
+        """
+        Run a read-only cursor_exec_fn on a pooled reader connection.
+
+        In WAL mode readers do not block the writer or each other, so concurrent
+        queries from several threads run in parallel. Without a pool, and inside
+        the calling thread's own transaction (whose writes only the writer
+        connection can see), this is the same as atomic().
+
+        vss0 tables keep their index in memory per connection and would go stale on
+        a reader, so vector searches stay on the writer.
+        """
+        if self.readers is None or self._in_transaction():
+            return self.atomic(cursor_exec_fn)
+
+        with timed("db"), self.readers.connection() as connection:
+            with self._cursor(connection) as cursor:
+                return cursor_exec_fn(cursor, connection)
+
+    def save(self):
+        self._connection.commit()
 
+    def _yield_to_writers(self, status: int, remaining: int, total: int) -> None:
+        # Called between backup steps: let queued writers commit before the next one
+        self._write_lock.release()
+        time.sleep(0)
+        self._write_lock.acquire()
+
+    def snapshot(self, path: str, *, pages: int = 1024) -> None:
+        """
+        Copy the whole database, vss0 embedding tables included, to the file at path.
+
+        The copy uses the online backup API, pages at a time. The write lock is
+        released between steps, so writers are not blocked for the whole copy. Their
+        commits go through this same connection and are carried into the backup. The
+        snapshot is written beside path and renamed over it once complete, so a
+        failed copy never leaves a truncated file behind.
+        """
+        if self._in_transaction():
+            raise ValueError("Cannot take a snapshot inside a transaction")
+
+        partial = f"{path}.partial"
+        target = sqlite3.connect(partial)
         try:
-            cursor = self._connection.cursor()
-            results = cursor_exec_fn(cursor, self._connection)
-            self._connection.commit()
+            with self._write_lock:
+                self._get_connection().backup(
+                    target, pages=pages, progress=self._yield_to_writers
+                )
+        finally:
+            target.close()
+        os.replace(partial, path)
+
+    def load_snapshot(self, path: str, *, pages: int = 1024) -> int:
+        """
+        Replace the contents of the database with the snapshot at path, e.g. to warm
+        start an in-memory graph. The snapshot is migrated to the current schema.
+        Returns the schema version.
+        """
+        if self._in_transaction():
+            raise ValueError("Cannot load a snapshot inside a transaction")
+
+        source = sqlite3.connect(path)
+        try:
+            with self._write_lock:
+                # vss0 keeps its index in memory per connection, so restore into a
+                # fresh connection that loads the snapshot's index
+                connection = self._connect()
+                source.backup(connection, pages=pages)
+
+                if hasattr(self, "_connection"):
+                    self._connection.close()
+                self._connection = connection
+                self.ids.reset()
         finally:
-            pass
-        return results
+            source.close()
 
-    def save(self):
-        self._connection.commit()
+        return self.initialize()
+
+    def pragmas(self) -> Dict[str, Any]:
+        """Read back the PRAGMA values in effect on the current connection"""
+
+        def _read_pragmas(cursor, connection):
+            values = {}
+            for pragma in self.settings.pragmas():
+                row = cursor.execute(f"PRAGMA {pragma}").fetchone()
+                # Some PRAGMAs (e.g. mmap_size) report nothing for in-memory databases
+                values[pragma] = row[0] if row else None
+            return values
+
+        return self.atomic(_read_pragmas)
 
     def initialize(self):
         def _init(cursor, connection):
@@ -102,7 +506,137 @@ class SQLite(DB):
             connection.executescript(schema_sql)
             connection.commit()
 
-        return self.atomic(_init)
+        self.atomic(_init)
+        version = self.migrate()
+        self._restore_attribute_indexes()
+        return version
+
+    def schema_version(self) -> int:
+        """Return the number of the last migration applied to the database"""
+
+        def _version(cursor, connection):
+            return cursor.execute("PRAGMA user_version").fetchone()[0]
+
+        return self.atomic(_version)
+
+    def migrate(self) -> int:
+        """
+        Bring the schema up to date by applying every pending migration in order.
+
+        Each migration runs in its own transaction, together with the user_version
+        bump that records it. Returns the schema version afterwards.
+        """
+
+        def _migrate(cursor, connection):
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            pending = [
+                migration for migration in list_migrations() if migration[0] > version
+            ]
+            if not pending:
+                return version
+
+            # Rebuilding a table drops it first, which must not cascade to its edges.
+            # foreign_keys cannot be changed inside a transaction, so set it up front.
+            foreign_keys = cursor.execute("PRAGMA foreign_keys").fetchone()[0]
+            connection.commit()
+            cursor.execute("PRAGMA foreign_keys = OFF")
+
+            try:
+                for version, name in pending:
+                    connection.executescript(
+                        f"BEGIN;\n{read_sql(Path('migrations') / name)}\n"
+                        f"PRAGMA user_version = {version};\nCOMMIT;"
+                    )
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.execute(f"PRAGMA foreign_keys = {foreign_keys}")
+
+            return version
+
+        return self.atomic(_migrate)
+
+    def _attribute_key(self, key: str) -> str:
+        if not ATTRIBUTE_KEY.fullmatch(key):
+            raise ValueError(f"Invalid attribute key: {key!r}")
+        return key
+
+    def order_by_attribute(
+        self, alias: str, key: Optional[str], *, desc: Optional[bool] = False
+    ) -> str:
+        """Render an ORDER BY on a node attribute, in the form an attribute index serves"""
+        if not key:
+            return ""
+        return self.statements.render(
+            "order-by-attribute.template",
+            alias=alias,
+            key=self._attribute_key(key),
+            desc=bool(desc),
+        )
+
+    def query(self, *, page_size: int = 256) -> NodeQuery:
+        """Start a node query, see NodeQuery"""
+        return NodeQuery(self, page_size=page_size)
+
+    def create_attribute_index(self, key: str) -> str:
+        """
+        Index nodes on json_extract(attributes, '$.<key>') and register the key.
+
+        Filters built by _generate_clause and ORDER BYs on the key use the index.
+        Returns the index name.
+        """
+        name = "attr_idx_" + self._attribute_key(key).replace(".", "__")
+
+        def _create_attribute_index(cursor, connection):
+            cursor.execute(
+                self.statements.render("attribute-index.template", name=name, key=key)
+            )
+            cursor.execute(read_sql(Path("insert-attribute-index.sql")), (key, name))
+
+        self.atomic(_create_attribute_index)
+        return name
+
+    def drop_attribute_index(self, key: str) -> bool:
+        """Drop the index on an attribute key. Returns False if it was not indexed"""
+
+        def _drop_attribute_index(cursor, connection):
+            row = cursor.execute(
+                read_sql(Path("delete-attribute-index.sql")), (key,)
+            ).fetchone()
+            if row is None:
+                return False
+
+            cursor.execute(
+                self.statements.render(
+                    "attribute-index.template", name=row[0], drop=True
+                )
+            )
+            return True
+
+        return self.atomic(_drop_attribute_index)
+
+    def attribute_indexes(self) -> List[str]:
+        """Return the indexed attribute keys"""
+
+        def _attribute_indexes(cursor, connection):
+            rows = cursor.execute(read_sql(Path("search-attribute-indexes.sql")))
+            return [key for key, _ in rows.fetchall()]
+
+        return self.atomic(_attribute_indexes)
+
+    def _restore_attribute_indexes(self) -> None:
+        # Rebuilding nodes in a migration drops its indexes, the registry keeps them
+        def _restore(cursor, connection):
+            rows = cursor.execute(read_sql(Path("search-attribute-indexes.sql")))
+            for key, name in rows.fetchall():
+                cursor.execute(
+                    self.statements.render(
+                        "attribute-index.template", name=name, key=key
+                    )
+                )
+
+        self.atomic(_restore)
 
     def _set_id(self, identifier: Any, data: Dict) -> Dict:
         if identifier is not None:
@@ -117,10 +651,7 @@ class SQLite(DB):
         label: str,
         data: Dict,
     ) -> None:
-        count = (
-            cursor.execute("SELECT COALESCE(MAX(embed_id), 0) FROM nodes").fetchone()[0]
-            + 1
-        )
+        count = self.ids.next_id(cursor, "nodes")
 
         set_data = self._set_id(identifier, data)
 
@@ -132,7 +663,6 @@ class SQLite(DB):
                 json.dumps(set_data),
             ),
         )
-        connection.commit()
 
     def _add_node(
         self,
@@ -153,12 +683,7 @@ class SQLite(DB):
         attributes: Dict = {},
     ) -> CursorExecFunction:
         def _connect_single_nodes(cursor, connection):
-            count = (
-                cursor.execute(
-                    "SELECT COALESCE(MAX(embed_id), 0) FROM edges"
-                ).fetchone()[0]
-                + 1
-            )
+            count = self.ids.next_id(cursor, "edges")
 
             cursor.execute(
                 read_sql(Path("insert-edge.sql")),
@@ -173,6 +698,103 @@ class SQLite(DB):
 
         return _connect_single_nodes
 
+    def _insert_nodes_bulk(self, nodes: List[Node]) -> CursorExecFunction:
+        def _insert_nodes(cursor, connection):
+            existing = {
+                row[0]
+                for row in cursor.execute(
+                    read_sql(Path("search-existing-nodes.sql")),
+                    (json.dumps([str(node.id) for node in nodes]),),
+                )
+            }
+
+            new_nodes = []
+            for node in nodes:
+                if str(node.id) not in existing:
+                    existing.add(str(node.id))
+                    new_nodes.append(node)
+
+            embed_ids = self.ids.reserve(cursor, "nodes", count=len(new_nodes))
+            cursor.executemany(
+                read_sql(Path("insert-node.sql")),
+                [
+                    (
+                        embed_id,
+                        node.label,
+                        json.dumps(
+                            self._set_id(
+                                node.id,
+                                json.loads(node.attributes)
+                                if isinstance(node.attributes, str)
+                                else dict(node.attributes),
+                            )
+                        ),
+                    )
+                    for embed_id, node in zip(embed_ids, new_nodes)
+                ],
+            )
+            return new_nodes
+
+        return _insert_nodes
+
+    def _insert_edges_bulk(self, edges: List[EdgeInput]) -> CursorExecFunction:
+        def _insert_edges(cursor, connection):
+            endpoints = {str(edge.source.id) for edge in edges} | {
+                str(edge.target.id) for edge in edges
+            }
+            existing_nodes = {
+                row[0]
+                for row in cursor.execute(
+                    read_sql(Path("search-existing-nodes.sql")),
+                    (json.dumps(list(endpoints)),),
+                )
+            }
+
+            candidates = [
+                (
+                    str(edge.source.id),
+                    str(edge.target.id),
+                    json.dumps(
+                        json.loads(edge.attributes)
+                        if isinstance(edge.attributes, str)
+                        else edge.attributes
+                    ),
+                )
+                for edge in edges
+            ]
+            existing_edges = {
+                row[0]
+                for row in cursor.execute(
+                    read_sql(Path("search-existing-edges.sql")),
+                    (json.dumps(candidates),),
+                )
+            }
+
+            new_edges, rows, seen = [], [], set()
+            for index, (edge, candidate) in enumerate(zip(edges, candidates)):
+                if (
+                    index in existing_edges
+                    or candidate in seen
+                    or candidate[0] not in existing_nodes
+                    or candidate[1] not in existing_nodes
+                ):
+                    continue
+                seen.add(candidate)
+                new_edges.append(edge)
+                rows.append(candidate)
+
+            embed_ids = self.ids.reserve(cursor, "edges", count=len(new_edges))
+            cursor.executemany(
+                read_sql(Path("insert-edge.sql")),
+                [
+                    (embed_id, edge.source.id, edge.target.id, edge.label, row[2])
+                    for embed_id, edge, row in zip(embed_ids, new_edges, rows)
+                ],
+            )
+            return new_edges
+
+        return _insert_edges
+
     def _generate_clause(
         self,
         key: str,
@@ -191,16 +813,27 @@ class SQLite(DB):
 
         if tree:
             if tree_with_key:
-                return self.clause_template.render(
-                    and_or=joiner, key=key, tree=tree, predicate=predicate
+                return self.statements.render(
+                    "search-where.template",
+                    and_or=joiner,
+                    key=key,
+                    tree=tree,
+                    predicate=predicate,
                 )
             else:
-                return self.clause_template.render(
-                    and_or=joiner, tree=tree, predicate=predicate
+                return self.statements.render(
+                    "search-where.template",
+                    and_or=joiner,
+                    tree=tree,
+                    predicate=predicate,
                 )
 
-        return self.clause_template.render(
-            and_or=joiner, key=key, predicate=predicate, key_value=True
+        return self.statements.render(
+            "search-where.template",
+            and_or=joiner,
+            key=key,
+            predicate=predicate,
+            key_value=True,
         )
 
     def _generate_query(
@@ -218,24 +851,32 @@ class SQLite(DB):
 
         if tree:
             if key:
-                return self.search_template.render(
+                return self.statements.render(
+                    "search-node.template",
                     result_column=result_column,
                     tree=tree,
                     key=key,
                     search_clauses=where_clauses,
                 )
             else:
-                return self.search_template.render(
-                    result_column=result_column, tree=tree, search_clauses=where_clauses
+                return self.statements.render(
+                    "search-node.template",
+                    result_column=result_column,
+                    tree=tree,
+                    search_clauses=where_clauses,
                 )
 
-        return self.search_template.render(
-            result_column=result_column, search_clauses=where_clauses
+        return self.statements.render(
+            "search-node.template",
+            result_column=result_column,
+            search_clauses=where_clauses,
         )
 
     def _find_node(self, identifier: Any) -> CursorExecFunction:
         def _find_single_node(cursor, connection):
-            query = self._generate_query([self.clause_template.render(id_lookup=True)])
+            query = self._generate_query(
+                [self.statements.render("search-where.template", id_lookup=True)]
+            )
             result = cursor.execute(query, (identifier,)).fetchone()
             if result:
                 if isinstance(result[0], str):
@@ -274,10 +915,7 @@ class SQLite(DB):
 
         updated_data = {**current_data, **data}
 
-        count = (
-            cursor.execute("SELECT COALESCE(MAX(embed_id), 0) FROM nodes").fetchone()[0]
-            + 1
-        )
+        count = self.ids.next_id(cursor, "nodes")
 
         cursor.execute(
             read_sql(Path("update-node.sql")),
@@ -311,46 +949,90 @@ class SQLite(DB):
 
         return _remove_single_node
 
-    def _find_neighbors(self, with_bodies: bool = False) -> str:
-        return self.traverse_template.render(
-            with_bodies=with_bodies, inbound=True, outbound=True
+    def _neighbors_query(
+        self,
+        direction: str,
+        with_bodies: bool = False,
+        depth_limited: bool = False,
+        label_filtered: bool = False,
+        limited: bool = False,
+    ) -> str:
+        if direction not in ("in", "out", "both"):
+            raise ValueError("direction must be one of 'in', 'out' or 'both'")
+
+        return self.statements.render(
+            "traverse.template",
+            with_bodies=with_bodies,
+            inbound=direction in ("in", "both"),
+            outbound=direction in ("out", "both"),
+            depth_limited=depth_limited,
+            label_filtered=label_filtered,
+            limited=limited,
         )
 
+    def _find_neighbors(self, with_bodies: bool = False) -> str:
+        return self._neighbors_query("both", with_bodies)
+
     def _find_outbound_neighbors(self, with_bodies: bool = False) -> str:
-        return self.traverse_template.render(with_bodies=with_bodies, outbound=True)
+        return self._neighbors_query("out", with_bodies)
 
     def _find_inbound_neighbors(self, with_bodies: bool = False) -> str:
-        return self.traverse_template.render(with_bodies=with_bodies, inbound=True)
+        return self._neighbors_query("in", with_bodies)
 
     def _traverse(
         self,
         src: Any = None,
         tgt: Any = None,
-        neighbors_fn: Callable[[bool], str] = _find_neighbors,  # type: ignore
+        direction: str = "both",
         with_bodies: bool = False,
+        max_depth: Optional[int] = None,
+        edge_labels: Optional[List[str]] = None,
+        limit: Optional[int] = None,
     ) -> List:
+        query = self._neighbors_query(
+            direction,
+            with_bodies,
+            depth_limited=max_depth is not None,
+            label_filtered=edge_labels is not None,
+            limited=limit is not None,
+        )
+
+        # Bindings follow the placeholders' order in traverse.template
+        bindings: List[Any] = [src]
+        for branch in ("in", "out"):
+            if direction in (branch, "both"):
+                if max_depth is not None:
+                    bindings.append(max_depth)
+                if edge_labels is not None:
+                    bindings.append(json.dumps(edge_labels))
+        if limit is not None:
+            bindings.append(limit)
+
         def _traverse_graph(cursor, connection):
             path = []
-            target = json.dumps(tgt)
-            rows = cursor.execute(
-                neighbors_fn(with_bodies=with_bodies), (src,)
-            ).fetchall()
-            for row in rows:
+            seen = set()
+            target = None if tgt is None else str(tgt)
+
+            # The CTE produces rows lazily in breadth-first order, so stopping the
+            # iteration at the target also stops the recursion.
+            cursor.execute(query, tuple(bindings))
+            for row in iter(cursor.fetchone, None):
                 if row:
                     if with_bodies:
                         identifier, obj, _ = row
                         path.append(row)
-                        if identifier == target and obj == "()":
+                        if str(identifier) == target and obj == "()":
                             break
                     else:
                         identifier = row[0]
-                        if identifier not in path:
+                        if identifier not in seen:
+                            seen.add(identifier)
                             path.append(identifier)
-                            if identifier == target:
+                            if str(identifier) == target:
                                 break
             return path
 
-        return self.atomic(_traverse_graph)
+        return self.read(_traverse_graph)
 
     def _parse_search_results(self, results: List[Tuple], idx: int = 0) -> List[Dict]:
         return [json.loads(item[idx]) for item in results]
@@ -384,7 +1066,7 @@ class SQLite(DB):
         def _get_connections(cursor, connection):
             return cursor.execute(direction(), (identifier,)).fetchall()
 
-        return self.atomic(_get_connections)
+        return self.read(_get_connections)
 
     def _fetch_node_id(self, node_id: Any, limit: int):
         def _get_node_id(cursor, connection):
@@ -412,41 +1094,181 @@ class SQLite(DB):
 
         return _get_edge_embed_ids
 
+    def _expand_frontier(
+        self, cursor: sqlite3.Cursor, frontier: List[str], direction: str
+    ) -> List[Tuple[str, str, Tuple]]:
+        """Return (node, neighbor, edge row) for every edge leaving the frontier,
+        fetching a whole BFS level with one IN query per direction"""
+        if direction not in ("in", "out", "both"):
+            raise ValueError("direction must be one of 'in', 'out' or 'both'")
+
+        frontier_json = json.dumps(frontier)
+        steps = []
+        if direction in ("out", "both"):
+            for edge in cursor.execute(
+                read_sql(Path("search-frontier-outbound.sql")), (frontier_json,)
+            ).fetchall():
+                steps.append((edge[0], edge[1], edge))
+        if direction in ("in", "both"):
+            for edge in cursor.execute(
+                read_sql(Path("search-frontier-inbound.sql")), (frontier_json,)
+            ).fetchall():
+                steps.append((edge[1], edge[0], edge))
+        return steps
+
+    def shortest_path(
+        self,
+        source: Any,
+        target: Any,
+        max_depth: Optional[int] = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph:
+        """Find a shortest path with a bidirectional BFS, expanding the smaller
+        frontier one level at a time"""
+        reverse = {"in": "out", "out": "in", "both": "both"}
+
+        def _shortest_path(cursor, connection):
+            src, tgt = str(source), str(target)
+            # node -> (previous node, edge row) on each side, and the hop count
+            parents: List[Dict[str, Any]] = [{src: None}, {tgt: None}]
+            depths: List[Dict[str, int]] = [{src: 0}, {tgt: 0}]
+            frontiers = [[src], [tgt]]
+            hops = 0
+            meeting = src if src == tgt else None
+
+            while meeting is None and frontiers[0] and frontiers[1]:
+                if max_depth is not None and hops >= max_depth:
+                    break
+
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                other = 1 - side
+                next_frontier = []
+
+                for node, neighbor, edge in self._expand_frontier(
+                    cursor,
+                    frontiers[side],
+                    direction if side == 0 else reverse[direction],
+                ):
+                    if neighbor in parents[side]:
+                        continue
+                    parents[side][neighbor] = (node, edge)
+                    depths[side][neighbor] = depths[side][node] + 1
+                    next_frontier.append(neighbor)
+
+                    if neighbor in parents[other] and (
+                        meeting is None
+                        or depths[other][neighbor] < depths[other][meeting]
+                    ):
+                        meeting = neighbor
+
+                frontiers[side] = next_frontier
+                hops += 1
+
+            if meeting is None:
+                return KnowledgeGraph()
+
+            node_ids, edges = [meeting], []
+            node = meeting
+            while parents[0][node] is not None:
+                node, edge = parents[0][node]
+                node_ids.insert(0, node)
+                edges.insert(0, edge)
+            node = meeting
+            while parents[1][node] is not None:
+                node, edge = parents[1][node]
+                node_ids.append(node)
+                edges.append(edge)
+
+            rows = cursor.execute(
+                read_sql(Path("search-nodes-by-id.sql")), (json.dumps(node_ids),)
+            ).fetchall()
+            found = {row[0]: row for row in rows}
+
+            return KnowledgeGraph(
+                nodes=[
+                    Node(
+                        id=node_id,
+                        label=found[node_id][1],
+                        attributes=json.loads(found[node_id][2]),
+                    )
+                    for node_id in node_ids
+                ],
+                edges=[
+                    Edge(
+                        source=edge[0],
+                        target=edge[1],
+                        label=edge[2],
+                        attributes=json.loads(edge[3]),
+                    )
+                    for edge in edges
+                ],
+            )
+
+        return self.read(_shortest_path)
+
+    def k_hop(self, node_id: Any, k: int, *, direction: str = "both") -> Dict[str, int]:
+        """Map every node within k hops of node_id to its hop distance"""
+
+        def _k_hop(cursor, connection):
+            distances = {str(node_id): 0}
+            frontier = [str(node_id)]
+
+            for hop in range(1, k + 1):
+                next_frontier = []
+                for _, neighbor, _ in self._expand_frontier(
+                    cursor, frontier, direction
+                ):
+                    if neighbor not in distances:
+                        distances[neighbor] = hop
+                        next_frontier.append(neighbor)
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+
+            return distances
+
+        return self.read(_k_hop)
+
+    def fetch_edge_endpoints(self) -> List[Tuple[str, str]]:
+        """Return the source and target of every edge, for in-memory indexes"""
+
+        def _fetch_edge_endpoints(cursor, connection):
+            return cursor.execute(
+                read_sql(Path("search-edge-endpoints.sql"))
+            ).fetchall()
+
+        return self.read(_fetch_edge_endpoints)
+
+    def _seed_ids(self, node_or_edge: Union[Node | Edge]) -> List[str]:
+        if isinstance(node_or_edge, Node):
+            return [str(node_or_edge.id)]
+        if isinstance(node_or_edge, Edge):
+            return [str(node_or_edge.source), str(node_or_edge.target)]
+        return []
+
     def all_connected_nodes(
-        self, node_or_edge: Union[Node | Edge], limit: Optional[int] = 1
+        self, node_or_edge: Union[Node | Edge], limit: Optional[int] = None
     ) -> Any:
-        def _connected_nodes(cursor, connection):
-            nodes = None
-            if isinstance(node_or_edge, Node):
-                index = node_or_edge.id
-                nodes = cursor.execute(
-                    "SELECT source, target FROM edges WHERE source=? OR target=? LIMIT ?",
-                    (index, index, limit),
-                )
-            elif isinstance(node_or_edge, Edge):
-                index1, index2 = node_or_edge.source, node_or_edge.target
-                nodes = cursor.execute(
-                    "SELECT source, target FROM edges WHERE source=? OR target=? OR source=? OR target=? LIMIT ?",
-                    (index1, index1, index2, index2, limit),
-                )
-
-            resultant_connected_nodes = []
-            if nodes:
-                connected_nodes = nodes.fetchall()
-                for connected_node in connected_nodes:
-                    for id in connected_node:
-                        res = cursor.execute(
-                            "SELECT id, label, attributes from nodes where id=? LIMIT ?",
-                            (id, limit),
-                        ).fetchone()
-                        if res not in resultant_connected_nodes:
-                            resultant_connected_nodes.append(
-                                Node(id=res[0], label=res[1], attributes=res[2])
-                            )
+        return self.all_connected_nodes_batch([node_or_edge], limit)
 
-                return resultant_connected_nodes
+    def all_connected_nodes_batch(
+        self, nodes_or_edges: List[Union[Node | Edge]], limit: Optional[int] = None
+    ) -> List[Node]:
+        def _connected_nodes(cursor, connection):
+            seeds = [
+                seed
+                for node_or_edge in nodes_or_edges
+                for seed in self._seed_ids(node_or_edge)
+            ]
+            cap = -1 if limit is None else limit
+            rows = cursor.execute(
+                read_sql(Path("search-connected-nodes.sql")),
+                (json.dumps(seeds), cap, cap),
+            ).fetchall()
+            return [Node(id=row[0], label=row[1], attributes=row[2]) for row in rows]
 
-        return self.atomic(_connected_nodes)
+        return self.read(_connected_nodes)
 
     def get_connections(self, identifier: Any) -> CursorExecFunction:
         def _get_all_connections(cursor, connection):
@@ -458,7 +1280,7 @@ class SQLite(DB):
                 ),
             ).fetchall()
 
-        return self.atomic(_get_all_connections)
+        return self.read(_get_all_connections)
 
     def fetch_node_embed_id(self, node_id: Any, limit: int = 1):
         return self.atomic(self._fetch_node_id(node_id, limit))
@@ -468,7 +1290,7 @@ class SQLite(DB):
 
     def search_edge(
         self, source: Any, target: Any, attributes: Dict, limit: int = 1
-    ) -> Dict[Any, Any]:
+    ) -> Optional[int]:
         return self.atomic(self._find_edge(source, target, attributes, limit))
 
     def add_node(self, label: str, attribute: Dict, id: Any):
@@ -489,6 +1311,36 @@ class SQLite(DB):
         )
         self.atomic(connect_nodes_func)
 
+    def upsert_edge(
+        self, source: Any, target: Any, label: str, attributes: Dict
+    ) -> Optional[int]:
+        """
+        Insert the edge in one statement, unless it already exists or one of its
+        endpoints is missing. Returns the new edge's embed id, or None if nothing was
+        inserted.
+        """
+
+        def _upsert_edge(cursor, connection):
+            embed_id = self.ids.next_id(cursor, "edges")
+            inserted = cursor.execute(
+                read_sql(Path("upsert-edge.sql")),
+                (embed_id, source, target, label, json.dumps(attributes)),
+            ).fetchone()
+
+            if inserted is None:
+                # Keep edge embed ids in step with the vector store's rowids
+                self.ids.release("edges", embed_id)
+                return None
+            return inserted[0]
+
+        return self.atomic(_upsert_edge)
+
+    def add_nodes_bulk(self, nodes: List[Node]) -> List[Node]:
+        return self.atomic(self._insert_nodes_bulk(nodes))
+
+    def add_edges_bulk(self, edges: List[EdgeInput]) -> List[EdgeInput]:
+        return self.atomic(self._insert_edges_bulk(edges))
+
     def update_node(self, node: Node):
         upsert_node_func = self._upsert_node(
             identifier=node.id,
@@ -502,8 +1354,35 @@ class SQLite(DB):
     def remove_node(self, id: Any) -> None:
         self.atomic(self._remove_node(id))
 
+    def remove_edges_of_nodes(self, ids: List[Any]) -> List[int]:
+        """Delete every edge touching the nodes, returning the edges' embed ids"""
+
+        def _remove_edges_of_nodes(cursor, connection):
+            ids_json = json.dumps([str(id) for id in ids])
+            rows = cursor.execute(
+                read_sql(Path("delete-edges-of-nodes.sql")), (ids_json, ids_json)
+            ).fetchall()
+            return [embed_id for (embed_id,) in rows]
+
+        return self.atomic(_remove_edges_of_nodes)
+
+    def remove_nodes(self, ids: List[Any]) -> List[int]:
+        """
+        Delete the nodes with one set-based statement, returning their embed ids.
+        Their edges are removed with remove_edges_of_nodes.
+        """
+
+        def _remove_nodes(cursor, connection):
+            rows = cursor.execute(
+                read_sql(Path("delete-nodes.sql")),
+                (json.dumps([str(id) for id in ids]),),
+            ).fetchall()
+            return [embed_id for (embed_id,) in rows]
+
+        return self.atomic(_remove_nodes)
+
     def search_node(self, node_id: Any) -> Any:
-        return self.atomic(self._find_node(node_id))
+        return self.read(self._find_node(node_id))
 
     def search_node_label(self, node_id: Any, limit: Optional[int] = 1) -> Any:
         def _search_label(cursor, connection):
@@ -513,7 +1392,7 @@ class SQLite(DB):
 
             return node_label
 
-        return self.atomic(_search_label)
+        return self.read(_search_label)
 
     def search_node_type(self, label: str):
         def _search_node_type(cursor, connection):
@@ -538,18 +1417,28 @@ class SQLite(DB):
         return self.atomic(_find_node_type_id)
 
     def traverse(
-        self, source: Any, target: Optional[Any] = None, with_bodies: bool = False
+        self,
+        source: Any,
+        target: Optional[Any] = None,
+        with_bodies: bool = False,
+        *,
+        max_depth: Optional[int] = None,
+        direction: Optional[str] = None,
+        edge_labels: Optional[List[str]] = None,
+        limit: Optional[int] = None,
     ) -> List:
-        neighbors_fn = (
-            self._find_neighbors if with_bodies else self._find_outbound_neighbors
-        )
-        path = self._traverse(
+        if direction is None:
+            direction = "both" if with_bodies else "out"
+
+        return self._traverse(
             src=source,
             tgt=target,
-            neighbors_fn=neighbors_fn,
+            direction=direction,
             with_bodies=with_bodies,
+            max_depth=max_depth,
+            edge_labels=edge_labels,
+            limit=limit,
         )
-        return path
 
     def fetch_node_id(self, id: Any, limit: Optional[int] = 1):
         def _get_id(cursor, connection):
@@ -561,6 +1450,14 @@ class SQLite(DB):
         return self.atomic(_get_id)
 
     def find_nodes_by_label(self, label: str, limit: Optional[int] = 1):
+        # Label words are looked up in the full-text index. Only a miss falls back
+        # to the substring scan, which also matches in the middle of a word.
+        terms = " AND ".join(f'"{term}"*' for term in re.findall(r"\w+", label))
+        if terms:
+            rows = self.text_search(f"label : ({terms})", limit, raw=True)
+            if rows:
+                return [row[:3] for row in rows]
+
         def search_node_like(cursor, connection):
             nodes = cursor.execute(
                 "SELECT id, label, attributes FROM nodes WHERE label LIKE ? LIMIT ?",
@@ -572,7 +1469,60 @@ class SQLite(DB):
 
             return nodes.fetchall()
 
-        return self.atomic(search_node_like)
+        return self.read(search_node_like)
+
+    def text_search(
+        self, query: str, limit: Optional[int] = 10, *, raw: bool = False
+    ) -> List[Tuple[str, str, str, float]]:
+        """
+        Rank nodes whose label or attribute values match query with BM25.
+
+        Returns (id, label, attributes, score) rows, best match first (lower scores
+        are better). Plain text matches any of its words. Set raw=True to pass FTS5
+        query syntax through unchanged.
+        """
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+
+        def _text_search(cursor, connection):
+            return cursor.execute(
+                read_sql(Path("search-nodes-text.sql")),
+                (match, -1 if limit is None else limit),
+            ).fetchall()
+
+        return self.read(_text_search)
+
+    def enable_edge_text_search(self) -> None:
+        """Index edge labels and attributes for text_search_edges, kept in sync by triggers"""
+
+        def _enable(cursor, connection):
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'edges_fts'"
+            ).fetchone()
+            if exists is None:
+                connection.executescript(read_sql(Path("edges-fts.sql")))
+
+        self.atomic(_enable)
+
+    def text_search_edges(
+        self, query: str, limit: Optional[int] = 10, *, raw: bool = False
+    ) -> List[Tuple[str, str, str, str, float]]:
+        """
+        Rank edges like text_search, as (source, target, label, attributes, score).
+        Needs enable_edge_text_search() first.
+        """
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+
+        def _text_search_edges(cursor, connection):
+            return cursor.execute(
+                read_sql(Path("search-edges-text.sql")),
+                (match, -1 if limit is None else limit),
+            ).fetchall()
+
+        return self.read(_text_search_edges)
 
     def graphviz_visualize(
         self,
@@ -632,14 +1582,62 @@ class SQLite(DB):
         dot.render(dot_file, format=format)
         return dot
 
-    def fetch_ids_from_db(self, limit: Optional[int] = 10) -> List[str]:
+    def iter_nodes(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, Any]]:
+        """
+        Stream every node as (id, label, attributes), batch_size rows per query.
+
+        Batches are read in embed_id order, each one resuming after the last row of
+        the previous one. A whole-graph scan therefore holds a single batch in memory
+        and reads the table once. With decode=False the attributes stay JSON text.
+        """
+        for page in self.query(page_size=batch_size).pages():
+            for _, identifier, label, attributes in page:
+                yield (
+                    identifier,
+                    label,
+                    json.loads(attributes) if decode else attributes,
+                )
+
+    def iter_edges(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, str, Any]]:
+        """Stream every edge as (source, target, label, attributes), like iter_nodes"""
+        last: Optional[int] = None
+
+        while True:
+            query = self.statements.render(
+                "search-edges-page.template", keyset=last is not None
+            )
+            bindings = (batch_size,) if last is None else (last, batch_size)
+
+            def _fetch_edges(cursor, connection):
+                return cursor.execute(query, bindings).fetchall()
+
+            rows = self.read(_fetch_edges)
+            for _, source, target, label, attributes in rows:
+                yield (
+                    source,
+                    target,
+                    label,
+                    json.loads(attributes) if decode else attributes,
+                )
+
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][0]
+
+    def fetch_ids_from_db(self, limit: Optional[int] = None) -> List[str]:
         def _fetch_nodes_from_db(cursor, connection):
-            nodes = cursor.execute("SELECT id from nodes LIMIT ?", (limit,)).fetchall()
+            nodes = cursor.execute(
+                "SELECT id from nodes LIMIT ?", (-1 if limit is None else limit,)
+            ).fetchall()
             ids = [id[0] for id in nodes]
 
             return ids
 
-        return self.atomic(_fetch_nodes_from_db)
+        return self.read(_fetch_nodes_from_db)
 
     def search_indegree_edges(
         self, target: Any, limit: Optional[int] = 10
@@ -655,7 +1653,7 @@ class SQLite(DB):
             else:
                 return indegree.fetchall()
 
-        return self.atomic(_indegree_edges)
+        return self.read(_indegree_edges)
 
     def search_outdegree_edges(
         self, source: Any, limit: Optional[int] = 10
@@ -671,20 +1669,24 @@ class SQLite(DB):
             else:
                 return outdegree.fetchall()
 
-        return self.atomic(_outdegree_edges)
+        return self.read(_outdegree_edges)
 
     def search_similar_nodes(
         self, embed_ids, *, desc: Optional[bool] = False, sort_by: Optional[str] = ""
     ):
+        query = self.statements.render(
+            "search-node-by-rowid.template",
+            alias="n",
+            key=self._attribute_key(sort_by) if sort_by else None,
+            desc=bool(desc),
+        )
+
         def _search_node(cursor, connection):
-            nodes = cursor.execute(
-                read_sql(Path("search-node-by-rowid.sql")),
-                (embed_ids, sort_by, desc, sort_by, sort_by, desc, sort_by),
-            )
+            nodes = cursor.execute(query, (embed_ids,))
 
             return nodes.fetchall()
 
-        return self.atomic(_search_node)
+        return self.read(_search_node)
 
     def search_similar_edges(self, embed_ids, *, desc: bool = False, sort_by: str = ""):
         def _search_edge(cursor, connection):
@@ -695,4 +1697,4 @@ class SQLite(DB):
 
             return edges.fetchall()
 
-        return self.atomic(_search_edge)
+        return self.read(_search_edge)
@@ -0,0 +1 @@
+DELETE FROM attribute_indexes WHERE key = ? RETURNING name
@@ -0,0 +1,3 @@
+DELETE FROM edges
+WHERE source IN (SELECT value FROM json_each(?)) OR target IN (SELECT value FROM json_each(?))
+RETURNING embed_id
\ No newline at end of file
@@ -0,0 +1 @@
+DELETE FROM nodes WHERE id IN (SELECT value FROM json_each(?)) RETURNING embed_id
\ No newline at end of file
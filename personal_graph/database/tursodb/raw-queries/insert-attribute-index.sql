@@ -0,0 +1 @@
+INSERT OR IGNORE INTO attribute_indexes (key, name) VALUES (?, ?)
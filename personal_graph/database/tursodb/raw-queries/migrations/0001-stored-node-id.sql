@@ -0,0 +1,26 @@
+-- Rebuild nodes so that id is a STORED generated column instead of a VIRTUAL one.
+-- SQLite cannot change a column's storage in place, so the table is copied over.
+CREATE TABLE nodes_migrated (
+    embed_id INT NOT NULL UNIQUE,
+    label TEXT,
+    attributes JSON,
+    id   TEXT GENERATED ALWAYS AS (json_extract(attributes, '$.id')) STORED NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO nodes_migrated (embed_id, label, attributes, created_at, updated_at)
+SELECT embed_id, label, attributes, created_at, updated_at FROM nodes;
+
+DROP TABLE nodes;
+ALTER TABLE nodes_migrated RENAME TO nodes;
+
+-- The UNIQUE constraint on id already provides its index
+CREATE INDEX IF NOT EXISTS label_idx ON nodes(label);
+
+-- Superseded by the composite indexes, which share their leading column
+DROP INDEX IF EXISTS source_idx;
+DROP INDEX IF EXISTS target_idx;
+
+CREATE INDEX IF NOT EXISTS source_target_label_idx ON edges(source, target, label);
+CREATE INDEX IF NOT EXISTS target_source_idx ON edges(target, source);
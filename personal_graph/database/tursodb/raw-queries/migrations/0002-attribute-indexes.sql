@@ -0,0 +1,6 @@
+-- Registry of the JSON attribute keys that have an expression index on nodes
+CREATE TABLE IF NOT EXISTS attribute_indexes (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,51 @@
+-- Full-text index over node labels and attribute values, kept in sync by triggers.
+-- Only the JSON values are indexed: key names such as "name" or "id" appear in
+-- every body and would match every node. The table is contentless, so nothing is
+-- stored twice; a delete recomputes the indexed text from the old row.
+CREATE VIRTUAL TABLE IF NOT EXISTS nodes_fts USING fts5(
+    label,
+    attributes,
+    content='',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS nodes_fts_insert AFTER INSERT ON nodes BEGIN
+    INSERT INTO nodes_fts (rowid, label, attributes)
+    VALUES (new.embed_id, new.label, (
+        SELECT group_concat(value, ' ') FROM (
+            SELECT value FROM json_tree(new.attributes) WHERE atom IS NOT NULL ORDER BY id
+        )
+    ));
+END;
+
+CREATE TRIGGER IF NOT EXISTS nodes_fts_delete AFTER DELETE ON nodes BEGIN
+    INSERT INTO nodes_fts (nodes_fts, rowid, label, attributes)
+    VALUES ('delete', old.embed_id, old.label, (
+        SELECT group_concat(value, ' ') FROM (
+            SELECT value FROM json_tree(old.attributes) WHERE atom IS NOT NULL ORDER BY id
+        )
+    ));
+END;
+
+CREATE TRIGGER IF NOT EXISTS nodes_fts_update AFTER UPDATE OF embed_id, label, attributes ON nodes BEGIN
+    INSERT INTO nodes_fts (nodes_fts, rowid, label, attributes)
+    VALUES ('delete', old.embed_id, old.label, (
+        SELECT group_concat(value, ' ') FROM (
+            SELECT value FROM json_tree(old.attributes) WHERE atom IS NOT NULL ORDER BY id
+        )
+    ));
+    INSERT INTO nodes_fts (rowid, label, attributes)
+    VALUES (new.embed_id, new.label, (
+        SELECT group_concat(value, ' ') FROM (
+            SELECT value FROM json_tree(new.attributes) WHERE atom IS NOT NULL ORDER BY id
+        )
+    ));
+END;
+
+INSERT INTO nodes_fts (rowid, label, attributes)
+SELECT embed_id, label, (
+    SELECT group_concat(value, ' ') FROM (
+        SELECT value FROM json_tree(nodes.attributes) WHERE atom IS NOT NULL ORDER BY id
+    )
+)
+FROM nodes;
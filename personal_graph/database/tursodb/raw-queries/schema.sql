@@ -7,8 +7,6 @@ CREATE TABLE IF NOT EXISTS nodes (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS id_idx ON nodes(id);
-
 CREATE TABLE IF NOT EXISTS edges (
     embed_id INTEGER NOT NULL UNIQUE,
     source     TEXT,
@@ -22,5 +20,4 @@ CREATE TABLE IF NOT EXISTS edges (
     FOREIGN KEY(target) REFERENCES nodes(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS source_idx ON edges(source);
-CREATE INDEX IF NOT EXISTS target_idx ON edges(target);
+-- Indexes are created by the migrations in migrations/
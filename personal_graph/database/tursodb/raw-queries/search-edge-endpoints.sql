@@ -0,0 +1 @@
+SELECT source, target FROM edges
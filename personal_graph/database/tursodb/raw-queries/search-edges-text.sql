@@ -0,0 +1,6 @@
+SELECT e.source, e.target, e.label, e.attributes, bm25(edges_fts) AS score
+FROM edges_fts
+JOIN edges e ON e.embed_id = edges_fts.rowid
+WHERE edges_fts MATCH ?
+ORDER BY score
+LIMIT ?
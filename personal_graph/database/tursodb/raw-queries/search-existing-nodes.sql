@@ -0,0 +1 @@
+SELECT id FROM nodes WHERE id IN (SELECT value FROM json_each(?))
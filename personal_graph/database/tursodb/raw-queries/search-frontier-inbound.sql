@@ -0,0 +1 @@
+SELECT source, target, label, attributes FROM edges WHERE target IN (SELECT value FROM json_each(?))
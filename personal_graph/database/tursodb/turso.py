@@ -4,8 +4,7 @@ from pathlib import Path
 from typing import Optional, Any, Callable, Tuple
 
 from jinja2 import BaseLoader, Environment, select_autoescape
-from personal_graph.database.db import CursorExecFunction
-from personal_graph.database.sqlite.sqlite import SQLite
+from personal_graph.database.sqlite.sqlite import SQLite, StatementRegistry
 
 try:
     import libsql_experimental as libsql  # type: ignore
@@ -37,6 +36,7 @@ class SqlTemplateLoader(BaseLoader):
 
 class TursoDB(SQLite):
     def __init__(self, *, url: Optional[str] = None, auth_token: Optional[str] = None):
+        super().__init__(use_in_memory=False)
         self.db_url = url
         self.db_auth_token = auth_token
 
@@ -44,9 +44,7 @@ class TursoDB(SQLite):
             loader=SqlTemplateLoader(Path(__file__).parent / "raw-queries"),
             autoescape=select_autoescape(),
         )
-        self.clause_template = self.env.get_template("search-where.template")
-        self.search_template = self.env.get_template("search-node.template")
-        self.traverse_template = self.env.get_template("traverse.template")
+        self.statements = StatementRegistry(self.env)
 
     def __eq__(self, other):
         if hasattr(other, "db_url"):
@@ -61,17 +59,24 @@ class TursoDB(SQLite):
             f"  ),"
         )
 
-    def atomic(self, cursor_exec_fn: CursorExecFunction) -> Any:
+    def _get_connection(self) -> Any:
+        # A transaction has to stay on the connection it was started on
+        if self._transaction_depth and hasattr(self, "_connection"):
+            return self._connection
+
         self._connection = libsql.connect(
             database=self.db_url,
             auth_token=self.db_auth_token,
         )
-
-        cursor = self._connection.cursor()
-        cursor.execute("PRAGMA foreign_keys = TRUE;")
-        results = cursor_exec_fn(cursor, self._connection)
-        self._connection.commit()
-        return results
+        self._connection.execute("PRAGMA foreign_keys = TRUE;")
+        self._connection.execute("PRAGMA recursive_triggers = ON;")
+        return self._connection
 
     def save(self):
         self._connection.commit()
+
+    def snapshot(self, path: str, *, pages: int = 1024) -> None:
+        raise NotImplementedError("snapshot method is not yet implemented")
+
+    def load_snapshot(self, path: str, *, pages: int = 1024) -> int:
+        raise NotImplementedError("load_snapshot method is not yet implemented")
@@ -2,7 +2,9 @@
 Provide access to different embeddings models
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Optional
 
 import ollama  # type: ignore
 import openai
@@ -13,12 +15,21 @@ class EmbeddingsModel(ABC):
     def get_embedding(self, text: str) -> list[float]:
         pass
 
+    async def aget_embedding(self, text: str) -> list[float]:
+        """Awaitable get_embedding; runs the blocking call in a worker thread"""
+        return await asyncio.to_thread(self.get_embedding, text)
+
 
 class OpenAIEmbeddingsModel(EmbeddingsModel):
     def __init__(
-        self, embed_client: openai.OpenAI, embed_model: str, embed_dimension: int = 384
+        self,
+        embed_client: openai.OpenAI,
+        embed_model: str,
+        embed_dimension: int = 384,
+        async_client: Optional[openai.AsyncOpenAI] = None,
     ) -> None:
         self.client = embed_client if embed_client else None
+        self.async_client = async_client
         self.model = embed_model
         self.dimension = embed_dimension
 
@@ -46,12 +57,30 @@ class OpenAIEmbeddingsModel(EmbeddingsModel):
             .embedding
         )
 
+    async def aget_embedding(self, text: str) -> list[float]:
+        if self.async_client is None:
+            return await super().aget_embedding(text)
+
+        text = text.replace("\n", " ")
+        response = await self.async_client.embeddings.create(
+            input=[text],
+            model=self.model,
+            dimensions=self.dimension,
+            encoding_format="float",
+        )
+        return response.data[0].embedding
+
 
 class OllamaEmbeddingModel(EmbeddingsModel):
     def __init__(
-        self, embed_client: ollama.Client, embed_model: str, embed_dimension: int = 768
+        self,
+        embed_client: ollama.Client,
+        embed_model: str,
+        embed_dimension: int = 768,
+        async_client: Optional[ollama.AsyncClient] = None,
     ) -> None:
         self.client = embed_client if embed_client else None
+        self.async_client = async_client
         self.model = embed_model
         self.dimension = embed_dimension
 
@@ -72,3 +101,10 @@ class OllamaEmbeddingModel(EmbeddingsModel):
             model=self.model,
             prompt=text,
         )["embedding"]
+
+    async def aget_embedding(self, text: str) -> list[float]:
+        if self.async_client is None:
+            return await super().aget_embedding(text)
+
+        response = await self.async_client.embeddings(model=self.model, prompt=text)
+        return response["embedding"]
@@ -4,24 +4,28 @@ import json
 import logging
 import uuid
 from pathlib import Path
-from typing import Any, List, Optional, Union, Dict, Tuple
+from typing import Any, Iterator, List, Optional, Union, Dict, Tuple
 
-from contextlib import AbstractContextManager
+from contextlib import AbstractContextManager, ExitStack, contextmanager
 
 from graphviz import Digraph  # type: ignore
 from dotenv import load_dotenv
 from owlready2 import Ontology  # type: ignore
 
 from personal_graph import OpenAIClient
+from personal_graph.adjacency import AdjacencyIndex
 from personal_graph.database import TursoDB, SQLite
+from personal_graph.database.sqlite.sqlite import NodeQuery
 from personal_graph.database.fhirdb.fhirDB import FhirDB
 from personal_graph.graph_generator import (
     OpenAITextToGraphParser,
     OllamaTextToGraphParser,
 )
+from personal_graph.metrics import Metrics, MetricsCallback, measured, timed
 from personal_graph.helper import (
     validate_fhir_resource,
     get_type_name,
+    reciprocal_rank_fusion,
 )
 from personal_graph.models import Node, EdgeInput, KnowledgeGraph, Edge
 from personal_graph.vector_store import SQLiteVSS, VliteVSS, FhirSQLiteVSS
@@ -46,11 +50,14 @@ class GraphDB(AbstractContextManager):
             OpenAITextToGraphParser, OllamaTextToGraphParser
         ] = OpenAITextToGraphParser(llm_client=OpenAIClient()),
         ontologies: Optional[List[Union[Ontology, Any]]] = None,
+        adjacency_index: bool = False,
     ):
         self.vector_store = vector_store
         self.db = database
         self.graph_generator = graph_generator
         self.ontologies = ontologies
+        self.adjacency: Optional[AdjacencyIndex] = None
+        self.metrics: Optional[Metrics] = None
 
         self.db.initialize()
         self.vector_store.initialize()
@@ -63,6 +70,9 @@ class GraphDB(AbstractContextManager):
                     "Database must be tursodb for storing fhir related data."
                 )
 
+        if adjacency_index:
+            self.build_adjacency_index()
+
     def __eq__(self, other):
         if not isinstance(other, GraphDB):
             return "Not of GraphDB Type"
@@ -90,6 +100,87 @@ class GraphDB(AbstractContextManager):
             f")"
         )
 
+    @contextmanager
+    def transaction(self) -> Iterator[GraphDB]:
+        """
+        Run all node, edge and embedding writes made inside the block in one
+        transaction that commits (or rolls back) once when the block exits.
+        """
+        with ExitStack() as stack:
+            stack.enter_context(self.db.transaction())
+
+            # Embeddings may live in a different database than the graph itself
+            if (
+                isinstance(self.vector_store, SQLiteVSS)
+                and self.vector_store.db is not self.db
+            ):
+                stack.enter_context(self.vector_store.db.transaction())
+
+            try:
+                yield self
+            except BaseException:
+                # The rolled back edges may already be in the adjacency index
+                if self.adjacency is not None:
+                    self.adjacency.invalidate()
+                raise
+
+    def batch(self) -> AbstractContextManager[GraphDB]:
+        """Alias of transaction(), for grouping bulk writes"""
+        return self.transaction()
+
+    def enable_metrics(self, *, callback: Optional[MetricsCallback] = None) -> Metrics:
+        """
+        Record the latency of every public method from now on, split into time spent
+        in the database, the embedding model and the graph generator. Export them with
+        metrics.to_prometheus(), or pass a callback to forward each call elsewhere.
+        """
+        self.metrics = Metrics(callback=callback)
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        self.metrics = None
+
+    @measured
+    def snapshot(self, path: str) -> None:
+        """
+        Write the graph to the file at path without stopping writers. Embeddings are
+        included when the vector store shares the graph's SQLite database.
+        """
+        if not isinstance(self.db, SQLite):
+            raise ValueError("Snapshots need a SQLite database.")
+        self.db.snapshot(path)
+
+    @measured
+    def load_snapshot(self, path: str) -> None:
+        """Replace the graph with a snapshot written by snapshot()"""
+        if not isinstance(self.db, SQLite):
+            raise ValueError("Snapshots need a SQLite database.")
+        self.db.load_snapshot(path)
+        self.vector_store.initialize()
+
+        if self.adjacency is not None:
+            self.adjacency.invalidate()
+
+    @measured
+    def build_adjacency_index(self, *, compact_threshold: int = 1024) -> AdjacencyIndex:
+        """
+        Load the edges table into an in-memory CSR adjacency index.
+
+        Once built, the index is kept up to date by every edge and node write made
+        through this GraphDB. traverse, k_hop, neighbors and degree are then answered
+        from memory. It shares the database's write lock, so it is safe to use from
+        the threads of AsyncGraphDB.
+        """
+        self.adjacency = AdjacencyIndex(
+            self.db.fetch_edge_endpoints,
+            compact_threshold=compact_threshold,
+            lock=self.db._write_lock,
+        )
+        return self.adjacency
+
+    def drop_adjacency_index(self) -> None:
+        self.adjacency = None
+
     def _similarity_search_node(
         self,
         text,
@@ -98,6 +189,7 @@ class GraphDB(AbstractContextManager):
         descending: bool = False,
         limit: int = 1,
         sort_by: str = "",
+        embedding: Optional[List[float]] = None,
     ):
         use_direct_search = False
 
@@ -111,10 +203,11 @@ class GraphDB(AbstractContextManager):
                 descending=descending,
                 limit=limit,
                 sort_by=sort_by,
+                embedding=embedding,
             )
         else:
             similarity_scores = self.vector_store.vector_search_node_from_multi_db(
-                {"body": text}, threshold=threshold, limit=limit
+                {"body": text}, threshold=threshold, limit=limit, embedding=embedding
             )
 
             if isinstance(self.vector_store, VliteVSS):
@@ -143,6 +236,7 @@ class GraphDB(AbstractContextManager):
         descending: bool = False,
         limit: int = 1,
         sort_by: str = "",
+        embedding: Optional[List[float]] = None,
     ):
         use_direct_search = False
 
@@ -156,10 +250,11 @@ class GraphDB(AbstractContextManager):
                 descending=descending,
                 limit=limit,
                 sort_by=sort_by,
+                embedding=embedding,
             )
         else:
             similarity_scores = self.vector_store.vector_search_edge_from_multi_db(
-                {"body": text}, threshold=threshold, limit=limit
+                {"body": text}, threshold=threshold, limit=limit, embedding=embedding
             )
             if isinstance(self.vector_store, VliteVSS):
                 embed_ids = [
@@ -180,7 +275,12 @@ class GraphDB(AbstractContextManager):
 
         return similar_edges
 
+    @measured
     def insert_node(self, node: Node):
+        with self.transaction():
+            self._insert_node(node)
+
+    def _insert_node(self, node: Node):
         self.db.add_node(
             node.label,
             json.loads(node.attributes)
@@ -272,6 +372,7 @@ class GraphDB(AbstractContextManager):
         return node_type_properties
 
     # High level apis
+    @measured
     def add_node_type(self, node_id, node_type, *, attributes=None) -> None:
         if not self.db.search_node_type(node_type):
             if attributes is not None:
@@ -281,10 +382,12 @@ class GraphDB(AbstractContextManager):
                 self.db.add_node(node_type, {}, node_id)
                 self.vector_store.add_node_embedding(node_id, node_type, {})
 
+    @measured
     def find_node_type_id(self, node_type) -> str:
         id = self.db.search_id_by_node_type(node_type)
         return id
 
+    @measured
     def add_node(
         self,
         node: Node,
@@ -325,19 +428,25 @@ class GraphDB(AbstractContextManager):
                     "Node type or attributes does not match any of the provided ontologies."
                 )
 
+    @measured
     def add_nodes(
         self,
         nodes: List[Node],
         *,
         node_types: Optional[List[str]] = None,
         delete_if_properties_not_match: Optional[List[bool]] = None,
-    ) -> None:
+        bulk: bool = False,
+    ) -> Optional[List[Node]]:
+        if bulk:
+            return self._add_nodes_bulk(nodes)
+
         if self.ontologies is None or (
             self.ontologies is not None and isinstance(self.db, FhirDB)
         ):
-            for node in nodes:
-                self.add_node(node)
-            return
+            with self.transaction():
+                for node in nodes:
+                    self.add_node(node)
+            return None
 
         if node_types is None:
             raise ValueError("No node types given for the ontology.")
@@ -353,15 +462,18 @@ class GraphDB(AbstractContextManager):
                 "The length of delete_if_properties_not_match must match the length of nodes if provided."
             )
 
-        for node, node_type, delete_flag in zip(
-            nodes, node_types, delete_if_properties_not_match
-        ):
-            self.add_node(
-                node,
-                node_type=node_type,
-                delete_if_properties_not_match=delete_flag,
-            )
+        with self.transaction():
+            for node, node_type, delete_flag in zip(
+                nodes, node_types, delete_if_properties_not_match
+            ):
+                self.add_node(
+                    node,
+                    node_type=node_type,
+                    delete_if_properties_not_match=delete_flag,
+                )
+        return None
 
+    @measured
     def insert_edge(
         self,
         edge: EdgeInput,
@@ -378,6 +490,17 @@ class GraphDB(AbstractContextManager):
                 target_rt=edge.target.label,
             )
         else:
+            # Re-adding an unchanged edge keeps the stored row and vector
+            if self._edge_embedding_current(
+                edge.source.id,
+                edge.target.id,
+                edge.label,
+                json.loads(edge.attributes)
+                if isinstance(edge.attributes, str)
+                else edge.attributes,
+            ):
+                return
+
             self.db.add_edge(
                 edge.source.id,
                 edge.target.id,
@@ -387,7 +510,7 @@ class GraphDB(AbstractContextManager):
                 else edge.attributes,
             )
 
-        self.vector_store.add_edge_embedding(
+        self._edge_inserted(
             edge.source.id,
             edge.target.id,
             edge.label,
@@ -396,7 +519,33 @@ class GraphDB(AbstractContextManager):
             else edge.attributes,
         )
 
+    def _edge_embedding_current(
+        self, source: Any, target: Any, label: str, attributes: Any
+    ) -> bool:
+        """Whether the edge is stored with an embedding of this same content"""
+        if isinstance(self.db, FhirDB):
+            return False
+
+        embed_id = self.db.search_edge(source, target, attributes)
+        return embed_id is not None and self.vector_store.is_edge_embedding_current(
+            embed_id, source, target, label, attributes
+        )
+
+    def _edge_inserted(
+        self, source: Any, target: Any, label: str, attributes: Dict
+    ) -> None:
+        """Index and embed an edge that was just written to the database"""
+        if self.adjacency is not None:
+            self.adjacency.add_edge(source, target)
+
+        self.vector_store.add_edge_embedding(source, target, label, attributes)
+
+    @measured
     def add_edge(self, edge: EdgeInput) -> None:
+        with self.transaction():
+            self._add_edge(edge)
+
+    def _add_edge(self, edge: EdgeInput) -> None:
         attributes = (
             json.loads(edge.attributes)
             if isinstance(edge.attributes, str)
@@ -413,6 +562,17 @@ class GraphDB(AbstractContextManager):
             ):
                 self.insert_edge(edge)
                 return
+        elif not isinstance(self.db, FhirDB):
+            # One statement checks both endpoints, dedupes and inserts
+            if (
+                self.db.upsert_edge(
+                    edge.source.id, edge.target.id, edge.label, attributes
+                )
+                is not None
+            ):
+                self._edge_inserted(
+                    edge.source.id, edge.target.id, edge.label, attributes
+                )
         else:
             if (
                 self.db.search_edge(edge.source.id, edge.target.id, attributes) is None
@@ -422,11 +582,64 @@ class GraphDB(AbstractContextManager):
                 self.insert_edge(edge)
                 return
 
-    def add_edges(self, edges: List[EdgeInput]) -> None:
-        for edge in edges:
-            self.add_edge(edge)
+    @measured
+    def add_edges(
+        self, edges: List[EdgeInput], *, bulk: bool = False
+    ) -> Optional[List[EdgeInput]]:
+        if bulk:
+            return self._add_edges_bulk(edges)
+
+        with self.transaction():
+            for edge in edges:
+                self.add_edge(edge)
+        return None
+
+    def _add_nodes_bulk(self, nodes: List[Node]) -> List[Node]:
+        if self.ontologies is not None:
+            raise ValueError("Bulk insertion does not support ontologies.")
+
+        with self.transaction():
+            inserted = self.db.add_nodes_bulk(nodes)
+            self.vector_store.add_node_embeddings(
+                [node.id for node in inserted],
+                [node.label for node in inserted],
+                [
+                    json.loads(node.attributes)
+                    if isinstance(node.attributes, str)
+                    else node.attributes
+                    for node in inserted
+                ],
+            )
+        return inserted
+
+    def _add_edges_bulk(self, edges: List[EdgeInput]) -> List[EdgeInput]:
+        if self.ontologies is not None:
+            raise ValueError("Bulk insertion does not support ontologies.")
+
+        with self.transaction():
+            inserted = self.db.add_edges_bulk(edges)
+            if self.adjacency is not None:
+                for edge in inserted:
+                    self.adjacency.add_edge(edge.source.id, edge.target.id)
+            self.vector_store.add_edge_embeddings(
+                [edge.source.id for edge in inserted],
+                [edge.target.id for edge in inserted],
+                [edge.label for edge in inserted],
+                [
+                    json.loads(edge.attributes)
+                    if isinstance(edge.attributes, str)
+                    else edge.attributes
+                    for edge in inserted
+                ],
+            )
+        return inserted
 
+    @measured
     def update_node(self, node: Node) -> None:
+        with self.transaction():
+            self._update_node(node)
+
+    def _update_node(self, node: Node) -> None:
         if isinstance(self.db, FhirDB):
             node_data = self.db.search_node(node.id, node_type=node.label)
         else:
@@ -446,9 +659,20 @@ class GraphDB(AbstractContextManager):
                 else node.attributes
             )
 
-            self.db.update_node(node)
             updated_data: Dict = {**node_data, **node_attributes}
 
+            # A no-op update keeps the stored row and vector, and skips the embedding call
+            if (
+                not isinstance(self.db, FhirDB)
+                and embed_id_to_be_updated is not None
+                and self.vector_store.is_node_embedding_current(
+                    embed_id_to_be_updated[0], node.id, node.label, updated_data
+                )
+            ):
+                return
+
+            self.db.update_node(node)
+
             self.vector_store.add_node_embedding(node.id, node.label, updated_data)
 
             if isinstance(self.vector_store, FhirSQLiteVSS):
@@ -460,23 +684,31 @@ class GraphDB(AbstractContextManager):
         else:
             self.add_node(node)
 
+    @measured
     def update_nodes(self, nodes: List[Node]) -> None:
-        for node in nodes:
-            self.update_node(node)
+        with self.transaction():
+            for node in nodes:
+                self.update_node(node)
 
+    @measured
     def remove_node(
         self, id: Union[str, int], *, node_type: Optional[str] = None
     ) -> None:
-        if isinstance(self.db, FhirDB):
-            node = self.db.search_node(id, node_type=node_type)
-        else:
-            node = self.db.search_node(id)
+        with self.transaction():
+            self._remove_node(id, node_type=node_type)
+
+    def _remove_node(
+        self, id: Union[str, int], *, node_type: Optional[str] = None
+    ) -> None:
+        if not isinstance(self.db, FhirDB):
+            self._remove_nodes_bulk(self.db, [id])
+            return
+
+        node = self.db.search_node(id, node_type=node_type)
 
         if node is not None:
             ids = self.db.fetch_edge_embed_ids(id)
-            if isinstance(self.vector_store, FhirSQLiteVSS) and isinstance(
-                self.db, FhirDB
-            ):
+            if isinstance(self.vector_store, FhirSQLiteVSS):
                 self.vector_store.delete_node_embedding(
                     self.db.fetch_node_embed_id(id, node_type=node_type),
                     node_type=node_type,
@@ -484,13 +716,22 @@ class GraphDB(AbstractContextManager):
             else:
                 self.vector_store.delete_node_embedding(self.db.fetch_node_embed_id(id))
 
-            if isinstance(self.db, FhirDB):
-                self.db.remove_node(id, node_type=node_type)
-            else:
-                self.db.remove_node(id)
+            self.db.remove_node(id, node_type=node_type)
+
+            if self.adjacency is not None:
+                self.adjacency.remove_node(id)
 
             self.vector_store.delete_edge_embedding(ids)
 
+    def _remove_nodes_bulk(self, db: SQLite, ids: List[Any]) -> None:
+        self.vector_store.delete_edge_embeddings(db.remove_edges_of_nodes(ids))
+        self.vector_store.delete_node_embeddings(db.remove_nodes(ids))
+
+        if self.adjacency is not None:
+            for id in ids:
+                self.adjacency.remove_node(id)
+
+    @measured
     def remove_nodes(
         self, ids: List[Any], *, node_types: Optional[List[str]] = None
     ) -> None:
@@ -501,13 +742,20 @@ class GraphDB(AbstractContextManager):
             if len(node_types) != len(ids):
                 raise ValueError("node types must be equal to node ids.")
 
-            for id, nt in zip(ids, node_types):
-                self.remove_node(id, node_type=nt)
+            with self.transaction():
+                for id, nt in zip(ids, node_types):
+                    self.remove_node(id, node_type=nt)
             return
 
-        for id in ids:
-            self.remove_node(id)
+        with self.transaction():
+            if isinstance(self.db, FhirDB):
+                for id in ids:
+                    self._remove_node(id)
+            else:
+                # Nodes, their edges and all of their embeddings in set-based deletes
+                self._remove_nodes_bulk(self.db, ids)
 
+    @measured
     def search_node(
         self, node_id: str | int, *, node_type: Optional[str] = None
     ) -> Any:
@@ -516,47 +764,145 @@ class GraphDB(AbstractContextManager):
 
         return self.db.search_node(node_id)
 
+    @measured
     def search_node_label(self, node_id: str | int) -> Any:
         return self.db.search_node_label(node_id)
 
+    @measured
     def traverse(
-        self, source: str, target: Optional[str] = None, with_bodies: bool = False
+        self,
+        source: str,
+        target: Optional[str] = None,
+        with_bodies: bool = False,
+        *,
+        max_depth: Optional[int] = None,
+        direction: Optional[str] = None,
+        edge_labels: Optional[List[str]] = None,
+        limit: Optional[int] = None,
     ) -> List:
-        return self.db.traverse(source, target, with_bodies)
-
-    def insert_graph(self, kg: KnowledgeGraph) -> KnowledgeGraph:
-        uuid_dict = {}
-
-        try:
-            for node in kg.nodes:
-                uuid_dict[node.id] = str(uuid.uuid4())
-                self.db.add_node(
-                    node.label,
-                    {"body": node.attributes},
-                    uuid_dict[node.id],
+        """
+        Walk the graph breadth-first from source, stopping early once target is reached.
+
+        direction is 'in', 'out' or 'both'. It defaults to 'out', or to 'both' when
+        with_bodies is set. max_depth bounds the number of hops, edge_labels restricts
+        which edges are followed, and limit caps the number of rows returned.
+        Plain id walks are served from the adjacency index when it is built.
+        """
+        if (
+            self.adjacency is not None
+            and source in self.adjacency
+            and not with_bodies
+            and edge_labels is None
+        ):
+            return list(
+                self.adjacency.bfs(
+                    source,
+                    target,
+                    max_depth=max_depth,
+                    direction=direction or "out",
+                    limit=limit,
                 )
+            )
 
-                self.vector_store.add_node_embedding(
-                    uuid_dict[node.id], node.label, {"body": node.attributes}
-                )
+        return self.db.traverse(
+            source,
+            target,
+            with_bodies,
+            max_depth=max_depth,
+            direction=direction,
+            edge_labels=edge_labels,
+            limit=limit,
+        )
 
-            for edge in kg.edges:
-                self.db.add_edge(
-                    uuid_dict[edge.source],
-                    uuid_dict[edge.target],
-                    edge.label,
-                    {"body": edge.attributes},
-                )
-                self.vector_store.add_edge_embedding(
-                    uuid_dict[edge.source],
-                    uuid_dict[edge.target],
-                    edge.label,
-                    {"body": edge.attributes},
-                )
+    @measured
+    def shortest_path(
+        self,
+        source: str,
+        target: str,
+        max_depth: Optional[int] = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph:
+        """
+        Find a shortest path from source to target, at most max_depth edges long.
+
+        The path comes back as a KnowledgeGraph whose nodes and edges are in path
+        order. It is empty when no path exists.
+        """
+        return self.db.shortest_path(source, target, max_depth, direction=direction)
+
+    @measured
+    def k_hop(self, node_id: str, k: int, *, direction: str = "both") -> Dict[str, int]:
+        """Map every node within k hops of node_id, itself included, to its distance"""
+        if self.adjacency is not None:
+            return self.adjacency.bfs(node_id, max_depth=k, direction=direction)
+        return self.db.k_hop(node_id, k, direction=direction)
+
+    @measured
+    def neighbors(self, node_id: str, *, direction: str = "out") -> List[str]:
+        """Return the distinct ids one edge away from node_id"""
+        if self.adjacency is not None:
+            return self.adjacency.neighbors(node_id, direction=direction)
+        return [
+            id
+            for id, hops in self.db.k_hop(node_id, 1, direction=direction).items()
+            if hops == 1
+        ]
+
+    @measured
+    def degree(self, node_id: str, *, direction: str = "out") -> int:
+        """Count the edges leaving ('out'), entering ('in') or touching ('both') node_id"""
+        if self.adjacency is not None:
+            return self.adjacency.degree(node_id, direction=direction)
+
+        # FhirDB always returns every edge, SQLite only once its limit is lifted
+        unlimited: Dict[str, Any] = {} if isinstance(self.db, FhirDB) else {"limit": -1}
+
+        degree = 0
+        if direction in ("out", "both"):
+            degree += len(self.db.search_outdegree_edges(node_id, **unlimited))
+        if direction in ("in", "both"):
+            degree += len(self.db.search_indegree_edges(node_id, **unlimited))
+        return degree
+
+    @measured
+    def insert_graph(self, kg: KnowledgeGraph) -> KnowledgeGraph:
+        try:
+            # A missing edge endpoint raises KeyError and rolls back the whole graph
+            with self.transaction():
+                self._insert_graph(kg)
         except KeyError:
             return KnowledgeGraph()
         return kg
 
+    def _insert_graph(self, kg: KnowledgeGraph) -> None:
+        uuid_dict = {}
+
+        for node in kg.nodes:
+            uuid_dict[node.id] = str(uuid.uuid4())
+            self.db.add_node(
+                node.label,
+                {"body": node.attributes},
+                uuid_dict[node.id],
+            )
+
+            self.vector_store.add_node_embedding(
+                uuid_dict[node.id], node.label, {"body": node.attributes}
+            )
+
+        for edge in kg.edges:
+            source, target = uuid_dict[edge.source], uuid_dict[edge.target]
+            attributes = {"body": edge.attributes}
+
+            if isinstance(self.db, FhirDB):
+                self.db.add_edge(source, target, edge.label, attributes)
+            elif self.db.upsert_edge(source, target, edge.label, attributes) is None:
+                # Repeated edges in the generated graph are only stored once
+                continue
+
+            self._edge_inserted(source, target, edge.label, attributes)
+
+    @measured
     def search_from_graph(
         self,
         text: str,
@@ -565,14 +911,35 @@ class GraphDB(AbstractContextManager):
         limit: int = 1,
         descending: bool = False,
         sort_by: str = "",
+        neighbor_limit: Optional[int] = None,
+        hybrid: bool = False,
+        vector_k: Optional[int] = None,
+        lexical_k: Optional[int] = None,
+        rrf_k: int = 60,
     ) -> KnowledgeGraph:
+        """
+        Find the nodes and edges closest to text, plus their neighbourhoods.
+
+        With hybrid=True, the top vector_k vector hits and the top lexical_k
+        full-text hits are merged by reciprocal rank fusion (constant rrf_k), and
+        the best limit nodes are kept. Exact names and codes that embeddings miss
+        are still found. The fused order is by rank, so sort_by does not apply to
+        nodes.
+        """
         try:
-            similar_nodes = self._similarity_search_node(
+            # Node and edge searches embed the same text, so embed it once
+            embedding = self._query_embedding(text)
+            nodes = self._search_seed_nodes(
                 text,
                 threshold=threshold,
-                descending=descending,
                 limit=limit,
+                descending=descending,
                 sort_by=sort_by,
+                hybrid=hybrid,
+                vector_k=vector_k,
+                lexical_k=lexical_k,
+                rrf_k=rrf_k,
+                embedding=embedding,
             )
             similar_edges = self._similarity_search_edge(
                 text,
@@ -580,76 +947,161 @@ class GraphDB(AbstractContextManager):
                 descending=descending,
                 limit=limit,
                 sort_by=sort_by,
+                embedding=embedding,
             )
+            return self._expand_hits(nodes, similar_edges, neighbor_limit)
+        except KeyError:
+            return KnowledgeGraph()
 
-            resultant_subgraph = KnowledgeGraph()
+    def _query_embedding(self, text: str) -> Optional[List[float]]:
+        if not isinstance(self.vector_store, SQLiteVSS):
+            return None
+        with timed("embedding"):
+            return self.vector_store.embedding_model.get_embedding(
+                json.dumps({"body": text})
+            )
 
-            if similar_edges and similar_nodes is None or similar_nodes is None:
-                return resultant_subgraph
+    def _search_seed_nodes(
+        self,
+        text: str,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        descending: bool = False,
+        sort_by: str = "",
+        hybrid: bool = False,
+        vector_k: Optional[int] = None,
+        lexical_k: Optional[int] = None,
+        rrf_k: int = 60,
+        embedding: Optional[List[float]] = None,
+    ) -> Optional[List[Node]]:
+        if hybrid:
+            return self._hybrid_search_node(
+                text,
+                threshold=threshold,
+                limit=limit,
+                vector_k=vector_k,
+                lexical_k=lexical_k,
+                rrf_k=rrf_k,
+                embedding=embedding,
+            )
 
-            for node in similar_nodes:
-                if isinstance(self.vector_store, VliteVSS):
-                    similar_node = Node(
-                        id=node[0].rstrip("_0"),
-                        label=json.loads(node[1])["label"],
-                        attributes=(json.loads(node[1])),
-                    )
+        similar_nodes = self._similarity_search_node(
+            text,
+            threshold=threshold,
+            descending=descending,
+            limit=limit,
+            sort_by=sort_by,
+            embedding=embedding,
+        )
+        if similar_nodes is None:
+            return None
+        return [self._vector_hit_to_node(row) for row in similar_nodes]
 
-                else:
-                    similar_node = Node(id=node[1], label=node[2], attributes=node[3])
-                resultant_subgraph.nodes.append(similar_node)
+    def _expand_hits(
+        self,
+        nodes: Optional[List[Node]],
+        similar_edges: Any,
+        neighbor_limit: Optional[int] = None,
+    ) -> KnowledgeGraph:
+        resultant_subgraph = KnowledgeGraph()
+        seeds: List[Union[Node, Edge]] = []
 
-                nodes = self.db.all_connected_nodes(similar_node)
+        if nodes is None:
+            return resultant_subgraph
 
-                if not nodes:
-                    continue
+        for similar_node in nodes:
+            resultant_subgraph.nodes.append(similar_node)
+            seeds.append(similar_node)
 
-                for i in nodes:
-                    if i not in resultant_subgraph.nodes:
-                        resultant_subgraph.nodes.append(i)
+        for edge in similar_edges or []:
+            if isinstance(self.vector_store, VliteVSS):
+                edge = self.search_node(edge[0].rstrip("_0"))
 
-            for edge in similar_edges:
-                if isinstance(self.vector_store, VliteVSS):
-                    edge = self.search_node(edge[0].rstrip("_0"))
+                if edge is None:
+                    continue
 
-                    if edge is None:
-                        continue
+                if "source" not in edge[0][2].keys():
+                    continue
 
-                    if "source" not in edge[0][2].keys():
-                        continue
+                edge = json.loads(edge[2])
 
-                    edge = json.loads(edge[2])
+                similar_edge = Edge(
+                    source=edge["source"],
+                    target=edge["target"],
+                    label=edge["label"],
+                    attributes=edge,
+                )
+            else:
+                similar_edge = Edge(
+                    source=edge[1],
+                    target=edge[2],
+                    label=edge[3],
+                    attributes=edge[4],
+                )
+            resultant_subgraph.edges.append(similar_edge)
+            seeds.append(similar_edge)
 
-                    similar_edge = Edge(
-                        source=edge["source"],
-                        target=edge["target"],
-                        label=edge["label"],
-                        attributes=edge,
-                    )
-                else:
-                    similar_edge = Edge(
-                        source=edge[1],
-                        target=edge[2],
-                        label=edge[3],
-                        attributes=edge[4],
-                    )
-                resultant_subgraph.edges.append(similar_edge)
+        # One query for the neighbourhood of every vector hit
+        for node in self.db.all_connected_nodes_batch(seeds, neighbor_limit):
+            if node not in resultant_subgraph.nodes:
+                resultant_subgraph.nodes.append(node)
 
-                nodes = self.db.all_connected_nodes(similar_edge)
-                if not nodes:
-                    continue
+        return resultant_subgraph
 
-                for node in nodes:
-                    if node not in resultant_subgraph.nodes:
-                        resultant_subgraph.nodes.append(node)
+    def _vector_hit_to_node(self, row: Any) -> Node:
+        if isinstance(self.vector_store, VliteVSS):
+            return Node(
+                id=row[0].rstrip("_0"),
+                label=json.loads(row[1])["label"],
+                attributes=(json.loads(row[1])),
+            )
+        return Node(id=row[1], label=row[2], attributes=row[3])
 
-        except KeyError:
-            return KnowledgeGraph()
+    def _hybrid_search_node(
+        self,
+        text: str,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        vector_k: Optional[int] = None,
+        lexical_k: Optional[int] = None,
+        rrf_k: int = 60,
+        embedding: Optional[List[float]] = None,
+    ) -> List[Node]:
+        if not isinstance(self.db, SQLite):
+            raise ValueError("Hybrid search needs a SQLite database.")
+
+        candidates: Dict[str, Node] = {}
+
+        vector_ids = []
+        vector_hits = self._similarity_search_node(
+            text,
+            threshold=threshold,
+            limit=vector_k or max(limit, 20),
+            embedding=embedding,
+        )
+        for row in vector_hits or []:
+            node = self._vector_hit_to_node(row)
+            candidates.setdefault(str(node.id), node)
+            vector_ids.append(str(node.id))
+
+        lexical_ids = []
+        for id, label, attributes, _ in self.db.text_search(
+            text, lexical_k or max(limit, 20)
+        ):
+            candidates.setdefault(
+                str(id), Node(id=id, label=label, attributes=attributes)
+            )
+            lexical_ids.append(str(id))
 
-        return resultant_subgraph
+        fused = reciprocal_rank_fusion([vector_ids, lexical_ids], k=rrf_k)
+        return [candidates[id] for id, _ in fused[:limit]]
 
+    @measured
     def merge_by_similarity(self, *, threshold: float = 0.9) -> None:
-        node_ids = self.db.fetch_ids_from_db()
+        # Merging rewrites nodes with new embed ids, which a scan would see again
+        node_ids = [node_id for node_id, _, _ in self.iter_nodes(decode=False)]
 
         for node_id in node_ids:
             node = self.db.search_node(node_id)
@@ -687,10 +1139,13 @@ class GraphDB(AbstractContextManager):
 
                     concatenated_labels += data[1] + ","
 
-                    self.db.add_edge(data[0], node_id, data[1], data[2])
-                    self.vector_store.add_edge_embedding(
+                    if not self._edge_embedding_current(
                         data[0], node_id, data[1], data[2]
-                    )
+                    ):
+                        self.db.add_edge(data[0], node_id, data[1], data[2])
+                        self.vector_store.add_edge_embedding(
+                            data[0], node_id, data[1], data[2]
+                        )
 
                 for data in out_degree_ids:
                     for key, value in json.loads(data[2]).items():
@@ -702,10 +1157,13 @@ class GraphDB(AbstractContextManager):
                             concatenated_attributes[key] = value
                     concatenated_labels += data[1] + ","
 
-                    self.db.add_edge(node_id, data[0], data[1], data[2])
-                    self.vector_store.add_edge_embedding(
+                    if not self._edge_embedding_current(
                         node_id, data[0], data[1], data[2]
-                    )
+                    ):
+                        self.db.add_edge(node_id, data[0], data[1], data[2])
+                        self.vector_store.add_edge_embedding(
+                            node_id, data[0], data[1], data[2]
+                        )
 
                     updated_attributes = node if node else {}
                     updated_attributes.update(concatenated_attributes)
@@ -720,6 +1178,11 @@ class GraphDB(AbstractContextManager):
 
                     self.remove_node(similar_node_id)
 
+        # Re-pointed edges may have replaced existing rows, so reload the index
+        if self.adjacency is not None:
+            self.adjacency.invalidate()
+
+    @measured
     def find_nodes_like(self, label: str, *, threshold: float = 0.9) -> List[Node]:
         nodes = self.db.find_nodes_by_label(label)
 
@@ -753,20 +1216,95 @@ class GraphDB(AbstractContextManager):
 
         return similar_rows
 
+    def query(self, *, page_size: int = 256) -> NodeQuery:
+        """
+        Query nodes by attribute, e.g. graph.query().where("date", ">=", "2024-01-01")
+        .order_by("date").limit(20). Iterating the query streams Node objects.
+        """
+        if not isinstance(self.db, SQLite):
+            raise ValueError("Node queries need a SQLite database.")
+        return self.db.query(page_size=page_size)
+
+    @measured
+    def create_attribute_index(self, key: str) -> str:
+        """
+        Index nodes on an attribute key, e.g. "date", so that filtering and sorting
+        on it stop scanning every node. Returns the index name.
+        """
+        if not isinstance(self.db, SQLite):
+            raise ValueError("Attribute indexes need a SQLite database.")
+        return self.db.create_attribute_index(key)
+
+    @measured
+    def drop_attribute_index(self, key: str) -> bool:
+        if not isinstance(self.db, SQLite):
+            raise ValueError("Attribute indexes need a SQLite database.")
+        return self.db.drop_attribute_index(key)
+
+    @measured
+    def attribute_indexes(self) -> List[str]:
+        if not isinstance(self.db, SQLite):
+            raise ValueError("Attribute indexes need a SQLite database.")
+        return self.db.attribute_indexes()
+
+    @measured
+    def text_search(self, query: str, limit: int = 10) -> List[Node]:
+        """
+        Find nodes whose label or attribute values contain the words of query, best
+        BM25 match first. Uses the full-text index only, no embedding call.
+        """
+        if not isinstance(self.db, SQLite):
+            raise ValueError("Text search needs a SQLite database.")
+        return [
+            Node(id=id, label=label, attributes=json.loads(attributes))
+            for id, label, attributes, _ in self.db.text_search(query, limit)
+        ]
+
+    @measured
     def visualize(self, file: str, id: List[str]) -> Digraph:
         return self.db.graphviz_visualize(file, id)
 
+    def iter_nodes(
+        self,
+        *,
+        batch_size: int = 1000,
+        decode: bool = True,
+        node_type: Optional[str] = None,
+    ) -> Iterator[Tuple[str, str, Any]]:
+        """
+        Stream every node as (id, label, attributes), batch_size rows at a time.
+
+        Whole-graph jobs run in constant memory over a single pass of the table.
+        decode=False leaves attributes as JSON text. FhirDB streams one resource
+        type, given as node_type.
+        """
+        if isinstance(self.db, FhirDB):
+            return self.db.iter_nodes(
+                batch_size=batch_size, decode=decode, node_type=node_type
+            )
+        return self.db.iter_nodes(batch_size=batch_size, decode=decode)
+
+    def iter_edges(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, str, Any]]:
+        """Stream every edge as (source, target, label, attributes), like iter_nodes"""
+        return self.db.iter_edges(batch_size=batch_size, decode=decode)
+
+    @measured
     def fetch_ids_from_db(self, *, node_type: Optional[str] = None) -> List[str]:
         if isinstance(self.db, FhirDB):
             return self.db.fetch_ids_from_db(node_type=node_type)
         return self.db.fetch_ids_from_db()
 
+    @measured
     def search_indegree_edges(self, target: str) -> List[Any]:
         return self.db.search_indegree_edges(target)
 
+    @measured
     def search_outdegree_edges(self, source: str) -> List[Any]:
         return self.db.search_outdegree_edges(source)
 
+    @measured
     def is_unique_prompt(self, text: str, *, threshold: float = 0.9) -> bool:
         similar_nodes = self._similarity_search_node(text, threshold=threshold, limit=1)
 
@@ -775,6 +1313,7 @@ class GraphDB(AbstractContextManager):
 
         return False
 
+    @measured
     def insert(
         self,
         text: str,
@@ -797,6 +1336,7 @@ class GraphDB(AbstractContextManager):
         else:
             self.add_node(node)
 
+    @measured
     def search(
         self,
         text: str,
@@ -842,6 +1382,7 @@ class GraphDB(AbstractContextManager):
         except KeyError:
             return
 
+    @measured
     def insert_from_fhir_json_bundle(
         self, bundle_file: Path, nodes_type_info: Dict
     ) -> GraphDB:
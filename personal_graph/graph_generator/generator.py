@@ -1,6 +1,7 @@
+import asyncio
 import instructor
 from typing import Union
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from abc import ABC, abstractmethod
 
 from personal_graph.models import KnowledgeGraph
@@ -13,6 +14,10 @@ class TextToGraphParserInterface(ABC):
         """Generate a KnowledgeGraph from the given query."""
         pass
 
+    async def agenerate(self, query: str) -> KnowledgeGraph:
+        """Awaitable generate; runs the blocking call in a worker thread."""
+        return await asyncio.to_thread(self.generate, query)
+
 
 class OpenAITextToGraphParser(TextToGraphParserInterface):
     def __init__(
@@ -52,6 +57,27 @@ class OpenAITextToGraphParser(TextToGraphParserInterface):
         )
         return knowledge_graph
 
+    async def agenerate(self, query: str) -> KnowledgeGraph:
+        async_client = getattr(self.llm_client, "async_client", None)
+        if async_client is None:
+            return await super().agenerate(query)
+
+        client = instructor.from_openai(async_client)
+        return await client.chat.completions.create(
+            model=self.llm_client.model_name,
+            messages=[
+                {
+                    "role": "system",
+                    "content": self.system_prompt,
+                },
+                {
+                    "role": "user",
+                    "content": f"{self.prompt}: {query}",
+                },
+            ],
+            response_model=KnowledgeGraph,
+        )
+
 
 class OllamaTextToGraphParser(TextToGraphParserInterface):
     def __init__(
@@ -99,3 +125,28 @@ class OllamaTextToGraphParser(TextToGraphParserInterface):
         )
 
         return knowledge_graph
+
+    async def agenerate(self, query: str) -> KnowledgeGraph:
+        client = instructor.from_openai(
+            AsyncOpenAI(
+                base_url=self.llm_client.base_url,
+                api_key=self.llm_client.api_key,
+            ),
+            mode=instructor.Mode.JSON,
+        )
+
+        return await client.chat.completions.create(
+            model=self.llm_client.model_name,
+            messages=[
+                {
+                    "role": "system",
+                    "content": self.system_prompt,
+                },
+                {
+                    "role": "user",
+                    "content": f"{self.prompt}: {query}",
+                },
+            ],
+            stream=False,
+            response_model=KnowledgeGraph,
+        )
@@ -7,7 +7,7 @@ from datetime import date
 from pydantic_core import ValidationError
 import inspect
 from importlib import import_module
-from typing import get_origin, get_args
+from typing import Dict, List, Tuple, get_origin, get_args
 
 from personal_graph.models import Node
 
@@ -92,3 +92,19 @@ def fhir_node(fhir_data) -> Node:
         ),
         label=type(fhir_data).__name__,
     )
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[str]], *, k: int = 60
+) -> List[Tuple[str, float]]:
+    """
+    Merge ranked id lists into one, best first.
+
+    Each id scores sum(1 / (k + rank)) over the lists it appears in, so ids ranked
+    well by several retrievers rise to the top without comparing their raw scores.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, id in enumerate(ranking, start=1):
+            scores[id] = scores.get(id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
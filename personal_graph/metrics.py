@@ -0,0 +1,266 @@
+"""
+Latency and throughput metrics for GraphDB operations, split by where the time went
+"""
+
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+# Upper bounds, in seconds, of the latency histogram buckets
+BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    float("inf"),
+)
+
+COMPONENTS: Tuple[str, ...] = ("db", "embedding", "generator")
+
+# Called with the operation, its duration, the seconds spent per component and
+# whether it raised
+MetricsCallback = Callable[[str, float, Dict[str, float], bool], None]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Frame:
+    """The operation being measured in the current thread or task"""
+
+    __slots__ = ("parent", "components", "current", "mark")
+
+    def __init__(self, parent: Optional["_Frame"]):
+        self.parent = parent
+        self.components: Dict[str, float] = {}
+        self.current: Optional[str] = None
+        self.mark = 0.0
+
+    def charge(self, now: float) -> None:
+        """Credit the time since the last mark to the component running now"""
+        if self.current is not None:
+            self.components[self.current] = (
+                self.components.get(self.current, 0.0) + now - self.mark
+            )
+        self.mark = now
+
+
+_frame: ContextVar[Optional[_Frame]] = ContextVar(
+    "personal_graph_metrics_frame", default=None
+)
+
+
+class timed:
+    """
+    Charge the time spent in the block to component, for the operation in progress.
+
+    Nested blocks are exclusive: an embedding computed inside a database callback
+    counts as embedding time only. Outside of a measured operation this does nothing.
+    """
+
+    __slots__ = ("component", "frame", "previous")
+
+    def __init__(self, component: str):
+        self.component = component
+
+    def __enter__(self) -> None:
+        frame = self.frame = _frame.get()
+        if frame is None:
+            return
+        frame.charge(time.perf_counter())
+        self.previous = frame.current
+        frame.current = self.component
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        frame = self.frame
+        if frame is None:
+            return
+        frame.charge(time.perf_counter())
+        frame.current = self.previous
+
+
+class OperationStats:
+    """Count, errors, latency histogram and component split of one operation"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.components: Dict[str, float] = {}
+
+    def observe(self, elapsed: float, components: Dict[str, float], error: bool):
+        self.count += 1
+        self.errors += error
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                self.buckets[i] += 1
+                break
+        for component, seconds in components.items():
+            self.components[component] = self.components.get(component, 0.0) + seconds
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(BUCKETS, self.buckets):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return buckets
+
+
+class Metrics:
+    """
+    Per-operation metrics for one GraphDB.
+
+    Each measured call records its latency, whether it raised, and how much of it
+    was spent in the database, the embedding model and the graph generator. Calls
+    nested in another measured call (e.g. add_node inside insert_graph) are recorded
+    under their own name as well. When callback is given it is called after every
+    operation, for forwarding to another metrics system.
+    """
+
+    def __init__(self, *, callback: Optional[MetricsCallback] = None):
+        self.callback = callback
+        self.since = time.time()
+        self._operations: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"Metrics(operations={len(self._operations)})"
+
+    def measure(self, op: str, fn: Callable[..., Any], *args: Any, **kwargs: Any):
+        """Call fn, recording it as one run of op"""
+        parent = _frame.get()
+        frame = _Frame(parent)
+        token = _frame.set(frame)
+
+        start = frame.mark = time.perf_counter()
+        if parent is not None:
+            parent.charge(start)
+        error = True
+        try:
+            result = fn(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            end = time.perf_counter()
+            frame.charge(end)
+            _frame.reset(token)
+
+            # The parent operation spent this time in the same components
+            if parent is not None:
+                for component, seconds in frame.components.items():
+                    parent.components[component] = (
+                        parent.components.get(component, 0.0) + seconds
+                    )
+                parent.mark = end
+
+            self.record(op, end - start, frame.components, error)
+
+    def record(
+        self, op: str, elapsed: float, components: Dict[str, float], error: bool
+    ) -> None:
+        with self._lock:
+            stats = self._operations.get(op)
+            if stats is None:
+                stats = self._operations[op] = OperationStats()
+            stats.observe(elapsed, components, error)
+
+        if self.callback is not None:
+            self.callback(op, elapsed, components, error)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics per operation, the most total time first"""
+        uptime = max(time.time() - self.since, 1e-9)
+        with self._lock:
+            items: List[Tuple[str, Dict[str, Any]]] = [
+                (
+                    op,
+                    {
+                        "count": stats.count,
+                        "errors": stats.errors,
+                        "total": stats.total,
+                        "mean": stats.total / stats.count,
+                        "max": stats.max,
+                        "per_second": stats.count / uptime,
+                        "buckets": dict(stats.cumulative_buckets()),
+                        "components": {
+                            component: stats.components.get(component, 0.0)
+                            for component in COMPONENTS
+                        },
+                    },
+                )
+                for op, stats in self._operations.items()
+            ]
+        return dict(sorted(items, key=lambda item: item[1]["total"], reverse=True))
+
+    def to_prometheus(self, prefix: str = "personal_graph") -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        with self._lock:
+            operations = sorted(self._operations.items())
+            lines = [
+                f"# HELP {prefix}_operation_duration_seconds Latency of GraphDB operations",
+                f"# TYPE {prefix}_operation_duration_seconds histogram",
+            ]
+            for op, stats in operations:
+                for bound, count in stats.cumulative_buckets():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(
+                        f'{prefix}_operation_duration_seconds_bucket{{op="{op}",le="{le}"}} {count}'
+                    )
+                lines.append(
+                    f'{prefix}_operation_duration_seconds_sum{{op="{op}"}} {stats.total!r}'
+                )
+                lines.append(
+                    f'{prefix}_operation_duration_seconds_count{{op="{op}"}} {stats.count}'
+                )
+
+            lines += [
+                f"# HELP {prefix}_operation_errors_total GraphDB operations that raised",
+                f"# TYPE {prefix}_operation_errors_total counter",
+            ]
+            for op, stats in operations:
+                lines.append(
+                    f'{prefix}_operation_errors_total{{op="{op}"}} {stats.errors}'
+                )
+
+            lines += [
+                f"# HELP {prefix}_operation_component_seconds_total Time GraphDB operations spent per component",
+                f"# TYPE {prefix}_operation_component_seconds_total counter",
+            ]
+            for op, stats in operations:
+                for component in COMPONENTS:
+                    seconds = stats.components.get(component, 0.0)
+                    lines.append(
+                        f'{prefix}_operation_component_seconds_total{{op="{op}",component="{component}"}} {seconds!r}'
+                    )
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+        self.since = time.time()
+
+
+def measured(fn: F) -> F:
+    """Record calls of a GraphDB method on its metrics, when they are enabled"""
+    op = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        if metrics is None:
+            return fn(self, *args, **kwargs)
+        return metrics.measure(op, fn, self, *args, **kwargs)
+
+    return wrapper  # type: ignore
@@ -15,42 +15,16 @@ def pg_to_networkx(graph: GraphDB, *, post_visualize: bool = False):
     """
     G = nx.Graph()  # Empty Graph with no nodes and edges
 
-    node_ids = graph.fetch_ids_from_db()
-    # Add edges to networkX
-    for source_id in node_ids:
-        outdegree_edges = graph.search_outdegree_edges(source_id)
-        if outdegree_edges is []:
-            continue
-
-        for target_id, edge_label, edge_data in outdegree_edges:
-            if isinstance(edge_data, str):
-                edge_data = json.loads(edge_data)
-
-            edge_data["label"] = edge_label
-            G.add_edge(source_id, target_id, **edge_data)
-
-    for target_id in node_ids:
-        indegree_edges = graph.search_indegree_edges(target_id)
-
-        if indegree_edges is []:
-            continue
-
-        for source_id, edge_label, edge_data in indegree_edges:
-            if isinstance(edge_data, str):
-                edge_data = json.loads(edge_data)
-
-            edge_data["label"] = edge_label
-            G.add_edge(source_id, target_id, **edge_data)
-
+    # Stream the whole graph in two sequential scans instead of per-node lookups
     node_labels = {}
-    for node_id in node_ids:
-        node_data = graph.search_node(node_id)
-        if "label" not in node_data.keys():
-            node_data["label"] = graph.db.search_node_label(node_id)
-
+    for node_id, node_label, node_data in graph.iter_nodes():
+        node_data.setdefault("label", node_label)
         G.add_node(node_id, **node_data)
-        node_label = node_data["label"]
-        node_labels[node_id] = node_label[0]
+        node_labels[node_id] = node_label
+
+    for source_id, target_id, edge_label, edge_data in graph.iter_edges():
+        edge_data["label"] = edge_label
+        G.add_edge(source_id, target_id, **edge_data)
 
     if post_visualize:
         # Visualizing the NetworkX Graph
@@ -140,10 +114,10 @@ def networkx_to_pg(
     for node_id, node_data in networkx_graph.nodes(data=True):
         if str(node_id) not in node_ids_with_edges:
             node_attributes: Dict[str, Any] = node_data
-            node_label: str = node_attributes.pop("label", "")
+            node_label: Any = node_attributes.pop("label", "")
             node = Node(
                 id=str(node_id),
-                label=node_label[0],
+                label=node_label if isinstance(node_label, str) else node_label[0],
                 attributes=json.dumps(node_attributes),
             )
 
@@ -0,0 +1,308 @@
+"""
+Synthetic graphs and mixed workloads, for reproducing scaling problems locally
+"""
+
+import bisect
+import itertools
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from operator import methodcaller
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from personal_graph.graph import GraphDB
+from personal_graph.metrics import Metrics
+from personal_graph.models import Edge, EdgeInput, KnowledgeGraph, Node
+
+WORDS = (
+    "fever cough headache fatigue nausea dizziness insulin diabetes asthma migraine "
+    "sleep diet walk clinic doctor nurse family friend morning night pain relief "
+    "breakfast lunch dinner coffee exercise stress anxiety appointment prescription "
+    "blood pressure sugar weight heart lungs knee back allergy pollen vaccine"
+).split()
+
+DEFAULT_LABELS: Dict[str, float] = {
+    "Person": 0.25,
+    "Symptom": 0.25,
+    "Disease": 0.15,
+    "Medication": 0.15,
+    "Event": 0.2,
+}
+
+DEFAULT_EDGE_LABELS: List[str] = ["has", "causes", "treats", "knows", "attended"]
+
+DEFAULT_SCHEMAS: Dict[str, Dict[str, str]] = {
+    "Person": {"name": "word", "age": "int"},
+    "Symptom": {"severity": "int", "chronic": "bool"},
+    "Disease": {"name": "word", "diagnosed": "date"},
+    "Medication": {"name": "word", "dose_mg": "float"},
+    "Event": {"date": "date", "place": "word"},
+}
+
+# Mirrors scripts/kgchat.py, where every message is a chat turn
+DEFAULT_MIX: Dict[str, float] = {
+    "chat_turn": 0.3,
+    "search_from_graph": 0.2,
+    "search_node": 0.2,
+    "traverse": 0.1,
+    "add_node": 0.08,
+    "add_edge": 0.05,
+    "update_node": 0.05,
+    "remove_node": 0.02,
+}
+
+
+@dataclass
+class GraphSpec:
+    """
+    Shape of a synthetic graph.
+
+    Degrees follow a power law with the given exponent (Chung-Lu model): node i is
+    picked as an edge endpoint with weight (i + 1) ** (-1 / (exponent - 1)), and the
+    graph gets nodes * mean_degree edges. Attribute kinds in schemas are "int",
+    "float", "bool", "date", "word" and "text".
+    """
+
+    nodes: int = 1000
+    mean_degree: float = 4.0
+    exponent: float = 2.5
+    labels: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_LABELS))
+    edge_labels: List[str] = field(default_factory=lambda: list(DEFAULT_EDGE_LABELS))
+    schemas: Dict[str, Dict[str, str]] = field(
+        default_factory=lambda: {k: dict(v) for k, v in DEFAULT_SCHEMAS.items()}
+    )
+    body_words: int = 12
+    seed: int = 0
+
+
+@dataclass
+class WorkloadSpec:
+    """Number, mix and concurrency of the operations replayed against a graph"""
+
+    operations: int = 1000
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    concurrency: int = 4
+    threshold: float = 0.9
+    seed: int = 0
+
+
+class SyntheticGraph:
+    """
+    A reproducible random graph of spec.nodes nodes with ids "n0", "n1", ...
+
+    Nodes and edges are generated lazily in chunks, so graphs of millions of nodes
+    can be loaded without holding them in memory at once. The same spec always
+    yields the same graph.
+    """
+
+    def __init__(self, spec: GraphSpec):
+        if spec.exponent <= 1:
+            raise ValueError("exponent must be greater than 1")
+        if not spec.labels:
+            raise ValueError("At least one label is needed")
+
+        self.spec = spec
+        self._label_names = list(spec.labels)
+        self._label_weights = list(itertools.accumulate(spec.labels.values()))
+
+        rng = random.Random(spec.seed)
+        self.labels = [self._pick_label(rng) for _ in range(spec.nodes)]
+
+        alpha = 1 / (spec.exponent - 1)
+        self._endpoint_weights = list(
+            itertools.accumulate((i + 1) ** -alpha for i in range(spec.nodes))
+        )
+
+    def __repr__(self) -> str:
+        return f"SyntheticGraph(nodes={self.spec.nodes}, edges={self.edge_count})"
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.spec.nodes * self.spec.mean_degree)
+
+    def _pick_label(self, rng: random.Random) -> str:
+        return rng.choices(self._label_names, cum_weights=self._label_weights)[0]
+
+    def _endpoint(self, rng: random.Random) -> int:
+        return bisect.bisect_left(
+            self._endpoint_weights, rng.random() * self._endpoint_weights[-1]
+        )
+
+    def text(self, rng: random.Random, words: int = 0) -> str:
+        return " ".join(rng.choices(WORDS, k=words or self.spec.body_words))
+
+    def attributes(self, rng: random.Random, label: str) -> Dict[str, Any]:
+        attributes: Dict[str, Any] = {"body": self.text(rng)}
+        for name, kind in self.spec.schemas.get(label, {}).items():
+            if kind == "int":
+                attributes[name] = rng.randrange(100)
+            elif kind == "float":
+                attributes[name] = round(rng.uniform(0, 1000), 2)
+            elif kind == "bool":
+                attributes[name] = rng.random() < 0.5
+            elif kind == "date":
+                attributes[name] = (
+                    f"20{rng.randrange(10, 25)}-{rng.randrange(1, 13):02d}"
+                    f"-{rng.randrange(1, 29):02d}"
+                )
+            elif kind == "word":
+                attributes[name] = rng.choice(WORDS)
+            elif kind == "text":
+                attributes[name] = self.text(rng, 4)
+            else:
+                raise ValueError(f"Unknown attribute kind: {kind}")
+        return attributes
+
+    def node(self, rng: random.Random, id: str, label: str = "") -> Node:
+        """A node with attributes drawn from the schema of its label"""
+        label = label or self._pick_label(rng)
+        return Node(id=id, label=label, attributes=self.attributes(rng, label))
+
+    def _endpoint_node(self, index: int) -> Node:
+        return Node(id=f"n{index}", label=self.labels[index], attributes={})
+
+    def edge(self, rng: random.Random) -> EdgeInput:
+        """An edge between two distinct nodes of the graph, picked by degree weight"""
+        source = self._endpoint(rng)
+        target = self._endpoint(rng)
+        while target == source and self.spec.nodes > 1:
+            target = self._endpoint(rng)
+
+        return EdgeInput(
+            source=self._endpoint_node(source),
+            target=self._endpoint_node(target),
+            label=rng.choice(self.spec.edge_labels),
+            attributes={"weight": round(rng.random(), 3)},
+        )
+
+    def nodes(self, chunk: int = 10000) -> Iterator[List[Node]]:
+        rng = random.Random(self.spec.seed + 1)
+        for start in range(0, self.spec.nodes, chunk):
+            end = min(start + chunk, self.spec.nodes)
+            yield [self.node(rng, f"n{i}", self.labels[i]) for i in range(start, end)]
+
+    def edges(self, chunk: int = 10000) -> Iterator[List[EdgeInput]]:
+        rng = random.Random(self.spec.seed + 2)
+        for start in range(0, self.edge_count, chunk):
+            end = min(start + chunk, self.edge_count)
+            yield [self.edge(rng) for _ in range(start, end)]
+
+    def knowledge_graph(self, rng: random.Random, prefix: str) -> KnowledgeGraph:
+        """
+        A few new nodes linked to each other and to the graph, like the output of
+        text_to_graph for one chat message
+        """
+        nodes = [self.node(rng, f"{prefix}-{i}") for i in range(rng.randint(1, 3))]
+        index = self._endpoint(rng)
+        nodes.append(self.node(rng, f"n{index}", self.labels[index]))
+
+        edges = [
+            Edge(
+                source=str(source.id),
+                target=str(target.id),
+                label=rng.choice(self.spec.edge_labels),
+                attributes={"weight": round(rng.random(), 3)},
+            )
+            for source, target in zip(nodes, nodes[1:])
+        ]
+        return KnowledgeGraph(nodes=nodes, edges=edges)
+
+    def load(self, graph: GraphDB, *, chunk: int = 10000) -> Tuple[int, int]:
+        """
+        Insert the graph chunk by chunk, one transaction per chunk, and return the
+        number of nodes and edges inserted. Duplicate edges drawn between the same
+        nodes are skipped.
+        """
+        node_count = edge_count = 0
+        for nodes in self.nodes(chunk):
+            with graph.transaction():
+                node_count += len(graph.add_nodes(nodes, bulk=True) or [])
+
+        for edges in self.edges(chunk):
+            with graph.transaction():
+                edge_count += len(graph.add_edges(edges, bulk=True) or [])
+
+        return node_count, edge_count
+
+
+def plan(
+    synthetic: SyntheticGraph, spec: WorkloadSpec
+) -> List[Tuple[str, Callable[[GraphDB], Any]]]:
+    """The operations of a workload, in order, each as a name and a call on a graph"""
+    rng = random.Random(spec.seed)
+    names = list(spec.mix)
+    weights = list(itertools.accumulate(spec.mix.values()))
+    threshold = spec.threshold
+
+    unknown = set(names) - set(DEFAULT_MIX)
+    if unknown:
+        raise ValueError(f"Unknown workload operations: {', '.join(sorted(unknown))}")
+
+    def existing() -> str:
+        return f"n{synthetic._endpoint(rng)}"
+
+    def chat_turn(prompt: str, kg: KnowledgeGraph) -> Callable[[GraphDB], Any]:
+        def _chat_turn(graph: GraphDB) -> Any:
+            if graph.is_unique_prompt(prompt, threshold=threshold):
+                graph.insert_graph(kg)
+            return graph.search_from_graph(prompt, threshold=threshold)
+
+        return _chat_turn
+
+    operations: List[Tuple[str, Callable[[GraphDB], Any]]] = []
+    for i in range(spec.operations):
+        name = rng.choices(names, cum_weights=weights)[0]
+        prefix = f"w{spec.seed}-{i}"
+
+        op: Callable[[GraphDB], Any]
+        if name == "chat_turn":
+            op = chat_turn(synthetic.text(rng), synthetic.knowledge_graph(rng, prefix))
+        elif name == "search_from_graph":
+            op = methodcaller(
+                "search_from_graph", synthetic.text(rng, 6), threshold=threshold
+            )
+        elif name == "search_node":
+            op = methodcaller("search_node", existing())
+        elif name == "traverse":
+            op = methodcaller("traverse", existing(), max_depth=2)
+        elif name == "add_node":
+            op = methodcaller("add_node", synthetic.node(rng, prefix))
+        elif name == "add_edge":
+            op = methodcaller("add_edge", synthetic.edge(rng))
+        elif name == "update_node":
+            index = synthetic._endpoint(rng)
+            node = synthetic.node(rng, f"n{index}", synthetic.labels[index])
+            op = methodcaller("update_node", node)
+        else:
+            op = methodcaller("remove_node", existing())
+
+        operations.append((name, op))
+    return operations
+
+
+def replay(graph: GraphDB, synthetic: SyntheticGraph, spec: WorkloadSpec) -> Metrics:
+    """
+    Run a mixed workload against graph from spec.concurrency threads.
+
+    The sequence of operations depends only on the specs; how they interleave
+    depends on the threads. Failed operations are counted as errors and the
+    workload carries on. Returns the latency, error and component time of each
+    operation kind, which can be exported with to_prometheus().
+    """
+    metrics = Metrics()
+
+    def run(operation: Tuple[str, Callable[[GraphDB], Any]]) -> None:
+        name, op = operation
+        try:
+            metrics.measure(name, op, graph)
+        except Exception as e:
+            logging.info(f"{name} failed: {e}")
+
+    operations = plan(synthetic, spec)
+    with ThreadPoolExecutor(
+        max_workers=spec.concurrency, thread_name_prefix="personal-graph-synth"
+    ) as executor:
+        list(executor.map(run, operations))
+
+    return metrics
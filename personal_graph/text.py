@@ -1,6 +1,7 @@
 from typing import Union
 
 from personal_graph import OpenAIClient, KnowledgeGraph
+from personal_graph.metrics import timed
 from personal_graph.graph_generator import (
     OpenAITextToGraphParser,
     OllamaTextToGraphParser,
@@ -13,6 +14,7 @@ def text_to_graph(
         OpenAITextToGraphParser, OllamaTextToGraphParser
     ] = OpenAITextToGraphParser(llm_client=OpenAIClient()),
 ) -> KnowledgeGraph:
-    kg = graph_generator.generate(text)
+    with timed("generator"):
+        kg = graph_generator.generate(text)
 
     return kg
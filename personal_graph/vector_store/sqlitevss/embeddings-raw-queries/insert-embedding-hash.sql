@@ -0,0 +1 @@
+INSERT OR REPLACE INTO embedding_hashes (kind, vector_rowid, hash) VALUES (?, ?, ?)
\ No newline at end of file
@@ -0,0 +1 @@
+SELECT hash FROM embedding_hashes WHERE kind = ? AND vector_rowid = ?
\ No newline at end of file
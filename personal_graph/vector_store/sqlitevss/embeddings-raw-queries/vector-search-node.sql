@@ -11,10 +11,3 @@ SELECT
   matches.distance
 FROM matches
 JOIN nodes ON nodes.embed_id = matches.rowid
-ORDER BY
-  CASE
-    WHEN ? != "" AND ? IS TRUE THEN json_extract(nodes.attributes, '$.' || ?) ELSE NULL
-  END DESC,
-  CASE
-    WHEN ? != "" AND ? IS FALSE THEN json_extract(nodes.attributes, '$.' || ?) ELSE NULL
-  END ASC;
\ No newline at end of file
@@ -8,4 +8,14 @@ CREATE VIRTUAL TABLE IF NOT EXISTS relationship_embedding USING vss0(
   vector_relations({{size}})
 );
 
+-- Content hash of the text behind each vector, so unchanged content is not re-embedded
+CREATE TABLE IF NOT EXISTS embedding_hashes (
+  kind TEXT NOT NULL,
+  vector_rowid INTEGER NOT NULL,
+  hash TEXT NOT NULL,
+  PRIMARY KEY (kind, vector_rowid)
+);
+
+CREATE INDEX IF NOT EXISTS embedding_hashes_hash_idx ON embedding_hashes(kind, hash);
+
 commit;
\ No newline at end of file
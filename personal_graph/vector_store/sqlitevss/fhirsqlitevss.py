@@ -1,10 +1,11 @@
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from personal_graph.vector_store import SQLiteVSS
 from personal_graph.database.db import CursorExecFunction
+from personal_graph.metrics import timed
 
 
 @lru_cache(maxsize=None)
@@ -30,16 +31,15 @@ class FhirSQLiteVSS(SQLiteVSS):
         return self.db.save()
 
     def __repr__(self) -> str:
-        return f"FhirSQLiteVSS(\n" f"  db={self.db}\n" f"  )"
+        return f"FhirSQLiteVSS(\n  db={self.db}\n  )"
 
     def _add_embedding(self, id: Any, label: str, data: Dict) -> CursorExecFunction:
         def _insert(cursor, connection):
             set_data = self._set_id(id, label, data)
             rt = label.lower()
 
-            count = cursor.execute(
-                f"""SELECT COALESCE(MAX(rowid), 0) FROM {rt}_embedding"""
-            ).fetchone()[0]
+            # Drawn even for recreated nodes, to stay in step with the graph's embed_id
+            count = self.db.ids.next_id(cursor, f"{rt}_embedding", "rowid")
 
             # To check whether status is recreated, if so then do not add the embedding
             status = cursor.execute(
@@ -47,36 +47,25 @@ class FhirSQLiteVSS(SQLiteVSS):
             ).fetchone()[0]
 
             if status != "recreated":
+                with timed("embedding"):
+                    embedding = self.embedding_model.get_embedding(json.dumps(set_data))
                 cursor.execute(
                     f"""INSERT INTO {rt}_embedding(rowid, vector_node) VALUES (?,?);""",
-                    (
-                        int(count) + 1,
-                        json.dumps(
-                            self.embedding_model.get_embedding(json.dumps(set_data))
-                        ),
-                    ),
+                    (count, json.dumps(embedding)),
                 )
-            connection.commit()
 
         return _insert
 
     def _add_edge_embedding(self, data: Dict):
         def _insert_edge_embedding(cursor, connection):
-            count = (
-                cursor.execute(
-                    "SELECT COALESCE(MAX(rowid), 0) FROM relations_embedding"
-                ).fetchone()[0]
-                + 1
-            )
+            count = self.db.ids.next_id(cursor, "relations_embedding", "rowid")
 
+            with timed("embedding"):
+                embedding = self.embedding_model.get_embedding(json.dumps(data))
             cursor.execute(
                 """INSERT INTO relations_embedding(rowid, vector_relations) VALUES(?, ?)""",
-                (
-                    count,
-                    json.dumps(self.embedding_model.get_embedding(json.dumps(data))),
-                ),
+                (count, json.dumps(embedding)),
             )
-            connection.commit()
 
         return _insert_edge_embedding
 
@@ -115,6 +104,10 @@ class FhirSQLiteVSS(SQLiteVSS):
 
         self.db.atomic(self._add_edge_embedding(edge_data))
 
+    def add_node_embeddings(self, ids, labels, attributes):
+        for i, x in enumerate(zip(ids, labels, attributes)):
+            self.db.atomic(self._add_embedding(x[0], x[1], x[2]))
+
     def add_edge_embeddings(self, sources, targets, labels, attributes):
         for i, x in enumerate(zip(sources, targets, labels, attributes)):
             edge_data = {
@@ -134,15 +127,30 @@ class FhirSQLiteVSS(SQLiteVSS):
     def delete_edge_embedding(self, ids: Any) -> None:
         self.db.atomic(self._remove_edge(ids))
 
+    def is_node_embedding_current(
+        self, embed_id: int, id: Any, label: str, data: Dict
+    ) -> bool:
+        return False
+
     def vector_search_edge_from_multi_db(
-        self, data: Dict, *, threshold: float = 0.9, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        embedding: Optional[List[float]] = None,
     ):
         raise NotImplementedError(
             "vector_search_edge_from_multi_db method is not yet implemented"
         )
 
     def vector_search_node_from_multi_db(
-        self, data: Dict, *, threshold: float = 0.9, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        embedding: Optional[List[float]] = None,
     ):
         raise NotImplementedError(
             "vector_search_node_from_multi_db method is not yet implemented"
@@ -156,6 +164,7 @@ class FhirSQLiteVSS(SQLiteVSS):
         descending: bool = False,
         limit: int = 1,
         sort_by: str = "",
+        embedding: Optional[List[float]] = None,
     ):
         raise NotImplementedError("vector_search_edge method is not yet implemented")
 
@@ -167,5 +176,6 @@ class FhirSQLiteVSS(SQLiteVSS):
         descending: bool = False,
         limit: int = 1,
         sort_by: str = "",
+        embedding: Optional[List[float]] = None,
     ):
         raise NotImplementedError("vector_search_node method is not yet implemented")
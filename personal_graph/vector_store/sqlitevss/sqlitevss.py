@@ -1,7 +1,8 @@
+import hashlib
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from personal_graph.clients import (
     OpenAIEmbeddingClient,
@@ -12,6 +13,7 @@ from personal_graph.vector_store.vector_store import VectorStore
 from personal_graph.database import TursoDB
 from personal_graph.database import SQLite
 from personal_graph.database.db import CursorExecFunction
+from personal_graph.metrics import timed
 
 
 @lru_cache(maxsize=None)
@@ -22,6 +24,11 @@ def read_sql(sql_file: Path) -> str:
         return f.read()
 
 
+def content_hash(data: Dict) -> str:
+    """SHA-256 of the data as JSON with sorted keys, so key order does not matter"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
 class SQLiteVSS(VectorStore):
     def __init__(
         self,
@@ -66,53 +73,62 @@ class SQLiteVSS(VectorStore):
             data["label"] = label
         return data
 
+    def _edge_data(
+        self, source: Any, target: Any, label: str, attributes: Dict
+    ) -> Dict:
+        return {
+            "source_id": source,
+            "target_id": target,
+            "label": label,
+            "attributes": json.dumps(attributes),
+        }
+
+    def _embed(
+        self, data: Dict, embedding: Optional[List[float]] = None
+    ) -> Tuple[str, str]:
+        """
+        Return the embedding of data as JSON, along with its content hash. The
+        embedding model is only called when no precomputed embedding is given.
+        """
+        if embedding is None:
+            with timed("embedding"):
+                embedding = self.embedding_model.get_embedding(json.dumps(data))
+        return json.dumps(embedding), content_hash(data)
+
     def _add_embedding(self, id: Any, label: str, data: Dict) -> CursorExecFunction:
         def _insert(cursor, connection):
             set_data = self._set_id(id, label, data)
 
-            count = (
-                cursor.execute(
-                    "SELECT COALESCE(MAX(rowid), 0) FROM nodes_embedding"
-                ).fetchone()[0]
-                + 1
-            )
+            count = self.db.ids.next_id(cursor, "nodes_embedding", "rowid")
+            embedding, digest = self._embed(set_data)
 
             cursor.execute(
-                read_sql(Path("insert-node-embedding.sql")),
-                (
-                    count,
-                    json.dumps(
-                        self.embedding_model.get_embedding(json.dumps(set_data))
-                    ),
-                ),
+                read_sql(Path("insert-node-embedding.sql")), (count, embedding)
+            )
+            cursor.execute(
+                read_sql(Path("insert-embedding-hash.sql")), ("node", count, digest)
             )
-            connection.commit()
 
         return _insert
 
     def _add_edge_embedding(self, data: Dict):
         def _insert_edge_embedding(cursor, connection):
-            count = (
-                cursor.execute(
-                    "SELECT COALESCE(MAX(rowid), 0) FROM relationship_embedding"
-                ).fetchone()[0]
-                + 1
-            )
+            count = self.db.ids.next_id(cursor, "relationship_embedding", "rowid")
+            embedding, digest = self._embed(data)
 
             cursor.execute(
-                read_sql(Path("insert-edge-embedding.sql")),
-                (
-                    count,
-                    json.dumps(self.embedding_model.get_embedding(json.dumps(data))),
-                ),
+                read_sql(Path("insert-edge-embedding.sql")), (count, embedding)
+            )
+            cursor.execute(
+                read_sql(Path("insert-embedding-hash.sql")), ("edge", count, digest)
             )
-            connection.commit()
 
         return _insert_edge_embedding
 
     def _remove_node(self, id: Any):
         def _delete_node_embedding(cursor, connection):
             cursor.execute(read_sql(Path("delete-node-embedding.sql")), (id[0],))
+            cursor.execute(read_sql(Path("delete-embedding-hash.sql")), ("node", id[0]))
 
         return _delete_node_embedding
 
@@ -120,9 +136,40 @@ class SQLiteVSS(VectorStore):
         def _delete_node_embedding(cursor, connection):
             for id in ids:
                 cursor.execute(read_sql(Path("delete-edge-embedding.sql")), (id[0],))
+                cursor.execute(
+                    read_sql(Path("delete-embedding-hash.sql")), ("edge", id[0])
+                )
 
         return _delete_node_embedding
 
+    def is_node_embedding_current(
+        self, embed_id: int, id: Any, label: str, data: Dict
+    ) -> bool:
+        """Whether the stored vector embed_id was computed from this same content"""
+        digest = content_hash(self._set_id(id, label, dict(data)))
+
+        def _search_hash(cursor, connection):
+            return cursor.execute(
+                read_sql(Path("search-embedding-hash.sql")), ("node", embed_id)
+            ).fetchone()
+
+        stored = self.db.atomic(_search_hash)
+        return stored is not None and stored[0] == digest
+
+    def is_edge_embedding_current(
+        self, embed_id: int, source: Any, target: Any, label: str, attributes: Dict
+    ) -> bool:
+        """Whether the stored edge vector embed_id was computed from this same content"""
+        digest = content_hash(self._edge_data(source, target, label, attributes))
+
+        def _search_hash(cursor, connection):
+            return cursor.execute(
+                read_sql(Path("search-embedding-hash.sql")), ("edge", embed_id)
+            ).fetchone()
+
+        stored = self.db.atomic(_search_hash)
+        return stored is not None and stored[0] == digest
+
     def add_node_embedding(
         self, id: Any, label: str, attribute: Dict[Any, Any]
     ) -> None:
@@ -131,24 +178,41 @@ class SQLiteVSS(VectorStore):
     def add_edge_embedding(
         self, source: Any, target: Any, label: str, attributes: Dict
     ) -> None:
-        edge_data = {
-            "source_id": source,
-            "target_id": target,
-            "label": label,
-            "attributes": json.dumps(attributes),
-        }
+        edge_data = self._edge_data(source, target, label, attributes)
 
         self.db.atomic(self._add_edge_embedding(edge_data))
 
+    def add_node_embeddings(self, ids, labels, attributes):
+        def _insert_embeddings(cursor, connection):
+            rowids = self.db.ids.reserve(cursor, "nodes_embedding", "rowid", len(ids))
+            embeddings: List[Tuple[int, str]] = []
+            hashes: List[Tuple[str, int, str]] = []
+            for rowid, x in zip(rowids, zip(ids, labels, attributes)):
+                embedding, digest = self._embed(self._set_id(x[0], x[1], dict(x[2])))
+                embeddings.append((rowid, embedding))
+                hashes.append(("node", rowid, digest))
+
+            cursor.executemany(read_sql(Path("insert-node-embedding.sql")), embeddings)
+            cursor.executemany(read_sql(Path("insert-embedding-hash.sql")), hashes)
+
+        self.db.atomic(_insert_embeddings)
+
     def add_edge_embeddings(self, sources, targets, labels, attributes):
-        for i, x in enumerate(zip(sources, targets, labels, attributes)):
-            edge_data = {
-                "source_id": x[0],
-                "target_id": x[1],
-                "label": x[2],
-                "attributes": json.dumps(x[3]),
-            }
-            self.db.atomic(self._add_edge_embedding(edge_data))
+        def _insert_embeddings(cursor, connection):
+            rowids = self.db.ids.reserve(
+                cursor, "relationship_embedding", "rowid", len(sources)
+            )
+            embeddings: List[Tuple[int, str]] = []
+            hashes: List[Tuple[str, int, str]] = []
+            for rowid, x in zip(rowids, zip(sources, targets, labels, attributes)):
+                embedding, digest = self._embed(self._edge_data(*x))
+                embeddings.append((rowid, embedding))
+                hashes.append(("edge", rowid, digest))
+
+            cursor.executemany(read_sql(Path("insert-edge-embedding.sql")), embeddings)
+            cursor.executemany(read_sql(Path("insert-embedding-hash.sql")), hashes)
+
+        self.db.atomic(_insert_embeddings)
 
     def delete_node_embedding(self, id: Any) -> None:
         self.db.atomic(self._remove_node(id))
@@ -156,6 +220,32 @@ class SQLiteVSS(VectorStore):
     def delete_edge_embedding(self, ids: Any) -> None:
         self.db.atomic(self._remove_edge(ids))
 
+    def delete_node_embeddings(self, embed_ids: List[int]) -> None:
+        def _delete_node_embeddings(cursor, connection):
+            cursor.executemany(
+                read_sql(Path("delete-node-embedding.sql")),
+                [(embed_id,) for embed_id in embed_ids],
+            )
+            cursor.executemany(
+                read_sql(Path("delete-embedding-hash.sql")),
+                [("node", embed_id) for embed_id in embed_ids],
+            )
+
+        self.db.atomic(_delete_node_embeddings)
+
+    def delete_edge_embeddings(self, embed_ids: List[int]) -> None:
+        def _delete_edge_embeddings(cursor, connection):
+            cursor.executemany(
+                read_sql(Path("delete-edge-embedding.sql")),
+                [(embed_id,) for embed_id in embed_ids],
+            )
+            cursor.executemany(
+                read_sql(Path("delete-embedding-hash.sql")),
+                [("edge", embed_id) for embed_id in embed_ids],
+            )
+
+        self.db.atomic(_delete_edge_embeddings)
+
     def vector_search_node(
         self,
         data: Dict,
@@ -164,24 +254,15 @@ class SQLiteVSS(VectorStore):
         descending: bool = False,
         limit: int = 1,
         sort_by: str = "",
+        embedding: Optional[List[float]] = None,
     ):
         def _search_node(cursor, connection):
-            embed_json = json.dumps(
-                self.embedding_model.get_embedding(json.dumps(data))
-            )
+            embed_json, _ = self._embed(data, embedding)
 
             nodes = cursor.execute(
-                read_sql(Path("vector-search-node.sql")),
-                (
-                    embed_json,
-                    limit,
-                    sort_by,
-                    descending,
-                    sort_by,
-                    sort_by,
-                    descending,
-                    sort_by,
-                ),
+                read_sql(Path("vector-search-node.sql"))
+                + self.db.order_by_attribute("nodes", sort_by, desc=descending),
+                (embed_json, limit),
             ).fetchall()
 
             if not nodes:
@@ -204,9 +285,10 @@ class SQLiteVSS(VectorStore):
         descending: bool = False,
         limit: int = 1,
         sort_by: str = "",
+        embedding: Optional[List[float]] = None,
     ):
         def _search_edge(cursor, connection):
-            embed = json.dumps(self.embedding_model.get_embedding(json.dumps(data)))
+            embed, _ = self._embed(data, embedding)
             if descending:
                 edges = cursor.execute(
                     read_sql(Path("vector-search-edge-desc.sql")), (embed, limit)
@@ -229,12 +311,15 @@ class SQLiteVSS(VectorStore):
         return self.db.atomic(_search_edge)
 
     def vector_search_node_from_multi_db(
-        self, data: Dict, *, threshold: float = 0.9, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        embedding: Optional[List[float]] = None,
     ):
         def _search_node(cursor, connection):
-            embed_json = json.dumps(
-                self.embedding_model.get_embedding(json.dumps(data))
-            )
+            embed_json, _ = self._embed(data, embedding)
 
             nodes = cursor.execute(
                 read_sql(Path("similarity-search-node.sql")),
@@ -252,12 +337,15 @@ class SQLiteVSS(VectorStore):
         return self.db.atomic(_search_node)
 
     def vector_search_edge_from_multi_db(
-        self, data: Dict, *, threshold: float = 0.9, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        embedding: Optional[List[float]] = None,
     ):
         def _search_node(cursor, connection):
-            embed_json = json.dumps(
-                self.embedding_model.get_embedding(json.dumps(data))
-            )
+            embed_json, _ = self._embed(data, embedding)
 
             nodes = cursor.execute(
                 read_sql(Path("similarity-search-edge.sql")),
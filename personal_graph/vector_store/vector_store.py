@@ -3,7 +3,7 @@ Provide access to different vector databases
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 
 class VectorStore(ABC):
@@ -22,6 +22,16 @@ class VectorStore(ABC):
         """Add a single node embedding to the database."""
         pass
 
+    @abstractmethod
+    def add_node_embeddings(
+        self,
+        ids: List[Any],
+        labels: List[str],
+        attributes: List[Dict],
+    ):
+        """Add nodes embeddings to the vector store"""
+        pass
+
     @abstractmethod
     def add_edge_embedding(
         self, source: Any, target: Any, label: str, attributes: Dict
@@ -50,6 +60,27 @@ class VectorStore(ABC):
         """Remove multiple nodes embedding from the database."""
         pass
 
+    def delete_node_embeddings(self, embed_ids: List[int]) -> None:
+        """Remove the node embeddings with the given embed ids."""
+        for embed_id in embed_ids:
+            self.delete_node_embedding((embed_id,))
+
+    def delete_edge_embeddings(self, embed_ids: List[int]) -> None:
+        """Remove the edge embeddings with the given embed ids."""
+        self.delete_edge_embedding([(embed_id,) for embed_id in embed_ids])
+
+    def is_node_embedding_current(
+        self, embed_id: int, id: Any, label: str, data: Dict
+    ) -> bool:
+        """Whether the stored node embedding was computed from this same content."""
+        return False
+
+    def is_edge_embedding_current(
+        self, embed_id: int, source: Any, target: Any, label: str, attributes: Dict
+    ) -> bool:
+        """Whether the stored edge embedding was computed from this same content."""
+        return False
+
     @abstractmethod
     def vector_search_node(
         self,
@@ -59,6 +90,7 @@ class VectorStore(ABC):
         descending: bool,
         limit: int,
         sort_by: str,
+        embedding: Optional[List[float]] = None,
     ):
         """Perform a vector search for nodes."""
         pass
@@ -72,20 +104,31 @@ class VectorStore(ABC):
         descending: bool,
         limit: int,
         sort_by: str,
+        embedding: Optional[List[float]] = None,
     ):
         """Perform a vector search for edges."""
         pass
 
     @abstractmethod
     def vector_search_node_from_multi_db(
-        self, data: Dict, *, threshold: float, limit: int
+        self,
+        data: Dict,
+        *,
+        threshold: float,
+        limit: int,
+        embedding: Optional[List[float]] = None,
     ):
         """Perform a vector search for nodes across multiple databases"""
         pass
 
     @abstractmethod
     def vector_search_edge_from_multi_db(
-        self, data: Dict, *, threshold: float, limit: int
+        self,
+        data: Dict,
+        *,
+        threshold: float,
+        limit: int,
+        embedding: Optional[List[float]] = None,
     ):
         """Perform a vector search for edges across multiple databases"""
         pass
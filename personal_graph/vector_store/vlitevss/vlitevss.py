@@ -46,6 +46,15 @@ class VliteVSS(VectorStore):
         self.vlite.add({"text": json.dumps(attributes)}, metadata={"embed_id": count})
         self.vlite.save()
 
+    def add_node_embeddings(
+        self,
+        ids: List[Any],
+        labels: List[str],
+        attributes: List[Dict],
+    ):
+        for i, x in enumerate(zip(ids, labels, attributes)):
+            self.add_node_embedding(x[0], x[1], x[2])
+
     def add_edge_embeddings(
         self,
         sources: List[Any],
@@ -65,6 +74,13 @@ class VliteVSS(VectorStore):
         id_to_be_deleted = self.vlite.get(where={"embed_id": id})
         self.vlite.delete(id_to_be_deleted)
 
+    def delete_node_embeddings(self, embed_ids: List[int]) -> None:
+        for embed_id in embed_ids:
+            self.vlite.delete(self.vlite.get(where={"embed_id": embed_id}))
+
+    def delete_edge_embeddings(self, embed_ids: List[int]) -> None:
+        self.delete_node_embeddings(embed_ids)
+
     def vector_search_node(
         self,
         data: Dict,
@@ -73,7 +89,9 @@ class VliteVSS(VectorStore):
         descending: bool,
         limit: int,
         sort_by: str,
+        embedding: Optional[List[float]] = None,
     ):
+        # vlite embeds the query with its own model, so embedding is not used
         results = self.vlite.retrieve(
             text=json.dumps(data), top_k=limit, return_scores=True
         )
@@ -97,6 +115,7 @@ class VliteVSS(VectorStore):
         descending: bool,
         limit: int,
         sort_by: str,
+        embedding: Optional[List[float]] = None,
     ):
         results = self.vlite.retrieve(
             text=json.dumps(data), top_k=limit, return_scores=True
@@ -113,7 +132,12 @@ class VliteVSS(VectorStore):
         return results[:limit]
 
     def vector_search_node_from_multi_db(
-        self, data: Dict, *, threshold: Optional[float] = None, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: Optional[float] = None,
+        limit: int = 1,
+        embedding: Optional[List[float]] = None,
     ):
         results = self.vlite.retrieve(
             text=json.dumps(data), top_k=limit, return_scores=True
@@ -128,7 +152,12 @@ class VliteVSS(VectorStore):
         return results[:limit]
 
     def vector_search_edge_from_multi_db(
-        self, data: Dict, *, threshold: Optional[float] = None, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: Optional[float] = None,
+        limit: int = 1,
+        embedding: Optional[List[float]] = None,
     ):
         results = self.vlite.retrieve(
             text=json.dumps(data), top_k=limit, return_scores=True
@@ -0,0 +1,262 @@
+"""
+Benchmark the GraphDB hot paths on synthetic graphs of increasing size, generated
+by personal_graph.synth.
+
+Runs offline: the graph lives in an in-memory SQLite database with sqlite-vss, and
+embeddings come from a deterministic hash-based model, so two runs on the same
+machine measure the same work. Results are written as JSON, and can be compared
+against a stored baseline from an earlier run:
+
+    python -m scripts.benchmark --sizes 1000,10000 --output bench.json
+    python -m scripts.benchmark --sizes 1000,10000 --baseline bench.json
+
+The comparison exits with status 1 when any benchmark's median got slower than the
+baseline by more than --tolerance.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import sqlite_vss  # type: ignore
+
+from personal_graph import GraphDB
+from personal_graph.clients import EmbeddingClient
+from personal_graph.database import SQLite
+from personal_graph.embeddings import EmbeddingsModel
+from personal_graph.synth import GraphSpec, SyntheticGraph
+from personal_graph.vector_store import SQLiteVSS
+
+
+class StubEmbeddingsModel(EmbeddingsModel):
+    """Deterministic unit vectors seeded from the SHA-256 of the text"""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def get_embedding(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+        rng = random.Random(seed)
+        vector = [rng.gauss(0.0, 1.0) for _ in range(self.dimension)]
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+
+class StubEmbeddingClient(EmbeddingClient):
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def _create_default_client(self):
+        return None
+
+    def get_embedding_model(self):
+        return StubEmbeddingsModel(self.dimension)
+
+
+def make_graph(dimension: int) -> GraphDB:
+    database = SQLite(
+        vector0_so_path=sqlite_vss.vector_loadable_path(),
+        vss0_so_path=sqlite_vss.vss_loadable_path(),
+    )
+    vector_store = SQLiteVSS(
+        db=database,
+        index_dimension=dimension,
+        embedding_client=StubEmbeddingClient(dimension),  # type: ignore
+    )
+    return GraphDB(
+        vector_store=vector_store,
+        database=database,
+        graph_generator=None,  # type: ignore
+    )
+
+
+def benchmarks(
+    synthetic: SyntheticGraph, rng: random.Random
+) -> Dict[str, Callable[[GraphDB, int], Any]]:
+    """
+    The benchmarks to run on a populated graph, in order.
+
+    Read-only ones come first. The writes after them change the graph, so each uses
+    ids of its own.
+    """
+    size = synthetic.spec.nodes
+
+    def existing() -> str:
+        return f"n{rng.randrange(size)}"
+
+    return {
+        "search_node": lambda graph, i: graph.search_node(existing()),
+        "traverse": lambda graph, i: graph.traverse(existing(), max_depth=2),
+        "vector_search": lambda graph, i: graph.search(
+            synthetic.text(rng, 4), threshold=10.0, limit=5
+        ),
+        "search_from_graph": lambda graph, i: graph.search_from_graph(
+            synthetic.text(rng, 4), threshold=10.0, limit=3
+        ),
+        "update": lambda graph, i: graph.update_node(synthetic.node(rng, existing())),
+        "insert": lambda graph, i: graph.add_node(synthetic.node(rng, f"insert{i}")),
+        "bulk_insert": lambda graph, i: graph.add_nodes(
+            [synthetic.node(rng, f"bulk{i}-{j}") for j in range(100)], bulk=True
+        ),
+        "remove": lambda graph, i: graph.remove_node(f"insert{i}"),
+    }
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    ordered = sorted(durations)
+    median = statistics.median(ordered)
+    return {
+        "runs": len(ordered),
+        "median": median,
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min": ordered[0],
+        "max": ordered[-1],
+        "ops_per_sec": 1 / median if median else 0.0,
+    }
+
+
+def run_size(
+    size: int, args: argparse.Namespace, only: Optional[List[str]]
+) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(args.seed)
+    graph = make_graph(args.dimension)
+    synthetic = SyntheticGraph(
+        GraphSpec(nodes=size, mean_degree=args.degree, seed=args.seed)
+    )
+
+    start = time.perf_counter()
+    synthetic.load(graph, chunk=args.chunk)
+    results = {"populate": {"runs": 1, "median": time.perf_counter() - start}}
+
+    for name, fn in benchmarks(synthetic, rng).items():
+        if only and name not in only:
+            continue
+
+        durations = []
+        for i in range(args.repeat):
+            start = time.perf_counter()
+            fn(graph, i)
+            durations.append(time.perf_counter() - start)
+        results[name] = summarize(durations)
+        print(
+            f"{size} {name}: {results[name]['median'] * 1000:.3f} ms", file=sys.stderr
+        )
+
+    if not only or "merge_by_similarity" in only:
+        # Every node triggers a vector search, so merging runs on a capped graph
+        merge_size = min(size, args.merge_size)
+        merge_graph = make_graph(args.dimension)
+        SyntheticGraph(
+            GraphSpec(nodes=merge_size, mean_degree=args.degree, seed=args.seed)
+        ).load(merge_graph, chunk=args.chunk)
+        start = time.perf_counter()
+        merge_graph.merge_by_similarity(threshold=0.1)
+        results["merge_by_similarity"] = {
+            **summarize([time.perf_counter() - start]),
+            "nodes": merge_size,
+        }
+
+    return results
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Print the median of each benchmark next to its baseline; return the regressions"""
+    regressions = []
+    for size, benches in results["results"].items():
+        for name, stats in benches.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if previous is None or not previous.get("median"):
+                continue
+
+            ratio = stats["median"] / previous["median"]
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{size}/{name}")
+            elif ratio < 1 - tolerance:
+                flag = "  improved"
+
+            print(
+                f"{size:>8} {name:<20} {previous['median'] * 1000:>10.3f} ms "
+                f"-> {stats['median'] * 1000:>10.3f} ms  x{ratio:.2f}{flag}"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Comma separated graph sizes in nodes, up to 1000000",
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dimension", type=int, default=32, help="Embedding size")
+    parser.add_argument("--degree", type=float, default=2.0, help="Mean edges per node")
+    parser.add_argument("--chunk", type=int, default=10000, help="Nodes per load")
+    parser.add_argument(
+        "--merge-size",
+        type=int,
+        default=1000,
+        help="Largest graph merge_by_similarity runs on",
+    )
+    parser.add_argument(
+        "--only", default="", help="Comma separated benchmarks to run, default all"
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results from this file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Slowdown of a median, as a fraction, that counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    only = [name for name in args.only.split(",") if name] or None
+    results: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "dimension": args.dimension,
+            "degree": args.degree,
+        },
+        "results": {},
+    }
+    for size in (int(size) for size in args.sizes.split(",")):
+        results["results"][str(size)] = run_size(size, args, only)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+EdgeLoader = Callable[[], Iterable[Tuple[Any, Any]]]
+
+class AdjacencyIndex:
+    loader: EdgeLoader
+    compact_threshold: int
+    def __init__(
+        self,
+        loader: EdgeLoader,
+        *,
+        compact_threshold: int = 1024,
+        lock: Optional[Any] = None,
+    ) -> None: ...
+    def __contains__(self, node_id: Any) -> bool: ...
+    def rebuild(self) -> None: ...
+    def compact(self) -> None: ...
+    def invalidate(self) -> None: ...
+    def add_edge(self, source: Any, target: Any) -> None: ...
+    def remove_node(self, node_id: Any) -> None: ...
+    @property
+    def edge_count(self) -> int: ...
+    def neighbors(self, node_id: Any, *, direction: str = "out") -> List[str]: ...
+    def degree(self, node_id: Any, *, direction: str = "out") -> int: ...
+    def bfs(
+        self,
+        source: Any,
+        target: Optional[Any] = None,
+        *,
+        max_depth: Optional[int] = None,
+        direction: str = "out",
+        limit: Optional[int] = None,
+    ) -> Dict[str, int]: ...
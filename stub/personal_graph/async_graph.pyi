@@ -0,0 +1,97 @@
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from personal_graph.graph import GraphDB as GraphDB
+from personal_graph.models import (
+    EdgeInput as EdgeInput,
+    KnowledgeGraph as KnowledgeGraph,
+    Node as Node,
+)
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class AsyncGraphDB:
+    graph: GraphDB
+    max_workers: int
+    _executor: ThreadPoolExecutor
+    def __init__(self, graph: GraphDB, *, max_workers: int = 8) -> None: ...
+    async def __aenter__(self) -> AsyncGraphDB: ...
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None: ...
+    async def aclose(self) -> None: ...
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T: ...
+    async def add_node(self, node: Node, **kwargs: Any) -> None: ...
+    async def add_nodes(
+        self, nodes: List[Node], **kwargs: Any
+    ) -> Optional[List[Node]]: ...
+    async def add_edge(self, edge: EdgeInput) -> None: ...
+    async def add_edges(
+        self, edges: List[EdgeInput], *, bulk: bool = False
+    ) -> Optional[List[EdgeInput]]: ...
+    async def update_node(self, node: Node) -> None: ...
+    async def update_nodes(self, nodes: List[Node]) -> None: ...
+    async def remove_node(self, id: str | int) -> None: ...
+    async def remove_nodes(self, ids: List[Any]) -> None: ...
+    async def search_node(self, node_id: str | int) -> Any: ...
+    async def search_node_label(self, node_id: str | int) -> Any: ...
+    async def traverse(
+        self,
+        source: str,
+        target: str | None = None,
+        with_bodies: bool = False,
+        **kwargs: Any,
+    ) -> List: ...
+    async def shortest_path(
+        self,
+        source: str,
+        target: str,
+        max_depth: int | None = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph: ...
+    async def k_hop(
+        self, node_id: str, k: int, *, direction: str = "both"
+    ) -> Dict[str, int]: ...
+    async def neighbors(self, node_id: str, *, direction: str = "out") -> List[str]: ...
+    async def degree(self, node_id: str, *, direction: str = "out") -> int: ...
+    async def text_search(self, query: str, limit: int = 10) -> List[Node]: ...
+    async def fetch_ids_from_db(self, **kwargs: Any) -> List[str]: ...
+    async def search_indegree_edges(self, target: str) -> List[Any]: ...
+    async def search_outdegree_edges(self, source: str) -> List[Any]: ...
+    async def merge_by_similarity(self, *, threshold: float = 0.9) -> None: ...
+    async def find_nodes_like(
+        self, label: str, *, threshold: float = 0.9
+    ) -> List[Node]: ...
+    async def insert(self, text: str, attributes: Dict, **kwargs: Any) -> None: ...
+    async def insert_graph(self, kg: KnowledgeGraph) -> KnowledgeGraph: ...
+    async def text_to_graph(self, text: str) -> KnowledgeGraph: ...
+    async def insert_text(self, text: str) -> KnowledgeGraph: ...
+    async def search(
+        self,
+        text: str,
+        *,
+        threshold: float = 0.9,
+        descending: bool = False,
+        limit: int = 1,
+        sort_by: str = "",
+    ) -> None | List[Tuple[Any, str, dict, Any]]: ...
+    async def is_unique_prompt(self, text: str, *, threshold: float = 0.9) -> bool: ...
+    async def search_from_graph(
+        self,
+        text: str,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        descending: bool = False,
+        sort_by: str = "",
+        neighbor_limit: int | None = None,
+        hybrid: bool = False,
+        vector_k: int | None = None,
+        lexical_k: int | None = None,
+        rrf_k: int = 60,
+    ) -> KnowledgeGraph: ...
@@ -1,4 +1,7 @@
-from personal_graph.database.sqlite.sqlite import SQLite as SQLite
+from personal_graph.database.sqlite.sqlite import (
+    SQLite as SQLite,
+    ConnectionSettings as ConnectionSettings,
+)
 from personal_graph.database.tursodb.turso import TursoDB as TursoDB
 
-__all__ = ["TursoDB", "SQLite"]
+__all__ = ["TursoDB", "SQLite", "ConnectionSettings"]
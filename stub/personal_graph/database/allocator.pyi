@@ -0,0 +1,13 @@
+from typing import Any
+
+SEQUENCE_SCHEMA: str
+
+class IdAllocator:
+    block_size: int
+    def __init__(self, block_size: int = 64) -> None: ...
+    def next_id(self, cursor: Any, table: str, column: str = "embed_id") -> int: ...
+    def reserve(
+        self, cursor: Any, table: str, column: str = "embed_id", count: int = 1
+    ) -> range: ...
+    def release(self, table: str, id: int, column: str = "embed_id") -> None: ...
+    def reset(self) -> None: ...
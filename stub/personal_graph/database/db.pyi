@@ -1,11 +1,32 @@
 import abc
 from abc import ABC, abstractmethod
 from graphviz import Digraph  # type: ignore
-from personal_graph.models import Edge as Edge, Node as Node
-from typing import Any, Dict, List
+from personal_graph.models import (
+    Edge as Edge,
+    EdgeInput as EdgeInput,
+    KnowledgeGraph as KnowledgeGraph,
+    Node as Node,
+)
+from contextlib import AbstractContextManager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from personal_graph.database.db import CursorExecFunction
+from personal_graph.database.allocator import IdAllocator
+from personal_graph.database.profiler import QueryProfiler
 
 class DB(ABC, metaclass=abc.ABCMeta):
+    ids: IdAllocator
+    profiler: Optional[QueryProfiler]
+    def __init__(self) -> None: ...
+    def transaction(self) -> AbstractContextManager[None]: ...
+    def enable_profiling(
+        self,
+        *,
+        slow_threshold: float = 0.1,
+        explain: bool = True,
+        max_slow_queries: int = 100,
+    ) -> QueryProfiler: ...
+    def disable_profiling(self) -> None: ...
+    def stats(self) -> Dict[str, Dict[str, Any]]: ...
     @abstractmethod
     def initialize(self): ...
     @abstractmethod
@@ -18,6 +39,9 @@ class DB(ABC, metaclass=abc.ABCMeta):
     def fetch_edge_embed_ids(self, id: Any): ...
     @abstractmethod
     def all_connected_nodes(self, node_or_edge: Node | Edge) -> Any: ...
+    def all_connected_nodes_batch(
+        self, nodes_or_edges: List[Node | Edge], limit: int | None = None
+    ) -> List[Any]: ...
     @abstractmethod
     def get_connections(self, identifier: Any) -> CursorExecFunction: ...
     @abstractmethod
@@ -29,6 +53,10 @@ class DB(ABC, metaclass=abc.ABCMeta):
         self, source: Any, target: Any, label: str, attributes: Dict
     ) -> None: ...
     @abstractmethod
+    def add_nodes_bulk(self, nodes: List[Node]) -> List[Node]: ...
+    @abstractmethod
+    def add_edges_bulk(self, edges: List[EdgeInput]) -> List[EdgeInput]: ...
+    @abstractmethod
     def update_node(self, node: Node): ...
     @abstractmethod
     def remove_node(self, id: Any) -> None: ...
@@ -37,8 +65,30 @@ class DB(ABC, metaclass=abc.ABCMeta):
     @abstractmethod
     def search_node_label(self, node_id: Any) -> Any: ...
     @abstractmethod
+    def shortest_path(
+        self,
+        source: Any,
+        target: Any,
+        max_depth: int | None = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph: ...
+    @abstractmethod
+    def k_hop(
+        self, node_id: Any, k: int, *, direction: str = "both"
+    ) -> Dict[str, int]: ...
+    @abstractmethod
+    def fetch_edge_endpoints(self) -> List[Tuple[str, str]]: ...
     def traverse(
-        self, source: Any, target: Any | None = None, with_bodies: bool = False
+        self,
+        source: Any,
+        target: Any | None = None,
+        with_bodies: bool = False,
+        *,
+        max_depth: int | None = None,
+        direction: str | None = None,
+        edge_labels: List[str] | None = None,
+        limit: int | None = None,
     ) -> List: ...
     @abstractmethod
     def fetch_node_id(self, id: Any): ...
@@ -59,6 +109,13 @@ class DB(ABC, metaclass=abc.ABCMeta):
         edge_kv: str = " ",
     ) -> Digraph: ...
     @abstractmethod
+    def iter_nodes(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, Any]]: ...
+    @abstractmethod
+    def iter_edges(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, str, Any]]: ...
     def fetch_ids_from_db(self) -> List[str]: ...
     @abstractmethod
     def search_indegree_edges(self, target: Any) -> List[Any]: ...
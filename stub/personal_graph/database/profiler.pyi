@@ -0,0 +1,47 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+BUCKETS: Tuple[float, ...]
+
+def fingerprint(sql: str) -> str: ...
+
+class StatementStats:
+    count: int
+    total: float
+    max: float
+    slow: int
+    buckets: List[int]
+    plan: Optional[List[str]]
+    def __init__(self) -> None: ...
+    def observe(self, elapsed: float) -> None: ...
+    def as_dict(self) -> Dict[str, Any]: ...
+
+class QueryProfiler:
+    slow_threshold: float
+    explain: bool
+    def __init__(
+        self,
+        *,
+        slow_threshold: float = 0.1,
+        explain: bool = True,
+        max_slow_queries: int = 100,
+    ) -> None: ...
+    def record(
+        self, sql: str, params: Any, elapsed: float, connection: Any = None
+    ) -> None: ...
+    def stats(self) -> Dict[str, Dict[str, Any]]: ...
+    def slow_queries(self) -> List[Dict[str, Any]]: ...
+    def reset(self) -> None: ...
+
+class ProfilingCursor:
+    def __init__(
+        self, cursor: Any, connection: Any, profiler: QueryProfiler
+    ) -> None: ...
+    def __getattr__(self, name: str) -> Any: ...
+    def finish(self) -> None: ...
+    def execute(self, sql: str, params: Any = ()) -> ProfilingCursor: ...
+    def executemany(self, sql: str, seq_of_params: Any) -> ProfilingCursor: ...
+    def executescript(self, script: str) -> ProfilingCursor: ...
+    def fetchone(self) -> Any: ...
+    def fetchmany(self, *args: Any) -> List[Any]: ...
+    def fetchall(self) -> List[Any]: ...
+    def __iter__(self) -> Iterator[Any]: ...
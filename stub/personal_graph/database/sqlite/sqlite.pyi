@@ -1,14 +1,24 @@
+from contextlib import AbstractContextManager
 from graphviz import Digraph  # type: ignore
 from jinja2 import BaseLoader, Environment, Template
 from pathlib import Path
+import re
 import sqlean as sqlite3  # type: ignore
-from personal_graph.models import Edge as Edge, Node as Node
+from personal_graph.models import (
+    Edge as Edge,
+    EdgeInput as EdgeInput,
+    KnowledgeGraph as KnowledgeGraph,
+    Node as Node,
+)
 from personal_graph.database.db import DB as DB
-from typing import Any, Callable, Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Optional
 
 CursorExecFunction = Callable[[sqlite3.Cursor, sqlite3.Connection], Any]
+ATTRIBUTE_KEY: re.Pattern[str]
 
+def fts_query(text: str) -> str: ...
 def read_sql(sql_file: Path) -> str: ...
+def list_migrations() -> Tuple[Tuple[int, str], ...]: ...
 
 class SqlTemplateLoader(BaseLoader):
     templates_dir: Path
@@ -17,15 +27,65 @@ class SqlTemplateLoader(BaseLoader):
         self, environment: Environment, template: str
     ) -> Tuple[str, str, Callable[[], bool]]: ...
 
+class StatementRegistry:
+    env: Environment
+    hits: int
+    misses: int
+    def __init__(self, env: Environment) -> None: ...
+    def __len__(self) -> int: ...
+    def render(self, template: str, **params: Any) -> str: ...
+    def statements(self) -> Dict[Tuple[str, Tuple], str]: ...
+    def clear(self) -> None: ...
+
+class ConnectionSettings:
+    journal_mode: str
+    synchronous: str
+    cache_size: int
+    mmap_size: int
+    temp_store: str
+    busy_timeout: int
+    def __init__(
+        self,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size: int = -64000,
+        mmap_size: int = 268435456,
+        temp_store: str = "MEMORY",
+        busy_timeout: int = 5000,
+    ) -> None: ...
+    def pragmas(self) -> Dict[str, Any]: ...
+
+class ReaderPool:
+    size: int
+    def __init__(
+        self, connect: Callable[[], sqlite3.Connection], size: int
+    ) -> None: ...
+    def connection(self) -> AbstractContextManager[sqlite3.Connection]: ...
+    def close(self) -> None: ...
+
+class NodeQuery:
+    OPERATORS: Tuple[str, ...]
+    db: SQLite
+    page_size: int
+    def __init__(self, db: SQLite, *, page_size: int = 256) -> None: ...
+    def where(self, key: str, op: str = "=", value: Any = None) -> NodeQuery: ...
+    def order_by(self, key: str, *, desc: bool = False) -> NodeQuery: ...
+    def limit(self, count: int) -> NodeQuery: ...
+    def compile(self) -> Tuple[str, Tuple]: ...
+    def pages(self) -> Iterator[List[Tuple]]: ...
+    def __iter__(self) -> Iterator[Node]: ...
+    def all(self) -> List[Node]: ...
+    def first(self) -> Optional[Node]: ...
+
 class SQLite(DB):
     use_in_memory: bool
     vector0_so_path: Optional[str]
     vss0_so_path: Optional[str]
     local_path: Optional[str]
+    settings: ConnectionSettings
     env: Template
-    clause_template: Template
-    search_template: Template
-    traverse_template: Template
+    statements: StatementRegistry
+    readers: Optional[ReaderPool]
     def __init__(
         self,
         *,
@@ -33,33 +93,85 @@ class SQLite(DB):
         local_path: str | None = None,
         vector0_so_path: str | None = None,
         vss0_so_path: str | None = None,
+        settings: ConnectionSettings | None = None,
+        readers: int = 0,
     ) -> None: ...
     def __eq__(self, other): ...
     def atomic(self, cursor_exec_fn: CursorExecFunction) -> Any: ...
+    def read(self, cursor_exec_fn: CursorExecFunction) -> Any: ...
     def save(self) -> None: ...
+    def snapshot(self, path: str, *, pages: int = 1024) -> None: ...
+    def load_snapshot(self, path: str, *, pages: int = 1024) -> int: ...
+    def pragmas(self) -> Dict[str, Any]: ...
     def initialize(self): ...
+    def schema_version(self) -> int: ...
+    def migrate(self) -> int: ...
     def all_connected_nodes(
-        self, node_or_edge: Node | Edge, limit: int | None = 1
+        self, node_or_edge: Node | Edge, limit: int | None = None
     ) -> Any: ...
+    def all_connected_nodes_batch(
+        self, nodes_or_edges: List[Node | Edge], limit: int | None = None
+    ) -> List[Node]: ...
     def get_connections(self, identifier: Any) -> CursorExecFunction: ...
     def fetch_node_embed_id(self, node_id: Any, limit: int = 1) -> None: ...
     def fetch_edge_embed_ids(self, id: Any, limit: int = 10): ...
     def search_edge(
         self, source: Any, target: Any, attributes: Dict, limit: int = 1
-    ) -> Dict[Any, Any]: ...
+    ) -> Optional[int]: ...
     def add_node(self, label: str, attribute: Dict, id: Any): ...
     def add_edge(
         self, source: Any, target: Any, label: str, attributes: Dict
     ) -> None: ...
+    def upsert_edge(
+        self, source: Any, target: Any, label: str, attributes: Dict
+    ) -> Optional[int]: ...
+    def add_nodes_bulk(self, nodes: List[Node]) -> List[Node]: ...
+    def add_edges_bulk(self, edges: List[EdgeInput]) -> List[EdgeInput]: ...
     def update_node(self, node: Node): ...
     def remove_node(self, id: Any) -> None: ...
+    def remove_edges_of_nodes(self, ids: List[Any]) -> List[int]: ...
+    def remove_nodes(self, ids: List[Any]) -> List[int]: ...
     def search_node(self, node_id: Any) -> Any: ...
     def search_node_label(self, node_id: Any, limit: int | None = 1) -> Any: ...
+    def shortest_path(
+        self,
+        source: Any,
+        target: Any,
+        max_depth: int | None = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph: ...
+    def k_hop(
+        self, node_id: Any, k: int, *, direction: str = "both"
+    ) -> Dict[str, int]: ...
+    def fetch_edge_endpoints(self) -> List[Tuple[str, str]]: ...
+    def query(self, *, page_size: int = 256) -> NodeQuery: ...
+    def create_attribute_index(self, key: str) -> str: ...
+    def drop_attribute_index(self, key: str) -> bool: ...
+    def attribute_indexes(self) -> List[str]: ...
+    def order_by_attribute(
+        self, alias: str, key: Optional[str], *, desc: Optional[bool] = False
+    ) -> str: ...
     def traverse(
-        self, source: Any, target: Any | None = None, with_bodies: bool = False
+        self,
+        source: Any,
+        target: Any | None = None,
+        with_bodies: bool = False,
+        *,
+        max_depth: int | None = None,
+        direction: str | None = None,
+        edge_labels: List[str] | None = None,
+        limit: int | None = None,
     ) -> List: ...
     def fetch_node_id(self, id: Any, limit: int | None = 1): ...
     def find_nodes_by_label(self, label: str, limit: int | None = 1): ...
+    def text_search(
+        self, query: str, limit: Optional[int] = 10, *, raw: bool = False
+    ) -> List[Tuple[str, str, str, float]]: ...
+    def enable_edge_text_search(self) -> None: ...
+    def text_search_edges(
+        self, query: str, limit: Optional[int] = 10, *, raw: bool = False
+    ) -> List[Tuple[str, str, str, str, float]]: ...
     def graphviz_visualize(
         self,
         dot_file: str | None = None,
@@ -73,7 +185,13 @@ class SQLite(DB):
         hide_edge_key: bool = False,
         edge_kv: str = " ",
     ) -> Digraph: ...
-    def fetch_ids_from_db(self, limit: int | None = 10) -> List[str]: ...
+    def iter_nodes(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, Any]]: ...
+    def iter_edges(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, str, Any]]: ...
+    def fetch_ids_from_db(self, limit: int | None = None) -> List[str]: ...
     def search_indegree_edges(
         self, target: Any, limit: int | None = 10
     ) -> List[Any]: ...
@@ -1,9 +1,11 @@
-from jinja2 import BaseLoader, Environment, Template
+from jinja2 import BaseLoader, Environment
 
 from pathlib import Path
-from personal_graph.database.sqlite.sqlite import SQLite as SQLite
-from typing import Any, Callable, Tuple, Optional
-from personal_graph.database.db import CursorExecFunction
+from personal_graph.database.sqlite.sqlite import (
+    SQLite as SQLite,
+    StatementRegistry as StatementRegistry,
+)
+from typing import Callable, Tuple, Optional
 
 def read_sql(sql_file: Path) -> str: ...
 
@@ -18,12 +20,11 @@ class TursoDB(SQLite):
     db_url: Optional[str]
     db_auth_token: Optional[str]
     env: Environment
-    clause_template: Template
-    search_template: Template
-    traverse_template: Template
+    statements: StatementRegistry
     def __init__(
         self, *, url: str | None = None, auth_token: str | None = None
     ) -> None: ...
     def __eq__(self, other): ...
-    def atomic(self, cursor_exec_fn: CursorExecFunction) -> Any: ...
     def save(self) -> None: ...
+    def snapshot(self, path: str, *, pages: int = 1024) -> None: ...
+    def load_snapshot(self, path: str, *, pages: int = 1024) -> int: ...
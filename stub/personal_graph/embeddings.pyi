@@ -6,12 +6,19 @@ from abc import ABC, abstractmethod
 class EmbeddingsModel(ABC, metaclass=abc.ABCMeta):
     @abstractmethod
     def get_embedding(self, text: str) -> list[float]: ...
+    async def aget_embedding(self, text: str) -> list[float]: ...
 
 class OpenAIEmbeddingsModel(EmbeddingsModel):
     client: Incomplete
+    async_client: Incomplete
     model: Incomplete
     dimension: Incomplete
     def __init__(
-        self, embed_client: openai.OpenAI, embed_model: str, embed_dimension: int
+        self,
+        embed_client: openai.OpenAI,
+        embed_model: str,
+        embed_dimension: int = 384,
+        async_client: openai.AsyncOpenAI | None = None,
     ) -> None: ...
     def get_embedding(self, text: str) -> list[float]: ...
+    async def aget_embedding(self, text: str) -> list[float]: ...
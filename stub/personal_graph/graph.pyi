@@ -4,6 +4,8 @@ from contextlib import AbstractContextManager
 from graphviz import Digraph  # type: ignore
 from owlready2 import Ontology  # type: ignore
 
+from personal_graph.adjacency import AdjacencyIndex as AdjacencyIndex
+from personal_graph.metrics import Metrics as Metrics, MetricsCallback
 from personal_graph.graph_generator import (
     OpenAITextToGraphParser as OpenAITextToGraphParser,
 )
@@ -13,6 +15,7 @@ from personal_graph.models import (
     KnowledgeGraph as KnowledgeGraph,
     Node as Node,
 )
+from personal_graph.database.sqlite.sqlite import NodeQuery as NodeQuery
 from personal_graph.database import (
     SQLite as SQLite,
     TursoDB as TursoDB,
@@ -21,13 +24,15 @@ from personal_graph.vector_store import (
     SQLiteVSS as SQLiteVSS,
     VliteVSS as VliteVSS,
 )
-from typing import Any, Dict, List, Tuple, Optional, Union
+from typing import Any, Dict, Iterator, List, Tuple, Optional, Union
 
 class GraphDB(AbstractContextManager):
     vector_store: Incomplete
     db: Incomplete
     graph_generator: Incomplete
     ontologies: Incomplete
+    adjacency: Optional[AdjacencyIndex]
+    metrics: Optional[Metrics]
     def __init__(
         self,
         *,
@@ -35,6 +40,7 @@ class GraphDB(AbstractContextManager):
         database: TursoDB | SQLite = ...,
         graph_generator: OpenAITextToGraphParser = ...,
         ontologies: Optional[List[Union[Ontology, Any]]],
+        adjacency_index: bool = False,
     ) -> None: ...
     def __eq__(self, other): ...
     def __enter__(self) -> GraphDB: ...
@@ -44,18 +50,65 @@ class GraphDB(AbstractContextManager):
         exc_value: BaseException | None,
         traceback: types.TracebackType | None,
     ) -> None: ...
+    def transaction(self) -> AbstractContextManager[GraphDB]: ...
+    def batch(self) -> AbstractContextManager[GraphDB]: ...
+    def enable_metrics(
+        self, *, callback: Optional[MetricsCallback] = None
+    ) -> Metrics: ...
+    def disable_metrics(self) -> None: ...
+    def snapshot(self, path: str) -> None: ...
+    def load_snapshot(self, path: str) -> None: ...
+    def build_adjacency_index(
+        self, *, compact_threshold: int = 1024
+    ) -> AdjacencyIndex: ...
+    def drop_adjacency_index(self) -> None: ...
     def add_node(self, node: Node) -> None: ...
-    def add_nodes(self, nodes: List[Node]) -> None: ...
+    def add_nodes(
+        self,
+        nodes: List[Node],
+        *,
+        node_types: List[str] | None = None,
+        delete_if_properties_not_match: List[bool] | None = None,
+        bulk: bool = False,
+    ) -> List[Node] | None: ...
     def add_edge(self, edge: EdgeInput) -> None: ...
-    def add_edges(self, edges: List[EdgeInput]) -> None: ...
+    def add_edges(
+        self, edges: List[EdgeInput], *, bulk: bool = False
+    ) -> List[EdgeInput] | None: ...
     def update_node(self, node: Node) -> None: ...
     def update_nodes(self, nodes: List[Node]) -> None: ...
     def remove_node(self, id: str | int) -> None: ...
     def remove_nodes(self, ids: List[Any]) -> None: ...
     def search_node(self, node_id: str | int) -> Any: ...
     def search_node_label(self, node_id: str | int) -> Any: ...
+    def shortest_path(
+        self,
+        source: str,
+        target: str,
+        max_depth: int | None = None,
+        *,
+        direction: str = "both",
+    ) -> KnowledgeGraph: ...
+    def k_hop(
+        self, node_id: str, k: int, *, direction: str = "both"
+    ) -> Dict[str, int]: ...
+    def neighbors(self, node_id: str, *, direction: str = "out") -> List[str]: ...
+    def degree(self, node_id: str, *, direction: str = "out") -> int: ...
+    def query(self, *, page_size: int = 256) -> NodeQuery: ...
+    def text_search(self, query: str, limit: int = 10) -> List[Node]: ...
+    def create_attribute_index(self, key: str) -> str: ...
+    def drop_attribute_index(self, key: str) -> bool: ...
+    def attribute_indexes(self) -> List[str]: ...
     def traverse(
-        self, source: str, target: str | None = None, with_bodies: bool = False
+        self,
+        source: str,
+        target: str | None = None,
+        with_bodies: bool = False,
+        *,
+        max_depth: int | None = None,
+        direction: str | None = None,
+        edge_labels: List[str] | None = None,
+        limit: int | None = None,
     ) -> List: ...
     def insert_graph(self, kg: KnowledgeGraph) -> KnowledgeGraph: ...
     def search_from_graph(
@@ -66,10 +119,25 @@ class GraphDB(AbstractContextManager):
         limit: int = 1,
         descending: bool = False,
         sort_by: str = "",
+        neighbor_limit: int | None = None,
+        hybrid: bool = False,
+        vector_k: int | None = None,
+        lexical_k: int | None = None,
+        rrf_k: int = 60,
     ) -> KnowledgeGraph: ...
     def merge_by_similarity(self, *, threshold: float = 0.9) -> None: ...
     def find_nodes_like(self, label: str, *, threshold: float = 0.9) -> List[Node]: ...
     def visualize(self, file: str, id: List[str]) -> Digraph: ...
+    def iter_nodes(
+        self,
+        *,
+        batch_size: int = 1000,
+        decode: bool = True,
+        node_type: Optional[str] = None,
+    ) -> Iterator[Tuple[str, str, Any]]: ...
+    def iter_edges(
+        self, *, batch_size: int = 1000, decode: bool = True
+    ) -> Iterator[Tuple[str, str, str, Any]]: ...
     def fetch_ids_from_db(self) -> List[str]: ...
     def search_indegree_edges(self, target: str) -> List[Any]: ...
     def search_outdegree_edges(self, source: str) -> List[Any]: ...
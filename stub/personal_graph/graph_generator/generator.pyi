@@ -8,6 +8,7 @@ from personal_graph.models import KnowledgeGraph as KnowledgeGraph
 class TextToGraphParserInterface(ABC, metaclass=abc.ABCMeta):
     @abstractmethod
     def generate(self, query: str) -> KnowledgeGraph: ...
+    async def agenerate(self, query: str) -> KnowledgeGraph: ...
 
 class OpenAITextToGraphParser(TextToGraphParserInterface):
     system_prompt: str
@@ -17,3 +18,4 @@ class OpenAITextToGraphParser(TextToGraphParserInterface):
         self, llm_client: OpenAIClient, system_prompt: str = ..., prompt: str = ...
     ) -> None: ...
     def generate(self, query: str) -> KnowledgeGraph: ...
+    async def agenerate(self, query: str) -> KnowledgeGraph: ...
@@ -0,0 +1,41 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+BUCKETS: Tuple[float, ...]
+COMPONENTS: Tuple[str, ...]
+MetricsCallback = Callable[[str, float, Dict[str, float], bool], None]
+F = TypeVar("F", bound=Callable[..., Any])
+
+class timed:
+    component: str
+    def __init__(self, component: str) -> None: ...
+    def __enter__(self) -> None: ...
+    def __exit__(self, exc_type, exc_value, traceback) -> None: ...
+
+class OperationStats:
+    count: int
+    errors: int
+    total: float
+    max: float
+    buckets: List[int]
+    components: Dict[str, float]
+    def __init__(self) -> None: ...
+    def observe(
+        self, elapsed: float, components: Dict[str, float], error: bool
+    ) -> None: ...
+    def cumulative_buckets(self) -> List[Tuple[float, int]]: ...
+
+class Metrics:
+    callback: Optional[MetricsCallback]
+    since: float
+    def __init__(self, *, callback: Optional[MetricsCallback] = None) -> None: ...
+    def measure(
+        self, op: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any: ...
+    def record(
+        self, op: str, elapsed: float, components: Dict[str, float], error: bool
+    ) -> None: ...
+    def stats(self) -> Dict[str, Dict[str, Any]]: ...
+    def to_prometheus(self, prefix: str = "personal_graph") -> str: ...
+    def reset(self) -> None: ...
+
+def measured(fn: F) -> F: ...
@@ -0,0 +1,58 @@
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from personal_graph.graph import GraphDB as GraphDB
+from personal_graph.metrics import Metrics as Metrics
+from personal_graph.models import (
+    EdgeInput as EdgeInput,
+    KnowledgeGraph as KnowledgeGraph,
+    Node as Node,
+)
+
+WORDS: List[str]
+DEFAULT_LABELS: Dict[str, float]
+DEFAULT_EDGE_LABELS: List[str]
+DEFAULT_SCHEMAS: Dict[str, Dict[str, str]]
+DEFAULT_MIX: Dict[str, float]
+
+@dataclass
+class GraphSpec:
+    nodes: int = ...
+    mean_degree: float = ...
+    exponent: float = ...
+    labels: Dict[str, float] = ...
+    edge_labels: List[str] = ...
+    schemas: Dict[str, Dict[str, str]] = ...
+    body_words: int = ...
+    seed: int = ...
+
+@dataclass
+class WorkloadSpec:
+    operations: int = ...
+    mix: Dict[str, float] = ...
+    concurrency: int = ...
+    threshold: float = ...
+    seed: int = ...
+
+class SyntheticGraph:
+    spec: GraphSpec
+    labels: List[str]
+    def __init__(self, spec: GraphSpec) -> None: ...
+    @property
+    def edge_count(self) -> int: ...
+    def text(self, rng: random.Random, words: int = 0) -> str: ...
+    def attributes(self, rng: random.Random, label: str) -> Dict[str, Any]: ...
+    def node(self, rng: random.Random, id: str, label: str = "") -> Node: ...
+    def edge(self, rng: random.Random) -> EdgeInput: ...
+    def nodes(self, chunk: int = 10000) -> Iterator[List[Node]]: ...
+    def edges(self, chunk: int = 10000) -> Iterator[List[EdgeInput]]: ...
+    def knowledge_graph(self, rng: random.Random, prefix: str) -> KnowledgeGraph: ...
+    def load(self, graph: GraphDB, *, chunk: int = 10000) -> Tuple[int, int]: ...
+
+def plan(
+    synthetic: SyntheticGraph, spec: WorkloadSpec
+) -> List[Tuple[str, Callable[[GraphDB], Any]]]: ...
+def replay(
+    graph: GraphDB, synthetic: SyntheticGraph, spec: WorkloadSpec
+) -> Metrics: ...
@@ -6,9 +6,10 @@ from personal_graph.database import TursoDB as TursoDB
 from personal_graph.vector_store import (
     VectorStore as VectorStore,
 )
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Union
 
 def read_sql(sql_file: Path) -> str: ...
+def content_hash(data: Dict) -> str: ...
 
 class SQLiteVSS(VectorStore):
     db: Union[TursoDB, SQLite]
@@ -24,9 +25,18 @@ class SQLiteVSS(VectorStore):
     def add_edge_embedding(
         self, source: Any, target: Any, label: str, attributes: Dict
     ) -> None: ...
+    def add_node_embeddings(self, ids, labels, attributes) -> None: ...
     def add_edge_embeddings(self, sources, targets, labels, attributes) -> None: ...
     def delete_node_embedding(self, id: Any) -> None: ...
     def delete_edge_embedding(self, ids: Any) -> None: ...
+    def delete_node_embeddings(self, embed_ids: List[int]) -> None: ...
+    def delete_edge_embeddings(self, embed_ids: List[int]) -> None: ...
+    def is_node_embedding_current(
+        self, embed_id: int, id: Any, label: str, data: Dict
+    ) -> bool: ...
+    def is_edge_embedding_current(
+        self, embed_id: int, source: Any, target: Any, label: str, attributes: Dict
+    ) -> bool: ...
     def vector_search_node(
         self,
         data: Dict,
@@ -35,6 +45,7 @@ class SQLiteVSS(VectorStore):
         descending: bool = False,
         limit: int = 1,
         sort_by: str = "",
+        embedding: List[float] | None = None,
     ): ...
     def vector_search_edge(
         self,
@@ -44,10 +55,21 @@ class SQLiteVSS(VectorStore):
         descending: bool = False,
         limit: int = 1,
         sort_by: str = "",
+        embedding: List[float] | None = None,
     ): ...
     def vector_search_node_from_multi_db(
-        self, data: Dict, *, threshold: float = 0.9, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        embedding: List[float] | None = None,
     ): ...
     def vector_search_edge_from_multi_db(
-        self, data: Dict, *, threshold: float = 0.9, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: float = 0.9,
+        limit: int = 1,
+        embedding: List[float] | None = None,
     ): ...
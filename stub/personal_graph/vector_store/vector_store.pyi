@@ -14,6 +14,10 @@ class VectorStore(ABC, metaclass=abc.ABCMeta):
         self, source: Any, target: Any, label: str, attributes: Dict
     ) -> None: ...
     @abstractmethod
+    def add_node_embeddings(
+        self, ids: List[Any], labels: List[str], attributes: List[Dict]
+    ): ...
+    @abstractmethod
     def add_edge_embeddings(
         self,
         sources: List[Any],
@@ -25,6 +29,14 @@ class VectorStore(ABC, metaclass=abc.ABCMeta):
     def delete_node_embedding(self, id: Any) -> None: ...
     @abstractmethod
     def delete_edge_embedding(self, ids: Any) -> None: ...
+    def delete_node_embeddings(self, embed_ids: List[int]) -> None: ...
+    def delete_edge_embeddings(self, embed_ids: List[int]) -> None: ...
+    def is_node_embedding_current(
+        self, embed_id: int, id: Any, label: str, data: Dict
+    ) -> bool: ...
+    def is_edge_embedding_current(
+        self, embed_id: int, source: Any, target: Any, label: str, attributes: Dict
+    ) -> bool: ...
     @abstractmethod
     def vector_search_node(
         self,
@@ -34,6 +46,7 @@ class VectorStore(ABC, metaclass=abc.ABCMeta):
         descending: bool,
         limit: int,
         sort_by: str,
+        embedding: List[float] | None = None,
     ): ...
     @abstractmethod
     def vector_search_edge(
@@ -44,12 +57,23 @@ class VectorStore(ABC, metaclass=abc.ABCMeta):
         descending: bool,
         limit: int,
         sort_by: str,
+        embedding: List[float] | None = None,
     ): ...
     @abstractmethod
     def vector_search_node_from_multi_db(
-        self, data: Dict, *, threshold: float, limit: int
+        self,
+        data: Dict,
+        *,
+        threshold: float,
+        limit: int,
+        embedding: List[float] | None = None,
     ): ...
     @abstractmethod
     def vector_search_edge_from_multi_db(
-        self, data: Dict, *, threshold: float, limit: int
+        self,
+        data: Dict,
+        *,
+        threshold: float,
+        limit: int,
+        embedding: List[float] | None = None,
     ): ...
@@ -22,6 +22,9 @@ class VliteVSS(VectorStore):
     def add_edge_embedding(
         self, source: Any, target: Any, label: str, attributes: Dict
     ) -> None: ...
+    def add_node_embeddings(
+        self, ids: List[Any], labels: List[str], attributes: List[Dict]
+    ): ...
     def add_edge_embeddings(
         self,
         sources: List[Any],
@@ -31,6 +34,8 @@ class VliteVSS(VectorStore):
     ): ...
     def delete_node_embedding(self, ids: Any) -> None: ...
     def delete_edge_embedding(self, ids: Any) -> None: ...
+    def delete_node_embeddings(self, embed_ids: List[int]) -> None: ...
+    def delete_edge_embeddings(self, embed_ids: List[int]) -> None: ...
     def vector_search_node(
         self,
         data: Dict,
@@ -39,6 +44,7 @@ class VliteVSS(VectorStore):
         descending: bool,
         limit: int,
         sort_by: str,
+        embedding: List[float] | None = None,
     ): ...
     def vector_search_edge(
         self,
@@ -48,10 +54,21 @@ class VliteVSS(VectorStore):
         descending: bool,
         limit: int,
         sort_by: str,
+        embedding: List[float] | None = None,
     ): ...
     def vector_search_node_from_multi_db(
-        self, data: Dict, *, threshold: float | None = None, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: float | None = None,
+        limit: int = 1,
+        embedding: List[float] | None = None,
     ): ...
     def vector_search_edge_from_multi_db(
-        self, data: Dict, *, threshold: float | None = None, limit: int = 1
+        self,
+        data: Dict,
+        *,
+        threshold: float | None = None,
+        limit: int = 1,
+        embedding: List[float] | None = None,
     ): ...
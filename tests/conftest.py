@@ -1,5 +1,7 @@
+import hashlib
 import json
 import pytest
+import sqlite_vss  # type: ignore
 from unittest.mock import patch, Mock
 import fhir.resources as fhir  # type: ignore
 
@@ -11,6 +13,10 @@ from personal_graph import (
     EdgeInput,
     OpenAIEmbeddingsModel,
 )
+from personal_graph.clients import EmbeddingClient
+from personal_graph.database import SQLite
+from personal_graph.embeddings import EmbeddingsModel
+from personal_graph.vector_store import SQLiteVSS
 
 
 @pytest.fixture
@@ -76,6 +82,53 @@ def mock_embeddings_model():
         yield mock_embeddings_model
 
 
+class HashEmbeddingsModel(EmbeddingsModel):
+    """Offline embeddings, derived from the SHA-256 of the text"""
+
+    def __init__(self, dimension: int = 8):
+        self.dimension = dimension
+
+    def get_embedding(self, text):
+        digest = hashlib.sha256(text.encode()).digest()
+        return [byte / 255 for byte in digest[: self.dimension]]
+
+
+class HashEmbeddingClient(EmbeddingClient):
+    def __init__(self):
+        self.model = HashEmbeddingsModel()
+
+    def _create_default_client(self):
+        return None
+
+    def get_embedding_model(self):
+        return self.model
+
+
+@pytest.fixture
+def make_sqlite_graph():
+    """Build GraphDBs on real in-memory SQLite databases with sqlite-vss"""
+
+    def _make_sqlite_graph():
+        database = SQLite(
+            vector0_so_path=sqlite_vss.vector_loadable_path(),
+            vss0_so_path=sqlite_vss.vss_loadable_path(),
+        )
+        vector_store = SQLiteVSS(
+            db=database, index_dimension=8, embedding_client=HashEmbeddingClient()
+        )
+        return GraphDB(
+            vector_store=vector_store, database=database, graph_generator=None
+        )
+
+    return _make_sqlite_graph
+
+
+@pytest.fixture
+def sqlite_graph(make_sqlite_graph):
+    """A GraphDB on a real in-memory SQLite database with sqlite-vss"""
+    yield make_sqlite_graph()
+
+
 @pytest.fixture
 def graph(mock_openai_client, mock_embeddings_model):
     with patch("openai.OpenAI", return_value=mock_openai_client):
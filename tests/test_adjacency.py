@@ -0,0 +1,55 @@
+import threading
+
+from personal_graph.adjacency import AdjacencyIndex
+
+
+def test_adjacency_index():
+    index = AdjacencyIndex(lambda: [("1", "2"), ("2", "3"), ("3", "4")])
+    index.add_edge("4", "5")
+
+    assert index.neighbors("2") == ["3"]
+    assert index.neighbors("2", direction="both") == ["3", "1"]
+    assert index.degree("4", direction="both") == 2
+    assert index.bfs("1", max_depth=2) == {"1": 0, "2": 1, "3": 2}
+    assert list(index.bfs("1", "5")) == ["1", "2", "3", "4", "5"]
+
+    index.remove_node("3")
+    assert list(index.bfs("1")) == ["1", "2"]
+
+    index.compact()
+    assert index.edge_count == 2
+
+
+def test_adjacency_index_concurrent_updates():
+    edges = [(str(i), str(i + 1)) for i in range(200)]
+    index = AdjacencyIndex(lambda: edges, compact_threshold=8)
+    errors = []
+
+    def write(offset):
+        try:
+            for i in range(offset, 200, 4):
+                index.add_edge(str(i), f"x{i}")
+                if i % 3 == 0:
+                    index.remove_node(f"x{i}")
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        try:
+            for i in range(300):
+                index.bfs(str(i % 200), max_depth=3)
+                index.neighbors(str(i % 200), direction="both")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(offset,)) for offset in range(4)]
+    threads += [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    for i in range(200):
+        expected = [str(i + 1)] + ([] if i % 3 == 0 else [f"x{i}"])
+        assert index.neighbors(str(i)) == expected
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from personal_graph.database.allocator import IdAllocator
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:", isolation_level=None)
+    connection.execute("CREATE TABLE nodes (embed_id INTEGER)")
+    connection.executemany(
+        "INSERT INTO nodes (embed_id) VALUES (?)", [(i,) for i in range(1, 11)]
+    )
+    yield connection
+    connection.close()
+
+
+def sequence(connection, name="nodes.embed_id"):
+    return connection.execute(
+        "SELECT value FROM id_sequences WHERE name = ?", (name,)
+    ).fetchone()[0]
+
+
+def test_next_id_reserves_blocks(connection):
+    ids = IdAllocator(block_size=4)
+    cursor = connection.cursor()
+
+    # Seeded from the existing MAX, then one UPDATE per block of four ids
+    assert [ids.next_id(cursor, "nodes") for _ in range(4)] == [11, 12, 13, 14]
+    assert sequence(connection) == 14
+    assert ids.next_id(cursor, "nodes") == 15
+    assert sequence(connection) == 18
+
+    # Another allocator on the same database continues after the reserved blocks
+    other = IdAllocator(block_size=4)
+    assert other.next_id(cursor, "nodes") == 19
+    assert ids.next_id(cursor, "nodes") == 16
+
+    with pytest.raises(ValueError):
+        IdAllocator(block_size=0)
+
+
+def test_reserve(connection):
+    ids = IdAllocator(block_size=4)
+    cursor = connection.cursor()
+
+    assert ids.next_id(cursor, "nodes") == 11
+    assert ids.reserve(cursor, "nodes", count=3) == range(15, 18)
+    assert ids.reserve(cursor, "nodes", count=0) == range(0)
+    assert sequence(connection) == 17
+
+    # The block handed out before the reservation is still used up first
+    assert ids.next_id(cursor, "nodes") == 12
+
+
+def test_release(connection):
+    ids = IdAllocator(block_size=4)
+    cursor = connection.cursor()
+
+    assert ids.next_id(cursor, "nodes") == 11
+    ids.release("nodes", 11)
+    assert ids.next_id(cursor, "nodes") == 11
+
+    # Only the id handed out last can be taken back
+    assert ids.next_id(cursor, "nodes") == 12
+    ids.release("nodes", 11)
+    assert ids.next_id(cursor, "nodes") == 13
+    ids.release("edges", 13)
+    assert ids.next_id(cursor, "nodes") == 14
+
+
+def test_reset_after_rollback(connection):
+    ids = IdAllocator(block_size=4)
+    cursor = connection.cursor()
+    assert ids.next_id(cursor, "nodes") == 11
+
+    connection.execute("BEGIN")
+    assert [ids.next_id(cursor, "nodes") for _ in range(4)] == [12, 13, 14, 15]
+    assert sequence(connection) == 18
+    connection.execute("ROLLBACK")
+    assert sequence(connection) == 14
+
+    # The rolled back block 15..18 is no longer reserved, so it is reserved again
+    ids.reset()
+    assert ids.next_id(cursor, "nodes") == 15
+    assert sequence(connection) == 18
@@ -2,11 +2,27 @@
 Unit test for high level apis
 """
 
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from unittest.mock import patch
+
 import networkx as nx  # type: ignore
 import pytest
+import sqlean  # type: ignore
 from fhir.resources import fhirtypes  # type: ignore
 
-from personal_graph import GraphDB, Node, EdgeInput, KnowledgeGraph
+from personal_graph import (
+    AsyncGraphDB,
+    Edge,
+    EdgeInput,
+    GraphDB,
+    KnowledgeGraph,
+    Node,
+)
+from personal_graph.database import ConnectionSettings, FhirDB, SQLite
 from personal_graph.ml import networkx_to_pg, pg_to_networkx
 from personal_graph.text import text_to_graph
 
@@ -37,6 +53,15 @@ def test_add_nodes(graph, mock_db_connection_and_cursor):
     assert graph.add_nodes(nodes) is None
 
 
+def test_add_nodes_bulk(graph, mock_db_connection_and_cursor):
+    nodes = [
+        Node(id=1, label="Person", attributes={"name": "Alice", "age": "30"}),
+        Node(id=2, label="Person", attributes={"name": "Bob", "age": "25"}),
+    ]
+
+    assert graph.add_nodes(nodes, bulk=True) is not None
+
+
 def test_add_edge(graph, mock_db_connection_and_cursor):
     node1 = Node(
         id=3,
@@ -85,12 +110,159 @@ def test_add_edges(graph, mock_db_connection_and_cursor):
     assert graph.add_edges([edge1, edge2, edge3]) is None
 
 
+def test_transaction(sqlite_graph):
+    node1 = Node(id=1, label="Person", attributes={"name": "Alice", "age": "30"})
+    node2 = Node(id=2, label="Person", attributes={"name": "Bob", "age": "25"})
+    node3 = Node(id=3, label="Person", attributes={"name": "Carol", "age": "41"})
+    edge = EdgeInput(
+        source=node1, target=node2, label="KNOWS", attributes={"since": "2015"}
+    )
+
+    with sqlite_graph.transaction():
+        assert sqlite_graph.add_nodes([node1, node2]) is None
+        assert sqlite_graph.add_edge(edge) is None
+
+    sqlite_graph.build_adjacency_index()
+
+    def counts():
+        return sqlite_graph.db.read(
+            lambda cursor, _: cursor.execute(
+                "SELECT (SELECT count(*) FROM nodes), (SELECT count(*) FROM edges),"
+                " (SELECT count(*) FROM nodes_embedding),"
+                " (SELECT count(*) FROM relationship_embedding)"
+            ).fetchone()
+        )
+
+    assert counts() == (2, 1, 2, 1)
+
+    with pytest.raises(RuntimeError):
+        with sqlite_graph.transaction():
+            sqlite_graph.add_node(node3)
+            sqlite_graph.add_edge(
+                EdgeInput(source=node2, target=node3, label="KNOWS", attributes={})
+            )
+            assert sqlite_graph.traverse("1") == ["1", "2", "3"]
+            raise RuntimeError("abort")
+
+    assert counts() == (2, 1, 2, 1)
+    assert sqlite_graph.search_node("3") is None
+    assert sqlite_graph.traverse("1") == ["1", "2"]
+
+    # Node embed ids and vector rowids are still allocated in step after the rollback
+    sqlite_graph.add_node(node3)
+    assert counts() == (3, 1, 3, 1)
+    (embed_id,) = sqlite_graph.db.fetch_node_embed_id("3")
+    assert sqlite_graph.db.read(
+        lambda cursor, _: cursor.execute(
+            "SELECT rowid FROM nodes_embedding WHERE rowid = ?", (embed_id,)
+        ).fetchall()
+    ) == [(embed_id,)]
+
+
+def test_metrics(sqlite_graph):
+    calls = []
+    metrics = sqlite_graph.enable_metrics(
+        callback=lambda op, elapsed, components, error: calls.append((op, error))
+    )
+    alice = Node(id=1, attributes={"name": "Alice", "age": "30"}, label="relative")
+    bob = Node(id=2, attributes={"name": "Bob", "age": "25"}, label="relative")
+
+    assert sqlite_graph.add_node(alice) is None
+    assert sqlite_graph.add_nodes([bob]) is None
+    assert sqlite_graph.search_node("1") is not None
+    with pytest.raises(ValueError):
+        sqlite_graph.create_attribute_index("age') --")
+
+    # Nested calls are recorded under their own name before the outer one
+    assert calls == [
+        ("insert_node", False),
+        ("add_node", False),
+        ("insert_node", False),
+        ("add_node", False),
+        ("add_nodes", False),
+        ("search_node", False),
+        ("create_attribute_index", True),
+    ]
+
+    stats = metrics.stats()
+    assert {op: (entry["count"], entry["errors"]) for op, entry in stats.items()} == {
+        "insert_node": (2, 0),
+        "add_node": (2, 0),
+        "add_nodes": (1, 0),
+        "search_node": (1, 0),
+        "create_attribute_index": (1, 1),
+    }
+    add_node = stats["add_node"]
+    assert add_node["components"]["db"] > 0
+    assert add_node["components"]["embedding"] > 0
+    assert add_node["components"]["generator"] == 0
+    assert sum(add_node["components"].values()) <= add_node["total"] + 1e-9
+    assert add_node["buckets"][float("inf")] == 2
+    assert stats["search_node"]["components"]["embedding"] == 0
+
+    prometheus = metrics.to_prometheus()
+    assert 'personal_graph_operation_duration_seconds_count{op="add_node"} 2' in (
+        prometheus
+    )
+    assert (
+        'personal_graph_operation_errors_total{op="create_attribute_index"} 1'
+        in prometheus
+    )
+
+    sqlite_graph.disable_metrics()
+    sqlite_graph.search_node("1")
+    assert metrics.stats()["search_node"]["count"] == 1
+    assert len(calls) == 7
+
+
 def test_update_node(graph, mock_db_connection_and_cursor):
     node = Node(id=1, attributes={"name": "Alice", "age": "30"}, label="relative")
 
     assert graph.update_node(node) is None
 
 
+def test_update_node_unchanged(sqlite_graph):
+    model = sqlite_graph.vector_store.embedding_model
+    node = Node(id=1, attributes={"name": "Alice", "age": "30"}, label="relative")
+    sqlite_graph.add_node(node)
+
+    with patch.object(model, "get_embedding", wraps=model.get_embedding) as spy:
+        assert sqlite_graph.update_node(node) is None
+        assert spy.call_count == 0
+
+        changed = Node(
+            id=1, attributes={"name": "Alice", "age": "31"}, label="relative"
+        )
+        assert sqlite_graph.update_node(changed) is None
+        assert spy.call_count == 1
+
+        assert sqlite_graph.update_node(changed) is None
+        assert spy.call_count == 1
+
+
+def test_insert_edge_unchanged(sqlite_graph):
+    model = sqlite_graph.vector_store.embedding_model
+    alice = Node(id="1", attributes={"name": "Alice"}, label="person")
+    bob = Node(id="2", attributes={"name": "Bob"}, label="person")
+    sqlite_graph.add_nodes([alice, bob])
+    edge = EdgeInput(source=alice, target=bob, label="knows", attributes={"y": 1})
+    sqlite_graph.insert_edge(edge)
+    embed_id = sqlite_graph.db.search_edge("1", "2", {"y": 1})
+
+    with patch.object(model, "get_embedding", wraps=model.get_embedding) as spy:
+        sqlite_graph.insert_edge(edge)
+        sqlite_graph.add_edges([edge], bulk=True)
+        assert spy.call_count == 0
+        assert sqlite_graph.db.search_edge("1", "2", {"y": 1}) == embed_id
+
+        relabelled = EdgeInput(
+            source=alice, target=bob, label="likes", attributes={"y": 1}
+        )
+        sqlite_graph.insert_edge(relabelled)
+        assert spy.call_count == 1
+        assert sqlite_graph.db.search_edge("1", "2", {"y": 1}) != embed_id
+
+
 def test_update_nodes(graph, mock_db_connection_and_cursor):
     nodes = [
         Node(id=1, attributes={"name": "Peri", "age": "90"}, label="relative"),
@@ -108,12 +280,697 @@ def test_remove_nodes(graph, mock_db_connection_and_cursor):
     assert graph.remove_node([1, 6, 8]) is None
 
 
+def test_remove_nodes_bulk(sqlite_graph):
+    alice = Node(id="1", label="Person", attributes={"name": "Alice"})
+    bob = Node(id="2", label="Person", attributes={"name": "Bob"})
+    carol = Node(id="3", label="Person", attributes={"name": "Carol"})
+    sqlite_graph.add_nodes([alice, bob, carol])
+    sqlite_graph.add_edges(
+        [
+            EdgeInput(source=alice, target=bob, label="knows", attributes={}),
+            EdgeInput(source=bob, target=carol, label="knows", attributes={}),
+        ]
+    )
+
+    assert sqlite_graph.remove_nodes(["1", "2"]) is None
+
+    def rows(sql):
+        return sqlite_graph.db.read(lambda cursor, _: cursor.execute(sql).fetchall())
+
+    assert rows("SELECT id FROM nodes") == [("3",)]
+    assert rows("SELECT source, target FROM edges") == []
+    assert len(rows("SELECT rowid FROM nodes_embedding")) == 1
+    assert rows("SELECT rowid FROM relationship_embedding") == []
+    assert rows("SELECT kind, count(*) FROM embedding_hashes GROUP BY kind") == [
+        ("node", 1)
+    ]
+
+
 def test_search_node(graph, mock_db_connection_and_cursor):
     assert graph.search_node(1) is not None
 
 
-def test_traverse(graph, mock_db_connection_and_cursor):
-    assert graph.traverse(1, 2) is not None
+def test_all_connected_nodes_batch(sqlite_graph):
+    # hub -> leaf0..leaf4, parent -> spoke, and island with no edges
+    nodes = {
+        id: Node(id=id, label="Person", attributes={})
+        for id in ["hub", "parent", "spoke", "island"] + [f"leaf{i}" for i in range(5)]
+    }
+    sqlite_graph.add_nodes(list(nodes.values()), bulk=True)
+    sqlite_graph.add_edges(
+        [
+            EdgeInput(
+                source=nodes["hub"],
+                target=nodes[f"leaf{i}"],
+                label="has",
+                attributes={},
+            )
+            for i in range(5)
+        ]
+        + [
+            EdgeInput(
+                source=nodes["parent"],
+                target=nodes["spoke"],
+                label="has",
+                attributes={},
+            )
+        ],
+        bulk=True,
+    )
+    seeds = [nodes["hub"], nodes["spoke"], nodes["island"]]
+
+    def connected(seeds, limit=None):
+        return sorted(
+            node.id for node in sqlite_graph.db.all_connected_nodes_batch(seeds, limit)
+        )
+
+    leaves = [f"leaf{i}" for i in range(5)]
+    assert connected(seeds) == sorted(["hub", "parent", "spoke"] + leaves)
+
+    # The cap is per seed: the hub keeps two leaves and the spoke still keeps its parent
+    capped = connected(seeds, 2)
+    assert sorted(set(capped) - set(leaves)) == ["hub", "parent", "spoke"]
+    assert len(set(capped) & set(leaves)) == 2
+    assert connected(seeds, 0) == ["hub", "spoke"]
+
+    # An edge seeds both of its endpoints, and shared neighbours come back once
+    edge = Edge(source="parent", target="spoke", label="has", attributes={})
+    assert connected([edge, nodes["spoke"]], 1) == ["parent", "spoke"]
+    assert connected([nodes["leaf0"], nodes["leaf1"]]) == ["hub", "leaf0", "leaf1"]
+
+
+def add_path_graph(graph):
+    """a -> b -> c -> d, all labelled knows, plus a -> x labelled likes"""
+    nodes = {id: Node(id=id, label="Person", attributes={}) for id in "abcdx"}
+    graph.add_nodes(list(nodes.values()))
+    for source, target, label in [
+        ("a", "b", "knows"),
+        ("b", "c", "knows"),
+        ("c", "d", "knows"),
+        ("a", "x", "likes"),
+    ]:
+        graph.add_edge(
+            EdgeInput(
+                source=nodes[source], target=nodes[target], label=label, attributes={}
+            )
+        )
+
+
+def test_traverse(sqlite_graph):
+    add_path_graph(sqlite_graph)
+
+    assert sqlite_graph.traverse("a") == ["a", "b", "x", "c", "d"]
+    assert sqlite_graph.traverse("a", "c") == ["a", "b", "x", "c"]
+    assert sqlite_graph.traverse("d") == ["d"]
+
+
+def test_traverse_with_options(sqlite_graph):
+    add_path_graph(sqlite_graph)
+
+    assert sqlite_graph.traverse("a", max_depth=1) == ["a", "b", "x"]
+    assert sqlite_graph.traverse("a", max_depth=0) == ["a"]
+    assert sqlite_graph.traverse("c", direction="in") == ["c", "b", "a"]
+    assert sqlite_graph.traverse("b", direction="both", max_depth=1) == [
+        "b",
+        "a",
+        "c",
+    ]
+    assert sqlite_graph.traverse("a", edge_labels=["likes"]) == ["a", "x"]
+    assert sqlite_graph.traverse("a", edge_labels=["knows"]) == ["a", "b", "c", "d"]
+    assert sqlite_graph.traverse("a", limit=2) == ["a", "b"]
+    assert sqlite_graph.traverse(
+        "a", max_depth=2, direction="out", edge_labels=["knows"], limit=10
+    ) == ["a", "b", "c"]
+
+
+def test_statement_registry():
+    db = SQLite()
+    statements = db.statements
+
+    query = db._find_neighbors(with_bodies=True)
+    assert (statements.hits, statements.misses) == (0, 1)
+
+    assert db._find_neighbors(with_bodies=True) is query
+    assert (statements.hits, statements.misses) == (1, 1)
+    assert len(statements) == 1
+    assert (
+        "traverse.template",
+        (
+            ("depth_limited", False),
+            ("inbound", True),
+            ("label_filtered", False),
+            ("limited", False),
+            ("outbound", True),
+            ("with_bodies", True),
+        ),
+    ) in statements.statements()
+
+
+def test_shortest_path(sqlite_graph):
+    add_path_graph(sqlite_graph)
+
+    path = sqlite_graph.shortest_path("a", "d", max_depth=3)
+    assert [node.id for node in path.nodes] == ["a", "b", "c", "d"]
+    assert [(edge.source, edge.target, edge.label) for edge in path.edges] == [
+        ("a", "b", "knows"),
+        ("b", "c", "knows"),
+        ("c", "d", "knows"),
+    ]
+
+    # Edges are followed backwards by default, but keep their stored direction
+    path = sqlite_graph.shortest_path("x", "b")
+    assert [node.id for node in path.nodes] == ["x", "a", "b"]
+    assert [(edge.source, edge.target) for edge in path.edges] == [
+        ("a", "x"),
+        ("a", "b"),
+    ]
+
+    assert sqlite_graph.shortest_path("a", "d", max_depth=2) == KnowledgeGraph()
+    assert sqlite_graph.shortest_path("d", "a", direction="out") == KnowledgeGraph()
+
+
+def test_k_hop(sqlite_graph):
+    add_path_graph(sqlite_graph)
+
+    assert sqlite_graph.k_hop("a", 2, direction="out") == {
+        "a": 0,
+        "b": 1,
+        "x": 1,
+        "c": 2,
+    }
+    assert sqlite_graph.k_hop("c", 5, direction="in") == {"c": 0, "b": 1, "a": 2}
+    assert sqlite_graph.k_hop("b", 1) == {"b": 0, "a": 1, "c": 1}
+    assert sqlite_graph.neighbors("a") == ["b", "x"]
+
+
+def test_create_attribute_index():
+    db = SQLite()
+    db.initialize()
+    db.add_node("Event", {"date": "2024-01-01"}, "1")
+
+    assert db.create_attribute_index("date") == "attr_idx_date"
+    assert db.attribute_indexes() == ["date"]
+
+    indexes = db.read(
+        lambda cursor, _: cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ).fetchall()
+    )
+    assert ("attr_idx_date",) in indexes
+
+    sql, bindings = db.query().where("date", "=", "2024-01-01").compile()
+    plan = db.read(
+        lambda cursor, _: cursor.execute(
+            f"EXPLAIN QUERY PLAN {sql}", bindings
+        ).fetchall()
+    )
+    assert any("attr_idx_date" in detail for *_, detail in plan)
+
+    with pytest.raises(ValueError):
+        db.create_attribute_index("date') ; DROP TABLE nodes; --")
+
+
+BASELINE_SCHEMA = """
+CREATE TABLE nodes (
+    embed_id INT NOT NULL UNIQUE,
+    label TEXT,
+    attributes JSON,
+    id   TEXT GENERATED ALWAYS AS (json_extract(attributes, '$.id')) VIRTUAL NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX id_idx ON nodes(id);
+CREATE TABLE edges (
+    embed_id INTEGER NOT NULL UNIQUE,
+    source     TEXT,
+    target     TEXT,
+    label TEXT,
+    attributes JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(source, target, attributes) ON CONFLICT REPLACE,
+    FOREIGN KEY(source) REFERENCES nodes(id) ON DELETE CASCADE,
+    FOREIGN KEY(target) REFERENCES nodes(id) ON DELETE CASCADE
+);
+CREATE INDEX source_idx ON edges(source);
+CREATE INDEX target_idx ON edges(target);
+INSERT INTO nodes (embed_id, label, attributes) VALUES
+    (1, 'Person', '{"id": "1", "name": "Alice"}'),
+    (2, 'Person', '{"id": "2", "name": "Bob"}');
+INSERT INTO edges (embed_id, source, target, label, attributes) VALUES
+    (1, '1', '2', 'knows', '{}');
+"""
+
+
+def test_migrate_baseline_schema(tmp_path):
+    path = str(tmp_path / "graph.db")
+    connection = sqlite3.connect(path)
+    connection.executescript(BASELINE_SCHEMA)
+    assert connection.execute("PRAGMA user_version").fetchone() == (0,)
+    connection.close()
+
+    db = SQLite(use_in_memory=False, local_path=path)
+    assert db.initialize() == 3
+    assert db.schema_version() == 3
+
+    def rows(sql):
+        return db.read(lambda cursor, _: cursor.execute(sql).fetchall())
+
+    indexes = {
+        name for (name,) in rows("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    assert {"label_idx", "source_target_label_idx", "target_source_idx"} <= indexes
+    assert not {"source_idx", "target_idx"} & indexes
+
+    # hidden is 3 for a STORED generated column, 2 for a VIRTUAL one
+    columns = {row[1]: row[6] for row in rows("PRAGMA table_xinfo(nodes)")}
+    assert columns["id"] == 3
+
+    # The rebuild of nodes keeps its rows, and does not cascade to the edges
+    assert rows("SELECT embed_id, id FROM nodes ORDER BY embed_id") == [
+        (1, "1"),
+        (2, "2"),
+    ]
+    assert rows("SELECT source, target, label FROM edges") == [("1", "2", "knows")]
+
+    assert rows("SELECT key, name FROM attribute_indexes") == []
+    assert db.create_attribute_index("name") == "attr_idx_name"
+
+    # Existing nodes are backfilled into the full-text index
+    assert [row[0] for row in db.text_search("bob")] == ["2"]
+    rows("INSERT INTO nodes_fts (nodes_fts, rank) VALUES ('integrity-check', 0)")
+
+    db.add_node("Person", {"name": "Carol"}, "3")
+    assert [row[0] for row in db.text_search("carol")] == ["3"]
+
+    # Opening the upgraded database again applies nothing
+    reopened = SQLite(use_in_memory=False, local_path=path)
+    assert reopened.initialize() == 3
+    assert reopened.attribute_indexes() == ["name"]
+
+
+def test_query(sqlite_graph):
+    # Ranks 0..9 in the order n0, n3, n6, n9, n2, n5, n8, n1, n4, n7
+    nodes = [
+        Node(id=f"n{i}", label="Event", attributes={"rank": i * 7 % 10, "day": i})
+        for i in range(10)
+    ]
+    nodes.append(Node(id="unranked", label="Event", attributes={"day": 99}))
+    sqlite_graph.add_nodes(nodes, bulk=True)
+
+    def page_ids(query):
+        return [[row[1] for row in page] for page in query.pages()]
+
+    query = sqlite_graph.query(page_size=3).where("day", "<", 50).order_by("rank")
+    assert page_ids(query) == [
+        ["n0", "n3", "n6"],
+        ["n9", "n2", "n5"],
+        ["n8", "n1", "n4"],
+        ["n7"],
+    ]
+
+    # Missing keys sort first ascending and last descending
+    query = sqlite_graph.query(page_size=4).order_by("rank")
+    assert [node.id for node in query][:2] == ["unranked", "n0"]
+    query = sqlite_graph.query(page_size=4).order_by("rank", desc=True)
+    assert [node.id for node in query][-2:] == ["n0", "unranked"]
+
+    query = sqlite_graph.query(page_size=3).order_by("rank", desc=True).limit(5)
+    assert page_ids(query) == [["n7", "n4", "n1"], ["n8", "n5"]]
+    assert [node.id for node in query.where("rank", ">=", 8)] == ["n7", "n4"]
+
+    # A short page ends the scan; a full last page costs one more empty read
+    with patch.object(sqlite_graph.db, "read", wraps=sqlite_graph.db.read) as spy:
+        query = sqlite_graph.query(page_size=4).where("day", "<", 8)
+        assert page_ids(query) == [["n0", "n1", "n2", "n3"], ["n4", "n5", "n6", "n7"]]
+        assert spy.call_count == 3
+
+        spy.reset_mock()
+        assert sqlite_graph.query(page_size=4).where("day", "<", 6).first().id == "n0"
+        assert spy.call_count == 1
+
+
+def test_iter_nodes_and_edges(sqlite_graph):
+    nodes = [
+        Node(id=f"n{i:02d}", label="Person", attributes={"rank": i}) for i in range(25)
+    ]
+    sqlite_graph.add_nodes(nodes, bulk=True)
+    sqlite_graph.add_edges(
+        [
+            EdgeInput(source=source, target=target, label="knows", attributes={})
+            for source, target in zip(nodes, nodes[1:])
+        ],
+        bulk=True,
+    )
+
+    streamed = list(sqlite_graph.iter_nodes(batch_size=10))
+    assert [id for id, _, _ in streamed] == [node.id for node in nodes]
+    assert streamed[3] == ("n03", "Person", {"rank": 3, "id": "n03"})
+
+    edges = list(sqlite_graph.iter_edges(batch_size=10, decode=False))
+    assert [(source, target) for source, target, _, _ in edges] == [
+        (f"n{i:02d}", f"n{i + 1:02d}") for i in range(24)
+    ]
+    assert isinstance(edges[0][3], str)
+
+
+def test_iter_fhir_nodes_and_edges(tmp_path, monkeypatch):
+    monkeypatch.setenv("TURSO_PATIENTS_GROUP_AUTH_TOKEN", "")
+    db = FhirDB(db_url=str(tmp_path / "fhir.db"))
+    db.initialize()
+
+    ids = [f"p{i}" for i in range(5)]
+    for id in ids:
+        db.add_node("Patient", {"resourceType": "Patient", "id": id}, id)
+    for source, target in zip(ids, ids[1:]):
+        db.add_edge(source, target, "knows", {}, "Patient", "Patient")
+
+    with pytest.raises(ValueError):
+        list(db.iter_nodes(batch_size=2))
+
+    streamed = list(db.iter_nodes(batch_size=2, node_type="Patient"))
+    assert [id for id, _, _ in streamed] == ids
+    assert streamed[0] == ("p0", "Patient", {"resourceType": "Patient", "id": "p0"})
+
+    edges = list(db.iter_edges(batch_size=2))
+    assert [(source, target) for source, target, _, _ in edges] == list(
+        zip(ids, ids[1:])
+    )
+    assert db.fetch_edge_endpoints() == list(zip(ids, ids[1:]))
+
+
+def test_fhir_bulk_and_paths(tmp_path, monkeypatch):
+    monkeypatch.setenv("TURSO_PATIENTS_GROUP_AUTH_TOKEN", "")
+    db = FhirDB(db_url=str(tmp_path / "fhir.db"))
+    db.initialize()
+
+    patients = [
+        Node(
+            id=f"p{i}",
+            label="Patient",
+            attributes={"resourceType": "Patient", "id": f"p{i}"},
+        )
+        for i in range(4)
+    ]
+    assert db.add_nodes_bulk(patients + patients[:1]) == patients
+    assert db.add_nodes_bulk(patients) == []
+
+    edges = [
+        EdgeInput(source=source, target=target, label="knows", attributes={})
+        for source, target in zip(patients, patients[1:])
+    ]
+    missing = Node(id="p9", label="Patient", attributes={"resourceType": "Patient"})
+    dangling = EdgeInput(
+        source=patients[0], target=missing, label="knows", attributes={}
+    )
+    assert db.add_edges_bulk(edges + [dangling]) == edges
+    assert db.add_edges_bulk(edges) == []
+
+    assert db.k_hop("p0", 2) == {"p0": 0, "p1": 1, "p2": 2}
+    assert db.k_hop("p1", 3, direction="in") == {"p1": 0, "p0": 1}
+
+    path = db.shortest_path("p3", "p0")
+    assert [node.id for node in path.nodes] == ["p3", "p2", "p1", "p0"]
+    assert [(edge.source, edge.target) for edge in path.edges] == [
+        ("p2", "p3"),
+        ("p1", "p2"),
+        ("p0", "p1"),
+    ]
+    assert path.nodes[0] == patients[3]
+    assert db.shortest_path("p0", "p3", direction="in") == KnowledgeGraph()
+    assert db.shortest_path("p0", "p3", max_depth=2) == KnowledgeGraph()
+
+
+def test_text_search(graph, mock_db_connection_and_cursor):
+    assert graph.text_search("Alice", limit=5) is not None
+
+
+def test_text_search_values_only():
+    db = SQLite()
+    db.initialize()
+    db.add_node("Person", {"name": "Alice", "city": "Paris"}, "1")
+    db.add_node("Person", {"name": "Bob", "city": "Oslo"}, "2")
+    db.add_node("Place", {"name": "Oslo", "tags": ["fjord", "city"]}, "3")
+
+    # Key names are in every body; only values are indexed
+    assert db.text_search("name id") == []
+    assert [row[0] for row in db.text_search("city")] == ["3"]
+    assert sorted(row[0] for row in db.text_search("Oslo")) == ["2", "3"]
+    assert db.find_nodes_by_label("name", limit=10) == []
+
+    db.update_node(Node(id="2", label="Person", attributes={"city": "Bergen"}))
+    assert [row[0] for row in db.text_search("Oslo")] == ["3"]
+    assert [row[0] for row in db.text_search("Bergen")] == ["2"]
+
+    db.remove_node("3")
+    assert db.text_search("fjord") == []
+    db.read(
+        lambda cursor, _: cursor.execute(
+            "INSERT INTO nodes_fts (nodes_fts) VALUES ('integrity-check')"
+        )
+    )
+
+
+def test_upsert_edge(sqlite_graph):
+    db = sqlite_graph.db
+    alice = Node(id="1", label="Person", attributes={"name": "Alice"})
+    bob = Node(id="2", label="Person", attributes={"name": "Bob"})
+    carol = Node(id="3", label="Person", attributes={"name": "Carol"})
+    sqlite_graph.add_nodes([alice, bob])
+
+    def rows(sql):
+        return db.read(lambda cursor, _: cursor.execute(sql).fetchall())
+
+    # A duplicate edge or a missing endpoint gets neither a row nor a vector
+    edge = EdgeInput(source=alice, target=bob, label="knows", attributes={"y": 1})
+    sqlite_graph.add_edge(edge)
+    sqlite_graph.add_edge(edge)
+    sqlite_graph.add_edge(
+        EdgeInput(source=alice, target=carol, label="knows", attributes={})
+    )
+    assert rows("SELECT embed_id FROM edges") == [(1,)]
+    assert rows("SELECT rowid FROM relationship_embedding") == [(1,)]
+    assert rows("SELECT vector_rowid FROM embedding_hashes WHERE kind = 'edge'") == [
+        (1,)
+    ]
+
+    # The skipped ids are handed out again, so edges and vectors stay in step
+    sqlite_graph.add_node(carol)
+    sqlite_graph.add_edge(
+        EdgeInput(source=alice, target=carol, label="knows", attributes={})
+    )
+    assert rows("SELECT embed_id FROM edges ORDER BY embed_id") == [(1,), (2,)]
+    assert rows("SELECT rowid FROM relationship_embedding ORDER BY rowid") == [
+        (1,),
+        (2,),
+    ]
+
+    assert db.upsert_edge("1", "2", "knows", {"y": 1}) is None
+    assert db.upsert_edge("1", "2", "likes", {"y": 1}) is None
+    assert db.upsert_edge("1", "missing", "knows", {}) is None
+    assert db.upsert_edge("missing", "2", "knows", {}) is None
+    assert db.upsert_edge("2", "1", "knows", {}) == 3
+    assert db.search_edge("2", "1", {}) == 3
+
+
+def test_edge_text_search_duplicate_edge(sqlite_graph):
+    db = sqlite_graph.db
+    db.enable_edge_text_search()
+    alice = Node(id="1", label="Person", attributes={"name": "Alice"})
+    bob = Node(id="2", label="Person", attributes={"name": "Bob"})
+    sqlite_graph.add_nodes([alice, bob])
+    edge = EdgeInput(
+        source=alice, target=bob, label="plays", attributes={"game": "chess"}
+    )
+
+    sqlite_graph.add_edge(edge)
+    sqlite_graph.add_edge(edge)
+    assert [row[:3] for row in db.text_search_edges("chess")] == [("1", "2", "plays")]
+
+    # A plain insert replaces the existing row, and its index entry with it
+    db.add_edge("1", "2", "challenges", {"game": "chess"})
+    assert [row[:3] for row in db.text_search_edges("chess")] == [
+        ("1", "2", "challenges")
+    ]
+    assert db.text_search_edges("plays") == []
+    db.read(
+        lambda cursor, _: cursor.execute(
+            "INSERT INTO edges_fts (edges_fts) VALUES ('integrity-check')"
+        )
+    )
+
+
+def test_reader_pool(tmp_path):
+    db = SQLite(use_in_memory=False, local_path=str(tmp_path / "graph.db"), readers=2)
+    db.initialize()
+    db.add_node("Person", {"name": "Alice"}, "1")
+
+    assert db.search_node("1") is not None
+    assert db.readers is not None
+
+    with db.transaction():
+        db.add_node("Person", {"name": "Bob"}, "2")
+        assert db.search_node("2") is not None
+
+
+def test_connection_settings(tmp_path):
+    db = SQLite(use_in_memory=False, local_path=str(tmp_path / "graph.db"), readers=1)
+    db.initialize()
+
+    # SQLite reports the enum PRAGMAs by number: NORMAL is 1 and MEMORY is 2
+    assert db.pragmas() == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": 2,
+        "busy_timeout": 5000,
+    }
+
+    assert db.readers is not None
+    with db.readers.connection() as reader:
+        assert reader.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        assert reader.execute("PRAGMA cache_size").fetchone() == (-64000,)
+        assert reader.execute("PRAGMA query_only").fetchone() == (1,)
+        with pytest.raises(sqlean.OperationalError, match="readonly"):
+            reader.execute("DELETE FROM nodes")
+
+    settings = ConnectionSettings(
+        journal_mode="DELETE", synchronous="FULL", cache_size=-2000, busy_timeout=100
+    )
+    db = SQLite(
+        use_in_memory=False, local_path=str(tmp_path / "other.db"), settings=settings
+    )
+    db.initialize()
+    pragmas = db.pragmas()
+    assert pragmas["journal_mode"] == "delete"
+    assert pragmas["synchronous"] == 2
+    assert pragmas["cache_size"] == -2000
+    assert pragmas["busy_timeout"] == 100
+
+
+def test_snapshot(tmp_path, sqlite_graph, make_sqlite_graph):
+    add_path_graph(sqlite_graph)
+    path = str(tmp_path / "snapshot.db")
+    sqlite_graph.snapshot(path)
+
+    restored = make_sqlite_graph()
+    restored.load_snapshot(path)
+    assert restored.search_node("a") == sqlite_graph.search_node("a")
+    assert restored.traverse("a") == ["a", "b", "x", "c", "d"]
+
+    # The vss0 indexes come back with the snapshot and answer the same searches
+    for graph in (sqlite_graph, restored):
+        assert graph.db.read(
+            lambda cursor, _: cursor.execute(
+                "SELECT (SELECT count(*) FROM nodes_embedding),"
+                " (SELECT count(*) FROM relationship_embedding)"
+            ).fetchone()
+        ) == (5, 4)
+    assert restored._similarity_search_node("c", threshold=100, limit=5) == (
+        sqlite_graph._similarity_search_node("c", threshold=100, limit=5)
+    )
+    result = restored.search_from_graph("c", threshold=100, limit=2)
+    assert result == sqlite_graph.search_from_graph("c", threshold=100, limit=2)
+    assert len(result.nodes) >= 2 and len(result.edges) == 2
+
+
+def test_snapshot_with_active_writer(tmp_path, sqlite_graph, make_sqlite_graph):
+    add_path_graph(sqlite_graph)
+    carol = Node(id="carol", label="Person", attributes={"name": "Carol"})
+    path = str(tmp_path / "snapshot.db")
+    started, finish = threading.Event(), threading.Event()
+
+    def write():
+        with sqlite_graph.transaction():
+            sqlite_graph.add_node(carol)
+            started.set()
+            finish.wait()
+
+    def write_more():
+        for i in range(20):
+            sqlite_graph.add_node(Node(id=f"w{i}", label="Person", attributes={}))
+
+    db = sqlite_graph.db
+    with patch.object(db, "_yield_to_writers", wraps=db._yield_to_writers) as spy:
+        writer = threading.Thread(target=write)
+        writer.start()
+        started.wait()
+
+        # The snapshot waits for the open transaction, then copies a page at a time
+        # while more writes go through between its steps
+        snapshot = threading.Thread(
+            target=db.snapshot, args=(path,), kwargs={"pages": 1}
+        )
+        snapshot.start()
+        finish.set()
+        writer.join()
+        more = threading.Thread(target=write_more)
+        more.start()
+        snapshot.join()
+        more.join()
+
+    assert spy.call_count > 0
+    assert not os.path.exists(f"{path}.partial")
+
+    restored = make_sqlite_graph()
+    restored.load_snapshot(path)
+    assert restored.search_node("carol") is not None
+
+    # Each write landed in the copy whole, with its vector, or not at all
+    nodes, vectors = restored.db.read(
+        lambda cursor, _: cursor.execute(
+            "SELECT (SELECT count(*) FROM nodes), (SELECT count(*) FROM nodes_embedding)"
+        ).fetchone()
+    )
+    assert 6 <= nodes <= 26 and nodes == vectors
+    assert restored.db.read(
+        lambda cursor, _: cursor.execute("PRAGMA integrity_check").fetchall()
+    ) == [("ok",)]
+    assert len(restored._similarity_search_node("carol", threshold=100, limit=30)) == (
+        nodes
+    )
+
+
+def test_profiling():
+    db = SQLite()
+    db.initialize()
+    db.enable_profiling(slow_threshold=0)
+    db.add_node("Person", {"name": "Alice"}, "1")
+
+    assert db.search_node("1") is not None
+    assert db.search_node("2") is None
+
+    stats = db.stats()
+    search = stats["SELECT attributes -- id|body FROM nodes WHERE id = ?"]
+    assert (search["count"], search["slow"]) == (2, 2)
+    assert search["plan"][0].startswith("SEARCH nodes USING INDEX")
+    assert search["max"] <= search["total"] and search["buckets"][float("inf")] == 2
+    assert (
+        stats["INSERT INTO nodes (embed_id, label, attributes) VALUES(? ,json(?))"][
+            "count"
+        ]
+        == 1
+    )
+    assert list(stats.values()) == sorted(
+        stats.values(), key=lambda entry: entry["total"], reverse=True
+    )
+
+    assert db.profiler is not None
+    slow = db.profiler.slow_queries()
+    assert [entry["params"] for entry in slow[-2:]] == [("1",), ("2",)]
+    assert slow[-1]["plan"] == search["plan"]
+
+    db.enable_profiling(slow_threshold=60)
+    db.search_node("1")
+    assert (
+        db.stats()["SELECT attributes -- id|body FROM nodes WHERE id = ?"]["slow"] == 0
+    )
+    assert db.profiler.slow_queries() == []
+
+    db.disable_profiling()
+    db.search_node("1")
+    assert db.stats() == {}
 
 
 def test_insert(
@@ -150,12 +1007,106 @@ def test_search_query(
     assert isinstance(result, KnowledgeGraph)
 
 
+def test_search_query_hybrid(sqlite_graph):
+    drugs = [
+        Node(id="1", label="Drug", attributes={"name": "aspirin"}),
+        Node(id="2", label="Drug", attributes={"name": "ibuprofen"}),
+        Node(id="3", label="Drug", attributes={"name": "aspirin aspirin tablet"}),
+        Node(id="4", label="Drug", attributes={"name": "naproxen"}),
+        Node(id="5", label="Drug", attributes={"name": "paracetamol"}),
+    ]
+    sqlite_graph.add_nodes(drugs)
+    sqlite_graph.add_edge(
+        EdgeInput(source=drugs[3], target=drugs[4], label="like", attributes={})
+    )
+    assert [node.id for node in sqlite_graph.text_search("aspirin")] == ["3", "1"]
+
+    # The vector ranking is 2, 1, 3 and the lexical ranking is 3, 1
+    vector_hits = [
+        (2, "2", "Drug", {"name": "ibuprofen"}, 0.1),
+        (1, "1", "Drug", {"name": "aspirin"}, 0.2),
+        (3, "3", "Drug", {"name": "aspirin aspirin tablet"}, 0.3),
+    ]
+    with patch.object(
+        sqlite_graph, "_similarity_search_node", return_value=vector_hits
+    ):
+        # With k = 1: 3 scores 1/4 + 1/2, 1 scores 1/3 + 1/3 and 2 scores 1/2
+        result = sqlite_graph.search_from_graph(
+            "aspirin", hybrid=True, limit=3, threshold=0, rrf_k=1
+        )
+        assert [node.id for node in result.nodes] == ["3", "1", "2"]
+        assert result.edges == []
+
+        result = sqlite_graph.search_from_graph(
+            "aspirin", hybrid=True, limit=2, threshold=0, rrf_k=1
+        )
+        assert [node.id for node in result.nodes] == ["3", "1"]
+
+        result = sqlite_graph.search_from_graph(
+            "aspirin", hybrid=True, limit=3, threshold=0, lexical_k=1, rrf_k=1
+        )
+        assert [node.id for node in result.nodes] == ["3", "2", "1"]
+
+
+def test_async_search_query(graph, mock_db_connection_and_cursor):
+    async def search():
+        async_graph = AsyncGraphDB(graph, max_workers=2)
+        return await async_graph.search_from_graph("Suffocation problem.")
+
+    assert isinstance(asyncio.run(search()), KnowledgeGraph)
+
+
+def test_async_adjacency_index(sqlite_graph):
+    nodes = [Node(id=str(i), label="Person", attributes={}) for i in range(40)]
+    sqlite_graph.add_nodes(nodes, bulk=True)
+    sqlite_graph.build_adjacency_index(compact_threshold=4)
+
+    async def interleave():
+        async_graph = AsyncGraphDB(sqlite_graph, max_workers=8)
+        writes = [
+            async_graph.add_edge(
+                EdgeInput(source=source, target=target, label="knows", attributes={})
+            )
+            for source, target in zip(nodes, nodes[1:])
+        ]
+        reads = [async_graph.traverse(str(i % 40), max_depth=3) for i in range(80)]
+        await asyncio.gather(*writes, *reads)
+
+    asyncio.run(interleave())
+    assert sqlite_graph.adjacency.edge_count == 39
+    assert sqlite_graph.traverse("0", max_depth=3) == ["0", "1", "2", "3"]
+
+
 def test_merge_by_similarity(graph, mock_db_connection_and_cursor):
     test_add_nodes(graph, mock_db_connection_and_cursor)
 
     assert graph.merge_by_similarity(threshold=0.9) is None
 
 
+def test_merge_by_similarity_visits_each_node_once(sqlite_graph):
+    # More nodes than one iter_nodes batch, so a rewritten node could come back
+    nodes = [Node(id=f"n{i}", label="Person", attributes={}) for i in range(1005)]
+    sqlite_graph.add_nodes(nodes, bulk=True)
+    sqlite_graph.add_edge(
+        EdgeInput(source=nodes[1], target=nodes[2], label="knows", attributes={})
+    )
+
+    searched = []
+
+    def similar(text, **kwargs):
+        node_id = json.loads(text)["id"]
+        searched.append(node_id)
+        # n0 is the only near-duplicate: of n1
+        return [(None, "n1")] if node_id == "n0" else []
+
+    with patch.object(sqlite_graph, "_similarity_search_node", side_effect=similar):
+        sqlite_graph.merge_by_similarity()
+
+    assert searched == ["n0"] + [f"n{i}" for i in range(2, 1005)]
+    assert sqlite_graph.search_node("n1") is None
+    assert sqlite_graph.db.search_outdegree_edges("n0")[0][0] == "n2"
+
+
 def test_find_nodes_like(graph, mock_db_connection_and_cursor):
     assert graph.find_nodes_like("relative", threshold=0.9) is not None
 
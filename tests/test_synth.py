@@ -0,0 +1,29 @@
+import random
+
+from personal_graph.synth import GraphSpec, SyntheticGraph, WorkloadSpec, plan
+
+
+def test_synthetic_graph():
+    synthetic = SyntheticGraph(GraphSpec(nodes=100, mean_degree=3, seed=1))
+    nodes = [node for chunk in synthetic.nodes(chunk=30) for node in chunk]
+    edges = [edge for chunk in synthetic.edges(chunk=30) for edge in chunk]
+
+    assert len(nodes) == 100
+    assert len(edges) == synthetic.edge_count == 300
+    assert all(edge.source.id != edge.target.id for edge in edges)
+
+    again = SyntheticGraph(GraphSpec(nodes=100, mean_degree=3, seed=1))
+    assert [node.attributes for chunk in again.nodes(chunk=30) for node in chunk] == [
+        node.attributes for node in nodes
+    ]
+    assert synthetic.knowledge_graph(random.Random(0), "kg") is not None
+
+
+def test_workload_plan():
+    synthetic = SyntheticGraph(GraphSpec(nodes=100))
+    operations = plan(synthetic, WorkloadSpec(operations=50))
+
+    assert len(operations) == 50
+    assert [name for name, _ in operations] == [
+        name for name, _ in plan(synthetic, WorkloadSpec(operations=50))
+    ]